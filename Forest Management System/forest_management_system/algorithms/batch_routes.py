@@ -0,0 +1,190 @@
+"""
+Batch shortest path queries from a CSV of tree pairs.
+
+Queries are grouped by start tree, so each distinct start needs one
+Dijkstra run (a shortest path tree) however many ends it is paired with.
+Groups of starts are solved in a process pool; each worker receives the
+graph once, through the pool initializer, or maps the same binary forest
+file (see io.binary_format) so that the arrays are shared through the
+page cache. Results are written to the output CSV as they arrive.
+
+Command line:
+    python -m forest_management_system.algorithms.batch_routes \\
+        --trees trees.csv --paths paths.csv --pairs pairs.csv --output routes.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+from forest_management_system.io.binary_format import open_forest_binary, convert_csv_to_binary
+
+BatchStats = namedtuple('BatchStats', ['queries', 'sources', 'seconds', 'queries_per_second'])
+
+OUTPUT_COLUMNS = ['query', 'start_tree', 'end_tree', 'distance', 'path']
+
+_BLOCK_ENTRIES = 1 << 22  # distances per Dijkstra block (32 MB of float64)
+
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = open_forest_binary(graph) if isinstance(graph, str) else graph
+
+
+def _solve_in_worker(groups):
+    return _solve(_worker_graph, groups)
+
+
+def _solve(frozen, groups):
+    """
+    Answer [(start_tree_id, [(query, end_tree_id), ...]), ...] with one
+    Dijkstra run per start. Returns [(query, start, end, distance, path)].
+    """
+    results = []
+    known = [(start, queries) for start, queries in groups if frozen.index_of(start) >= 0]
+    for start, queries in groups:
+        if frozen.index_of(start) < 0:
+            results.extend((query, start, end, float('inf'), []) for query, end in queries)
+    if not known:
+        return results
+
+    matrix = frozen.to_csr_matrix()
+    sources = [frozen.index_of(start) for start, _ in known]
+    dist, prev = dijkstra(matrix, directed=True, indices=sources, return_predecessors=True)
+    dist = dist.reshape(len(sources), -1)
+    prev = prev.reshape(len(sources), -1)
+    for row, ((start, queries), source) in enumerate(zip(known, sources)):
+        for query, end in queries:
+            target = frozen.index_of(end)
+            if target < 0 or not np.isfinite(dist[row, target]):
+                results.append((query, start, end, float('inf'), []))
+                continue
+            path = [target]
+            while path[-1] != source:
+                path.append(prev[row, path[-1]])
+            path.reverse()
+            results.append((query, start, end, float(dist[row, target]), frozen.ids[path].tolist()))
+    return results
+
+
+def read_route_pairs(file_path):
+    """
+    Read (start_tree_id, end_tree_id) pairs from a CSV with start/end (or
+    tree_1/tree_2) columns. Rows without two integer IDs are skipped.
+
+    Raises:
+        ValueError: If the columns are missing.
+    """
+    pairs = []
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = reader.fieldnames or []
+        start_col = 'start' if 'start' in fieldnames else 'tree_1'
+        end_col = 'end' if 'end' in fieldnames else 'tree_2'
+        if start_col not in fieldnames or end_col not in fieldnames:
+            raise ValueError("Missing required columns in pair file: start/tree_1, end/tree_2")
+        for row in reader:
+            try:
+                pairs.append((int(row[start_col]), int(row[end_col])))
+            except (ValueError, TypeError):
+                continue
+    return pairs
+
+
+def _group_by_start(pairs, block_size):
+    by_start = {}
+    for query, (start, end) in enumerate(pairs):
+        by_start.setdefault(start, []).append((query, end))
+    groups = list(by_start.items())
+    return [groups[i:i + block_size] for i in range(0, len(groups), block_size)], len(groups)
+
+
+def run_route_batch(forest_graph, pairs, output_file, max_workers=None, binary_file=None):
+    """
+    Answer every (start, end) pair and stream the results to output_file.
+
+    Args:
+        forest_graph: A ForestGraph or FrozenForestGraph
+        pairs: Iterable of (start_tree_id, end_tree_id)
+        output_file: CSV path; one row per query with OUTPUT_COLUMNS, in
+            completion order (query is the index of the pair). The path is
+            a space-separated list of tree IDs, empty with an inf distance
+            if there is none.
+        max_workers: Worker processes (CPU count if None, 1 runs in this
+            process)
+        binary_file: Binary forest file holding the same graph; workers map
+            it instead of receiving a copy of the arrays
+
+    Returns:
+        BatchStats(queries, sources, seconds, queries_per_second)
+    """
+    started = time.perf_counter()
+    frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+    pairs = list(pairs)
+    block_size = max(1, min(64, _BLOCK_ENTRIES // max(len(frozen), 1)))
+    blocks, source_count = _group_by_start(pairs, block_size)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(OUTPUT_COLUMNS)
+
+        def write(results):
+            writer.writerows((query, start, end, distance, ' '.join(map(str, path)))
+                             for query, start, end, distance, path in results)
+
+        if max_workers == 1 or len(blocks) <= 1:
+            for block in blocks:
+                write(_solve(frozen, block))
+        else:
+            shared = binary_file if binary_file is not None else frozen
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shared,)) as pool:
+                for future in as_completed([pool.submit(_solve_in_worker, block) for block in blocks]):
+                    write(future.result())
+
+    seconds = time.perf_counter() - started
+    return BatchStats(len(pairs), source_count, seconds, len(pairs) / seconds if seconds > 0 else 0.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer a CSV of shortest path queries.")
+    parser.add_argument('--trees', help="Tree CSV file (with --paths)")
+    parser.add_argument('--paths', help="Path CSV file (with --trees)")
+    parser.add_argument('--binary', help="Binary forest file, instead of --trees/--paths")
+    parser.add_argument('--pairs', required=True, help="CSV of start,end tree IDs")
+    parser.add_argument('--output', required=True, help="Output CSV file")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if not args.binary and not (args.trees and args.paths):
+        parser.error("either --binary or both --trees and --paths are required")
+    pairs = read_route_pairs(args.pairs)
+    if args.binary:
+        stats = run_route_batch(open_forest_binary(args.binary), pairs, args.output,
+                                max_workers=args.workers, binary_file=args.binary)
+    else:
+        # Convert the CSV files to a temporary binary file: no GUI loader
+        # dialogs, and the workers map the file instead of copying arrays
+        with tempfile.TemporaryDirectory() as directory:
+            binary_file = os.path.join(directory, 'forest.bin')
+            convert_csv_to_binary(args.trees, args.paths, binary_file)
+            stats = run_route_batch(open_forest_binary(binary_file), pairs, args.output,
+                                    max_workers=args.workers, binary_file=binary_file)
+    print(f"{stats.queries} queries from {stats.sources} start trees in {stats.seconds:.2f} s "
+          f"({stats.queries_per_second:.0f} queries/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
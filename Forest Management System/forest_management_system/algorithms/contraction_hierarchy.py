@@ -0,0 +1,317 @@
+"""
+Contraction hierarchies for repeated shortest path queries.
+
+Building contracts the trees one at a time, least important first, adding
+a shortcut between two neighbors of the contracted tree whenever the
+route through it is the only shortest one. A query then only searches
+upwards (towards more important trees) from both ends, which settles a
+few hundred trees instead of a large part of the forest.
+"""
+import hashlib
+import heapq
+
+import numpy as np
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+from forest_management_system.data_structures.change_journal import ADD_TREE, REMOVE_TREE, PATH_OPS
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+
+_STRUCTURAL_OPS = PATH_OPS | {ADD_TREE, REMOVE_TREE}
+_WITNESS_SETTLE_LIMIT = 60  # trees settled per witness search before giving up
+
+
+def _fingerprint(frozen):
+    digest = hashlib.sha1()
+    for array in (frozen.ids, frozen.indptr, frozen.indices, frozen.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _witness_distances(adj, source, excluded, limit, targets):
+    """
+    Dijkstra from source on the remaining graph without excluded, stopping
+    beyond limit, after _WITNESS_SETTLE_LIMIT trees or once every target is
+    settled. Distances of unsettled trees are upper bounds, which can only
+    add unneeded shortcuts.
+    """
+    dist = {source: 0.0}
+    pq = [(0.0, source)]
+    settled = 0
+    remaining = len(targets)
+    while pq and settled < _WITNESS_SETTLE_LIMIT:
+        d, node = heapq.heappop(pq)
+        if d > dist.get(node, float('inf')):
+            continue
+        if d > limit:
+            break
+        settled += 1
+        if node in targets:
+            remaining -= 1
+            if not remaining:
+                break
+        for neighbor, (weight, _) in adj[node].items():
+            if neighbor == excluded:
+                continue
+            new_dist = d + weight
+            if new_dist < dist.get(neighbor, float('inf')):
+                dist[neighbor] = new_dist
+                heapq.heappush(pq, (new_dist, neighbor))
+    return dist
+
+
+def _shortcuts(adj, node):
+    """Shortcuts (u, w, weight) needed to contract node."""
+    neighbors = list(adj[node].items())
+    shortcuts = []
+    for k, (u, (weight_u, _)) in enumerate(neighbors):
+        targets = neighbors[k + 1:]
+        if not targets:
+            break
+        limit = weight_u + max(weight_w for _, (weight_w, _) in targets)
+        witness = _witness_distances(adj, u, node, limit, {w for w, _ in targets})
+        for w, (weight_w, _) in targets:
+            through = weight_u + weight_w
+            if witness.get(w, float('inf')) > through:
+                shortcuts.append((u, w, through))
+    return shortcuts
+
+
+class ContractionHierarchy:
+    """
+    Preprocessed forest for point-to-point queries with the same contract
+    as find_shortest_path.
+
+    A hierarchy built from a ForestGraph stays bound to it: once a path or
+    tree is added or removed, or a distance changes, it is stale and
+    find_shortest_path() answers from the graph itself until rebuild() is
+    called. Health and species edits do not make it stale.
+    """
+
+    def __init__(self, ids, rank, indptr, indices, weights, middles, fingerprint):
+        self.ids = ids  # tree ID of every dense index, ascending
+        self.rank = rank  # contraction order of every dense index
+        # Upward graph: from each index to its higher-ranked neighbors, with
+        # the contracted index a shortcut stands for (-1 for a real path)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.middles = middles
+        self.fingerprint = fingerprint
+        self.graph = None
+        self.version = None
+        self._upward_lists = None
+
+    @classmethod
+    def build(cls, forest_graph):
+        """Contract a ForestGraph (bound, see class doc) or a FrozenForestGraph."""
+        if isinstance(forest_graph, FrozenForestGraph):
+            frozen, graph = forest_graph, None
+        else:
+            frozen, graph = forest_graph.freeze(), forest_graph
+        hierarchy = cls._contract(frozen)
+        hierarchy._bind(graph)
+        return hierarchy
+
+    @classmethod
+    def _contract(cls, frozen):
+        n = len(frozen)
+        adj = [dict() for _ in range(n)]  # {neighbor: (weight, middle)} among uncontracted trees
+        sources = frozen.edge_sources.tolist()
+        for i, j, weight in zip(sources, frozen.indices.tolist(), frozen.weights.tolist()):
+            if i != j:
+                adj[i][j] = (weight, -1)
+
+        deleted_neighbors = [0] * n
+        level = [0] * n
+
+        def priority(node):
+            # Edge difference, plus contracted neighbors and hierarchy depth
+            # so that contraction spreads evenly over the forest
+            shortcuts = _shortcuts(adj, node)
+            return 2 * (len(shortcuts) - len(adj[node])) + deleted_neighbors[node] + level[node], shortcuts
+
+        pq = [(priority(node)[0], node) for node in range(n)]
+        heapq.heapify(pq)
+        rank = np.empty(n, dtype=np.int64)
+        upward = [None] * n
+        order = 0
+        while pq:
+            _, node = heapq.heappop(pq)
+            # Lazy update: contract only if still no worse than the next candidate
+            current, shortcuts = priority(node)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, node))
+                continue
+            rank[node] = order
+            order += 1
+            for u, w, weight in shortcuts:
+                if weight < adj[u].get(w, (float('inf'), -1))[0]:
+                    adj[u][w] = (weight, node)
+                    adj[w][u] = (weight, node)
+            upward[node] = adj[node]
+            for neighbor in adj[node]:
+                del adj[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+                level[neighbor] = max(level[neighbor], level[node] + 1)
+            adj[node] = {}
+
+        counts = [len(edges) for edges in upward]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        weights = np.empty(indptr[-1], dtype=np.float64)
+        middles = np.empty(indptr[-1], dtype=np.int64)
+        for node, edges in enumerate(upward):
+            start = indptr[node]
+            for k, (neighbor, (weight, middle)) in enumerate(sorted(edges.items())):
+                indices[start + k] = neighbor
+                weights[start + k] = weight
+                middles[start + k] = middle
+        return cls(np.array(frozen.ids, dtype=np.int64), rank, indptr, indices, weights, middles,
+                   _fingerprint(frozen))
+
+    def _bind(self, forest_graph):
+        self.graph = forest_graph
+        self.version = forest_graph.version if forest_graph is not None else None
+
+    @property
+    def stale(self):
+        """True once the bound graph's paths or trees changed since the build."""
+        if self.graph is None:
+            return False
+        changes = self.graph.changes_since(self.version)
+        if changes is None or any(change.op in _STRUCTURAL_OPS for change in changes):
+            return True
+        self.version = self.graph.version
+        return False
+
+    def rebuild(self):
+        """Rebuild from the bound graph if it is stale; returns self."""
+        if self.stale:
+            fresh = self._contract(self.graph.freeze())
+            graph = self.graph
+            self.__dict__.update(fresh.__dict__)
+            self._bind(graph)
+        return self
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def shortcut_count(self):
+        return int(np.count_nonzero(self.middles >= 0))
+
+    def _index_of(self, tree_id):
+        i = int(np.searchsorted(self.ids, tree_id))
+        return i if i < len(self.ids) and self.ids[i] == tree_id else -1
+
+    def _upward(self):
+        """Upward edges as Python lists, built on the first query."""
+        if self._upward_lists is None:
+            neighbors = np.split(self.indices, self.indptr[1:-1])
+            weights = np.split(self.weights, self.indptr[1:-1])
+            self._upward_lists = [list(zip(i.tolist(), w.tolist())) for i, w in zip(neighbors, weights)]
+        return self._upward_lists
+
+    def _middle(self, u, v):
+        if self.rank[u] > self.rank[v]:
+            u, v = v, u
+        start, end = self.indptr[u], self.indptr[u + 1]
+        k = start + int(np.searchsorted(self.indices[start:end], v))
+        return int(self.middles[k])
+
+    def _unpack(self, u, v, path):
+        """Append the real trees of the (shortcut) edge u-v to path, v last."""
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle(a, b)
+            if middle < 0:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def find_shortest_path(self, start_tree_id, end_tree_id):
+        """Same contract as pathfinding.find_shortest_path."""
+        if self.stale:
+            return find_shortest_path(self.graph, start_tree_id, end_tree_id)
+        start, end = self._index_of(start_tree_id), self._index_of(end_tree_id)
+        if start < 0 or end < 0:
+            return [], float('inf')
+        if start == end:
+            return [start_tree_id], 0
+
+        upward = self._upward()
+        dist = ({start: 0.0}, {end: 0.0})
+        prev = ({start: None}, {end: None})
+        queues = ([(0.0, start)], [(0.0, end)])
+        best, meeting = float('inf'), None
+        while queues[0] or queues[1]:
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            d, node = heapq.heappop(queues[side])
+            if d >= best:
+                queues[side].clear()  # nothing below best left on this side
+                continue
+            if d > dist[side][node]:
+                continue
+            other = dist[1 - side].get(node)
+            if other is not None and d + other < best:
+                best, meeting = d + other, node
+            own_dist, own_prev = dist[side], prev[side]
+            # Stall-on-demand: a higher tree already reached offers a shorter
+            # way here, so node is not on a shortest up-path
+            if any(own_dist.get(neighbor, float('inf')) + weight < d for neighbor, weight in upward[node]):
+                continue
+            for neighbor, weight in upward[node]:
+                new_dist = d + weight
+                if new_dist < own_dist.get(neighbor, float('inf')):
+                    own_dist[neighbor] = new_dist
+                    own_prev[neighbor] = node
+                    heapq.heappush(queues[side], (new_dist, neighbor))
+
+        if meeting is None:
+            return [], float('inf')
+        hops = []
+        node = meeting
+        while node is not None:
+            hops.append(node)
+            node = prev[0][node]
+        hops.reverse()
+        node = prev[1][meeting]
+        while node is not None:
+            hops.append(node)
+            node = prev[1][node]
+
+        path = [hops[0]]
+        for u, v in zip(hops[:-1], hops[1:]):
+            self._unpack(u, v, path)
+        return self.ids[path].tolist(), best
+
+    def save(self, file_path):
+        """Write the hierarchy to an .npz file."""
+        np.savez(file_path, ids=self.ids, rank=self.rank, indptr=self.indptr, indices=self.indices,
+                 weights=self.weights, middles=self.middles, fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, file_path, forest_graph=None):
+        """
+        Read a hierarchy written by save(). If forest_graph is given the
+        hierarchy is bound to it.
+
+        Raises:
+            ValueError: If forest_graph does not have the paths the
+                hierarchy was built from.
+        """
+        with np.load(file_path) as data:
+            hierarchy = cls(data['ids'], data['rank'], data['indptr'], data['indices'],
+                            data['weights'], data['middles'], str(data['fingerprint']))
+        if forest_graph is not None:
+            frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+            if _fingerprint(frozen) != hierarchy.fingerprint:
+                raise ValueError("The contraction hierarchy was built from a different forest")
+            hierarchy._bind(None if forest_graph is frozen else forest_graph)
+        return hierarchy
+
+    def __repr__(self):
+        return f"ContractionHierarchy(trees={len(self.ids)}, shortcuts={self.shortcut_count})"
@@ -0,0 +1,132 @@
+"""
+Many-to-many shortest path distances computed with scipy.sparse.csgraph.
+"""
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+
+_BLOCK_ENTRIES = 1 << 22  # distances per Dijkstra block (32 MB of float64)
+
+
+class DistanceMatrixService:
+    """
+    Shortest path distances between sets of trees, with a cache.
+
+    Distances are computed a block of source trees at a time by one SciPy
+    Dijkstra call on the graph's CSR matrix. A block holds at most
+    _BLOCK_ENTRIES // N sources (block_size, if given, can only lower
+    that), so the float64 scratch space stays bounded however large N is.
+    Every computed row (one source tree to all
+    trees) is kept in dtype in an LRU cache keyed by the graph and its
+    version; rows of older versions are dropped as soon as a newer version
+    is seen, and least recently used rows are evicted beyond max_bytes.
+    """
+
+    def __init__(self, max_bytes=256 << 20, block_size=None, dtype=np.float32):
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self.dtype = np.dtype(dtype)
+        self._rows = OrderedDict()  # {(graph id, version, tree_id): row}
+        self._versions = {}  # {graph id: (weak reference to the graph, version of the cached rows)}
+        self.memory_usage = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _frozen(self, forest_graph):
+        if isinstance(forest_graph, FrozenForestGraph):
+            return forest_graph, None
+        return forest_graph.freeze(), forest_graph.version
+
+    def _forget(self, graph_key):
+        for key in [key for key in self._rows if key[0] == graph_key]:
+            self.memory_usage -= self._rows.pop(key).nbytes
+        self._versions.pop(graph_key, None)
+
+    def distances(self, forest_graph, source_ids=None, target_ids=None):
+        """
+        Return the len(source_ids) x len(target_ids) matrix of shortest path
+        distances (inf where there is no path or a tree is unknown).
+
+        Args:
+            forest_graph: A ForestGraph or FrozenForestGraph
+            source_ids: Tree IDs of the rows, all trees (ascending) if None
+            target_ids: Tree IDs of the columns, all trees (ascending) if None
+        """
+        frozen, version = self._frozen(forest_graph)
+        graph_key = id(forest_graph)
+        seen = self._versions.get(graph_key)
+        if seen is not None and (seen[0]() is not forest_graph or seen[1] != version):
+            self._forget(graph_key)
+        self._versions[graph_key] = (weakref.ref(forest_graph), version)
+
+        ids = frozen.ids
+        source_ids = ids.tolist() if source_ids is None else list(source_ids)
+        columns, unknown = slice(None), None
+        if target_ids is not None:
+            target_ids = np.asarray(target_ids, dtype=np.int64)
+            columns = np.minimum(np.searchsorted(ids, target_ids), max(len(ids) - 1, 0))
+            unknown = ids[columns] != target_ids if len(ids) else np.ones(len(target_ids), dtype=bool)
+        width = len(ids) if target_ids is None else len(target_ids)
+
+        result = np.empty((len(source_ids), width), dtype=self.dtype)
+        missing = []
+        for k, tree_id in enumerate(source_ids):
+            row = self._rows.get((graph_key, version, tree_id))
+            if row is None:
+                missing.append(k)
+            else:
+                self._rows.move_to_end((graph_key, version, tree_id))
+                self.hits += 1
+                result[k] = row[columns]
+
+        if missing:
+            self.misses += len(missing)
+            matrix = frozen.to_csr_matrix()
+            missing_ids = [source_ids[k] for k in missing]
+            indices = np.array([frozen.index_of(tree_id) for tree_id in missing_ids], dtype=np.int64)
+            computable = np.flatnonzero(indices >= 0)
+            block_size = max(1, _BLOCK_ENTRIES // max(len(ids), 1))
+            if self.block_size is not None:
+                block_size = max(1, min(block_size, self.block_size))
+            for start in range(0, len(computable), block_size):
+                block = computable[start:start + block_size]
+                rows = dijkstra(matrix, directed=True, indices=indices[block]).astype(self.dtype)
+                for k, row in zip(block.tolist(), rows.reshape(len(block), len(ids))):
+                    result[missing[k]] = row[columns]
+                    self._store((graph_key, version, missing_ids[k]), row)
+            for k in np.flatnonzero(indices < 0).tolist():
+                result[missing[k]] = np.inf
+        if unknown is not None:
+            result[:, unknown] = np.inf
+        return result
+
+    def distance(self, forest_graph, tree_id1, tree_id2):
+        """Return the shortest path distance between two trees, through the cache."""
+        return float(self.distances(forest_graph, [tree_id1], [tree_id2])[0, 0])
+
+    def _store(self, key, row):
+        row = np.array(row)  # own the memory rather than a view of the block
+        if row.nbytes > self.max_bytes:
+            return
+        self._rows[key] = row
+        self.memory_usage += row.nbytes
+        while self.memory_usage > self.max_bytes:
+            _, evicted = self._rows.popitem(last=False)
+            self.memory_usage -= evicted.nbytes
+
+    def clear(self):
+        """Drop every cached row (statistics are kept)."""
+        self._rows.clear()
+        self._versions.clear()
+        self.memory_usage = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __repr__(self):
+        return (f"DistanceMatrixService(rows={len(self._rows)}, bytes={self.memory_usage}, "
+                f"hits={self.hits}, misses={self.misses})")
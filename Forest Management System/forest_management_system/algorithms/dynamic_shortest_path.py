@@ -0,0 +1,178 @@
+"""
+Shortest paths from one tree, kept up to date as path distances change.
+"""
+import heapq
+
+import numpy as np
+
+from forest_management_system.data_structures.change_journal import REMOVE_TREE, PATH_OPS
+from forest_management_system.algorithms.pathfinding import shortest_path_tree
+
+
+class DynamicShortestPathTree:
+    """
+    Shortest path tree from a source tree of a ForestGraph that follows the
+    graph's edits.
+
+    Every query first calls refresh(), which replays the change journal
+    and repairs only the part of the tree an edit can affect:
+
+    - a path that got longer or was removed matters only if it is in the
+      tree; the subtree below it is cut off and re-attached by a Dijkstra
+      seeded from the trees around it (increase repair),
+    - a path that got shorter or was added is relaxed from both ends and
+      the improvement spreads from there (decrease repair).
+
+    Dragging a tree changes only its own paths, so each frame touches the
+    trees whose route runs through it instead of the whole forest.
+    """
+
+    def __init__(self, forest_graph, source_tree_id):
+        self.graph = forest_graph
+        self.source = source_tree_id
+        self._build()
+
+    def _build(self):
+        graph = self.graph
+        self.version = graph.version
+        self.dist = {}  # {tree_id: distance} of reached trees
+        self.parent = {}  # {tree_id: previous tree_id} of reached trees except the source
+        self.children = {}  # {tree_id: set of tree_ids whose parent it is}
+        if self.source not in graph.trees:
+            return
+        spt = shortest_path_tree(graph, self.source)
+        reached = np.flatnonzero(spt.sources >= 0)
+        ids = spt.ids[reached].tolist()
+        self.dist = dict(zip(ids, spt.distances[reached].tolist()))
+        for tree_id, previous in zip(ids, spt.predecessors[reached].tolist()):
+            if previous >= 0:
+                self._attach(tree_id, int(spt.ids[previous]))
+
+    def _attach(self, tree_id, parent_id):
+        self.parent[tree_id] = parent_id
+        self.children.setdefault(parent_id, set()).add(tree_id)
+
+    def _detach(self, tree_id):
+        parent_id = self.parent.pop(tree_id, None)
+        if parent_id is not None:
+            self.children.get(parent_id, set()).discard(tree_id)
+
+    def refresh(self):
+        """Bring the tree up to date with the graph's edits."""
+        graph = self.graph
+        if graph.version == self.version:
+            return
+        changes = graph.changes_since(self.version)
+        # Start over if the source was removed, or has come back (undo, restore)
+        # since a removal left the tree empty: the repairs grow from the source
+        if (changes is None or (self.source not in self.dist and self.source in graph.trees)
+                or any(change.op == REMOVE_TREE and change.tree_id == self.source for change in changes)):
+            self._build()
+            return
+
+        # Net change of every path since the last refresh: (weight then, weight now)
+        net = {}
+        for change in changes:
+            if change.op in PATH_OPS:
+                key = (min(change.tree_id, change.other_id), max(change.tree_id, change.other_id))
+                before = net[key][0] if key in net else change.old
+                net[key] = (before, change.new)
+        self.version = graph.version
+
+        cut = []
+        shorter = []
+        for (u, v), (before, after) in net.items():
+            if before is not None and (after is None or after > before):
+                if self.parent.get(v) == u:
+                    cut.append(v)
+                elif self.parent.get(u) == v:
+                    cut.append(u)
+            if after is not None and (before is None or after < before):
+                shorter.append((u, v))
+        if cut:
+            self._repair_increase(cut)
+        for change in changes:
+            if change.op == REMOVE_TREE and change.tree_id not in graph.trees:
+                # Its paths were removed first, so nothing hangs below it any more
+                self.dist.pop(change.tree_id, None)
+                self._detach(change.tree_id)
+                self.children.pop(change.tree_id, None)
+        if shorter:
+            self._repair_decrease(shorter)
+
+    def _repair_increase(self, roots):
+        """Re-attach the subtrees below roots after paths above them got longer."""
+        dist, graph = self.dist, self.graph
+        subtree = set()
+        stack = list(roots)
+        while stack:
+            tree_id = stack.pop()
+            if tree_id in subtree:
+                continue
+            subtree.add(tree_id)
+            stack.extend(self.children.get(tree_id, ()))
+        for tree_id in subtree:
+            dist.pop(tree_id, None)
+            self._detach(tree_id)
+
+        # Best way into the subtree from the trees outside it
+        pq = []
+        best = {}
+        for tree_id in subtree:
+            if tree_id not in graph.trees:
+                continue
+            for neighbor_id, weight in graph.neighbors(tree_id).items():
+                d = dist.get(neighbor_id)
+                if d is not None and d + weight < best.get(tree_id, (float('inf'),))[0]:
+                    best[tree_id] = (d + weight, neighbor_id)
+        for tree_id, (d, parent_id) in best.items():
+            heapq.heappush(pq, (d, tree_id, parent_id))
+        self._settle(pq)
+
+    def _repair_decrease(self, paths):
+        """Relax paths that got shorter or were added and spread the improvement."""
+        dist, graph = self.dist, self.graph
+        pq = []
+        for u, v in paths:
+            weight = graph.neighbors(u)[v]
+            for a, b in ((u, v), (v, u)):
+                if a in dist and dist[a] + weight < dist.get(b, float('inf')):
+                    heapq.heappush(pq, (dist[a] + weight, b, a))
+        self._settle(pq)
+
+    def _settle(self, pq):
+        """Dijkstra from (distance, tree_id, parent_id) entries, lowering distances only."""
+        dist, graph = self.dist, self.graph
+        while pq:
+            d, tree_id, parent_id = heapq.heappop(pq)
+            if d >= dist.get(tree_id, float('inf')):
+                continue
+            dist[tree_id] = d
+            self._detach(tree_id)
+            self._attach(tree_id, parent_id)
+            for neighbor_id, weight in graph.neighbors(tree_id).items():
+                if d + weight < dist.get(neighbor_id, float('inf')):
+                    heapq.heappush(pq, (d + weight, neighbor_id, tree_id))
+
+    def distance_to(self, tree_id):
+        """Shortest path distance from the source to tree_id (inf if unreachable)."""
+        self.refresh()
+        return self.dist.get(tree_id, float('inf'))
+
+    def path_to(self, tree_id):
+        """Tree IDs from the source to tree_id, or [] if unreachable."""
+        self.refresh()
+        if tree_id not in self.dist:
+            return []
+        path = [tree_id]
+        while path[-1] in self.parent:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
+
+    def __len__(self):
+        self.refresh()
+        return len(self.dist)
+
+    def __repr__(self):
+        return f"DynamicShortestPathTree(source={self.source}, reached={len(self.dist)})"
@@ -0,0 +1,115 @@
+"""
+Many independent infection ensembles, run in a process pool.
+
+Each scenario is one simulate_infection_ensemble() call with its own
+start trees, parameters and seed, so its result does not depend on which
+worker runs it or in which order. The graph reaches each worker once,
+through the pool initializer (or as a binary forest file the workers map,
+see io.binary_format), and results are folded into a ScenarioSummary as
+they complete.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+from forest_management_system.io.binary_format import open_forest_binary
+from forest_management_system.algorithms.infection_simulation import simulate_infection_ensemble
+
+# transmission_probability must be a number or a picklable (module-level) function
+InfectionScenario = namedtuple('InfectionScenario',
+                               ['start_tree_ids', 'seed', 'realizations', 'transmission_probability',
+                                'delay_shape'],
+                               defaults=(1000, 1.0, 4.0))
+
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = open_forest_binary(graph) if isinstance(graph, str) else graph
+
+
+def _run(frozen, index, scenario):
+    ensemble = simulate_infection_ensemble(frozen, scenario.start_tree_ids, realizations=scenario.realizations,
+                                           transmission_probability=scenario.transmission_probability,
+                                           delay_shape=scenario.delay_shape, seed=scenario.seed)
+    return index, ensemble._replace(ids=None)  # the caller has the IDs; do not send them back
+
+
+def _run_in_worker(index, scenario):
+    return _run(_worker_graph, index, scenario)
+
+
+class ScenarioSummary:
+    """
+    Running aggregate of scenario results, aligned with ids.
+
+    mean_probability and max_probability are taken per tree over the
+    scenarios added so far; expected_infected maps each scenario's index to
+    its expected number of infected trees.
+    """
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.count = 0
+        self._probability_sum = np.zeros(len(ids))
+        self.max_probability = np.zeros(len(ids))
+        self.expected_infected = {}
+
+    def add(self, index, ensemble):
+        self.count += 1
+        self._probability_sum += ensemble.probability
+        np.maximum(self.max_probability, ensemble.probability, out=self.max_probability)
+        self.expected_infected[index] = float(ensemble.probability.sum())
+
+    @property
+    def mean_probability(self):
+        return self._probability_sum / self.count if self.count else self._probability_sum.copy()
+
+    def __repr__(self):
+        return f"ScenarioSummary(scenarios={self.count}, trees={len(self.ids)})"
+
+
+def run_infection_scenarios(forest_graph, scenarios, max_workers=None, binary_file=None, callback=None):
+    """
+    Run every scenario and aggregate the results as they complete.
+
+    Args:
+        forest_graph: A ForestGraph or FrozenForestGraph
+        scenarios: Iterable of InfectionScenario
+        max_workers: Worker processes (CPU count if None, 1 runs in this
+            process)
+        binary_file: Binary forest file holding the same graph; workers map
+            it instead of receiving a copy of the arrays
+        callback: Called as callback(index, scenario, ensemble) for each
+            finished scenario, in completion order
+
+    Returns:
+        A ScenarioSummary.
+    """
+    frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+    scenarios = list(scenarios)
+    summary = ScenarioSummary(frozen.ids)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    def collect(index, ensemble):
+        ensemble = ensemble._replace(ids=frozen.ids)
+        summary.add(index, ensemble)
+        if callback is not None:
+            callback(index, scenarios[index], ensemble)
+
+    if max_workers == 1 or len(scenarios) <= 1:
+        for index, scenario in enumerate(scenarios):
+            collect(*_run(frozen, index, scenario))
+        return summary
+
+    shared = binary_file if binary_file is not None else frozen
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(scenarios)), initializer=_init_worker,
+                             initargs=(shared,)) as pool:
+        futures = [pool.submit(_run_in_worker, index, scenario) for index, scenario in enumerate(scenarios)]
+        for future in as_completed(futures):
+            collect(*future.result())
+    return summary
@@ -1,6 +1,10 @@
 import numpy as np
 import heapq
-from forest_management_system.data_structures.health_status import HealthStatus
+from collections import namedtuple
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from forest_management_system.data_structures.health_status import HealthStatus, HEALTH_CODES
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
 
 def simulate_infection(forest_graph, start_tree_id):
     """
@@ -15,6 +19,9 @@ def simulate_infection(forest_graph, start_tree_id):
         List of tuples (tree_id, from_id, days_to_infect) in order of infection.
         days_to_infect represents the number of days it takes for a tree to become infected.
     """
+    if isinstance(forest_graph, FrozenForestGraph):
+        return _simulate_infection_frozen(forest_graph, start_tree_id)
+
     if start_tree_id not in forest_graph.trees:
         return []
         
@@ -32,10 +39,9 @@ def simulate_infection(forest_graph, start_tree_id):
     pq = []
     
     # Add neighbors of the starting tree to the queue
-    for neighbor_id in forest_graph.get_neighbors(start_tree_id):
+    for neighbor_id, distance in forest_graph.neighbors(start_tree_id).items():
         if neighbor_id not in visited:
             # Days to infect is proportional to distance (1 unit = 1 day)
-            distance = forest_graph.get_distance(start_tree_id, neighbor_id)
             days_to_infect = distance  # 1 distance unit = 1 day
             heapq.heappush(pq, (days_to_infect, neighbor_id, start_tree_id))
     
@@ -51,11 +57,168 @@ def simulate_infection(forest_graph, start_tree_id):
         
         # Only trees that are not already INFECTED can get infected
         if node in forest_graph.trees and forest_graph.trees[node].health_status != HealthStatus.INFECTED:
-            for neighbor_id in forest_graph.get_neighbors(node):
+            for neighbor_id, distance in forest_graph.neighbors(node).items():
                 if neighbor_id not in visited:
-                    distance = forest_graph.get_distance(node, neighbor_id)
                     # Cumulative days: current days + additional days based on distance
                     new_days = days_to_infect + distance
                     heapq.heappush(pq, (new_days, neighbor_id, node))
     
     return infection_order
+
+def spread_matrix(frozen, start=-1):
+    """
+    CSR matrix of the edges along which infection can travel: the outgoing
+    edges of trees that are already INFECTED are dropped, except for the
+    start index or array of indices (pass -1 for none).
+    """
+    n = len(frozen)
+    sinks = frozen.health == HEALTH_CODES[HealthStatus.INFECTED]
+    start = np.atleast_1d(start)
+    sinks[start[start >= 0]] = False
+    keep = ~sinks[frozen.edge_sources]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(frozen.edge_sources[keep], minlength=n), out=indptr[1:])
+    return csr_matrix((frozen.weights[keep], frozen.indices[keep], indptr), shape=(n, n))
+
+def _simulate_infection_frozen(frozen, start_tree_id):
+    """
+    Same contract as simulate_infection, computed on the CSR arrays.
+
+    Trees that are already INFECTED (other than the start tree) are reached
+    but do not pass the infection on, so their outgoing edges are dropped and
+    a single Dijkstra run gives every arrival time and source.
+    """
+    start = frozen.index_of(start_tree_id)
+    infected_code = HEALTH_CODES[HealthStatus.INFECTED]
+    if start < 0 or frozen.health[start] != infected_code:
+        return []
+
+    days, prev = dijkstra(spread_matrix(frozen, start), directed=True, indices=start,
+                          return_predecessors=True)
+    reached = np.flatnonzero(np.isfinite(days))
+    reached = reached[reached != start]
+    # Ties are broken by tree ID, as in the priority queue version.
+    reached = reached[np.lexsort((frozen.ids[reached], days[reached]))]
+
+    infection_order = [(start_tree_id, None, 0)]
+    infection_order.extend(zip(frozen.ids[reached].tolist(),
+                               frozen.ids[prev[reached]].tolist(),
+                               days[reached].tolist()))
+    return infection_order
+
+InfectionEnsemble = namedtuple('InfectionEnsemble',
+                               ['ids', 'probability', 'mean_days', 'levels', 'quantiles', 'realizations'])
+InfectionEnsemble.__doc__ = """
+Result of simulate_infection_ensemble. Arrays are aligned with ids
+(ascending tree IDs): probability is the share of realizations in which a
+tree got infected, mean_days its mean infection day when it did (inf if
+never), and quantiles[k] the day by which it is infected with probability
+levels[k] (inf if that probability is not reached within the horizon).
+"""
+
+def simulate_infection_ensemble(forest_graph, start_tree_ids, realizations=1000, transmission_probability=1.0,
+                                delay_shape=4.0, levels=(0.1, 0.5, 0.9), horizon=None, bins=64, seed=None,
+                                max_bytes=256 << 20):
+    """
+    Monte Carlo version of simulate_infection: many realizations with
+    random transmission delays and failed transmissions, run together.
+
+    In every realization each directed path u -> v gets its own delay, the
+    path distance times a Gamma(delay_shape) factor with mean 1 (so the
+    expected delay is still one day per distance unit), and transmits at
+    all with transmission_probability. A tree is infected at the earliest
+    arrival over the paths that transmit; trees that are already INFECTED
+    (other than the start trees) do not pass the infection on.
+
+    Realizations are processed in chunks that fit in max_bytes. Each chunk
+    samples a realizations x paths array of delays, then runs SciPy's
+    compiled Dijkstra once per realization on the spread matrix with
+    those delays as weights (failed transmissions get an infinite delay).
+    Arrival days are binned per tree, so memory does not grow with the
+    number of realizations.
+
+    Args:
+        forest_graph: A ForestGraph or FrozenForestGraph
+        start_tree_ids: ID or iterable of IDs of the trees infected on day 0;
+            unknown IDs are ignored
+        realizations: Number of realizations
+        transmission_probability: Probability that a path transmits, or a
+            function mapping an array of path distances to probabilities
+        delay_shape: Gamma shape of the delay factor; larger is less random
+        levels: Probabilities for which arrival quantiles are returned
+        horizon: Last day resolved by the quantiles (bins of horizon / bins
+            days); 4x the latest expected arrival by default
+        bins: Number of arrival-day bins
+        seed: Seed of the NumPy random generator; the same seed, realizations
+            and max_bytes give the same result
+        max_bytes: Rough memory budget of a chunk
+
+    Returns:
+        An InfectionEnsemble.
+    """
+    frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+    if np.isscalar(start_tree_ids):
+        start_tree_ids = [start_tree_ids]
+    n = len(frozen)
+    starts = np.array([frozen.index_of(tree_id) for tree_id in start_tree_ids], dtype=np.int64)
+    starts = np.unique(starts[starts >= 0])
+    levels = np.asarray(levels, dtype=np.float64)
+    if len(starts) == 0 or realizations <= 0:
+        return InfectionEnsemble(frozen.ids, np.zeros(n), np.full(n, np.inf), levels,
+                                 np.full((len(levels), n), np.inf), 0)
+
+    spread = spread_matrix(frozen, starts)
+    m = spread.nnz
+    if callable(transmission_probability):
+        probability = np.asarray(transmission_probability(spread.data), dtype=np.float64)
+    else:
+        probability = float(transmission_probability)
+    if horizon is None:
+        expected = dijkstra(spread, directed=True, indices=starts, min_only=True)
+        latest = expected[np.isfinite(expected)].max()
+        horizon = 4.0 * latest if latest > 0 else 1.0
+
+    rng = np.random.default_rng(seed)
+    # Per realization: float32 delays and a mask per path, float64 days per tree
+    chunk = max(1, min(realizations, max_bytes // (5 * m + 8 * n + 1)))
+    reached = np.zeros(n, dtype=np.int64)
+    day_sum = np.zeros(n)
+    histogram = np.zeros((bins + 1) * n, dtype=np.int64)  # bin-major; bin `bins` is beyond the horizon
+    columns = np.arange(n, dtype=np.int64)
+    for done in range(0, realizations, chunk):
+        r = min(chunk, realizations - done)
+        delays = rng.standard_gamma(delay_shape, size=(r, m), dtype=np.float32)
+        delays *= (spread.data / delay_shape).astype(np.float32)
+        if callable(transmission_probability) or probability < 1.0:
+            delays[rng.random((r, m)) >= probability] = np.inf
+
+        # Trees by rows, realizations by columns, for the per-tree reductions
+        days = np.empty((n, r))
+        for k in range(r):
+            weights = csr_matrix((delays[k], spread.indices, spread.indptr), shape=(n, n))
+            days[:, k] = dijkstra(weights, directed=True, indices=starts, min_only=True)
+
+        finite = np.isfinite(days)
+        reached += finite.sum(axis=1)
+        day_sum += np.where(finite, days, 0.0).sum(axis=1)
+        bin_of = np.minimum((np.where(finite, days, 0.0) * (bins / horizon)).astype(np.int64), bins)
+        histogram += np.bincount((bin_of * n + columns[:, None])[finite], minlength=(bins + 1) * n)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_days = np.where(reached > 0, day_sum / reached, np.inf)
+    # Quantiles from the cumulative histogram, interpolated inside the bin
+    counts = histogram.reshape(bins + 1, n)[:bins]
+    cumulative = np.cumsum(counts, axis=0)
+    quantiles = np.full((len(levels), n), np.inf)
+    width = horizon / bins
+    for k, level in enumerate(levels):
+        needed = level * realizations
+        b = np.argmax(cumulative >= needed, axis=0)
+        found = cumulative[-1] >= needed
+        below = np.where(b > 0, cumulative[np.maximum(b - 1, 0), columns], 0)
+        within = counts[b, columns]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(within > 0, (needed - below) / within, 0.0)
+        quantiles[k, found] = ((b + fraction) * width)[found]
+    quantiles[:, starts] = 0.0
+    return InfectionEnsemble(frozen.ids, reached / realizations, mean_days, levels, quantiles, realizations)
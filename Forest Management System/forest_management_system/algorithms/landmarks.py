@@ -0,0 +1,208 @@
+"""
+ALT (A*, landmarks, triangle inequality) distance bounds.
+
+For a landmark L and any trees v, t, the triangle inequality gives
+|d(L, t) - d(L, v)| <= d(v, t). The largest of these bounds over a few
+well-spread landmarks is a consistent A* heuristic for any positive
+weights, and a cheap lower bound on distances in general.
+"""
+import heapq
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+from forest_management_system.data_structures.change_journal import ADD_TREE, REMOVE_TREE, PATH_OPS
+
+SELECTIONS = ('farthest', 'degree')
+
+
+class LandmarkTable:
+    """
+    Distances from k landmark trees to every tree.
+
+    distances is a k x N float64 array whose columns follow ids (ascending
+    tree IDs); unreachable trees are inf. A table built from a ForestGraph
+    follows its edits: refresh(), called by every query, replays the
+    change journal, repairs the rows for shorter or new paths in place and
+    recomputes only the rows whose shortest-path tree used a path that got
+    longer or was removed.
+    """
+
+    def __init__(self, forest_graph, k=8, selection='farthest'):
+        """
+        Args:
+            forest_graph: A ForestGraph or FrozenForestGraph
+            k: Number of landmarks (fewer if the forest has fewer trees)
+            selection: 'farthest' picks each landmark as far as possible from
+                the ones before it (unreachable trees first, so that every
+                part of the forest gets one); 'degree' picks the trees with
+                the most paths
+
+        Raises:
+            ValueError: If selection is not one of SELECTIONS.
+        """
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown landmark selection: {selection!r}")
+        self.k = k
+        self.selection = selection
+        self.graph = None if isinstance(forest_graph, FrozenForestGraph) else forest_graph
+        self._build(forest_graph if self.graph is None else forest_graph.freeze())
+
+    def _build(self, frozen):
+        self.version = self.graph.version if self.graph is not None else None
+        self._set_ids(np.array(frozen.ids, dtype=np.int64))
+        n = len(frozen)
+        k = min(self.k, n)
+        matrix = frozen.to_csr_matrix()
+        if self.selection == 'degree':
+            columns = np.argsort(-np.diff(frozen.indptr), kind='stable')[:k]
+            self.distances = dijkstra(matrix, directed=True, indices=columns).reshape(k, n)
+        else:
+            columns = []
+            self.distances = np.empty((k, n))
+            closest = np.full(n, np.inf)  # distance to the nearest landmark so far
+            for row in range(k):
+                # Start at the best connected tree, then take the farthest
+                # tree from all landmarks so far (an unreachable one first)
+                column = int(np.argmax(closest)) if row else int(np.argmax(np.diff(frozen.indptr)))
+                columns.append(column)
+                self.distances[row] = dijkstra(matrix, directed=True, indices=column)
+                closest = np.minimum(closest, self.distances[row])
+            columns = np.array(columns, dtype=np.int64)
+        self.landmark_ids = self.ids[columns].tolist()
+
+    def _set_ids(self, ids):
+        self.ids = ids
+        self._column_of = {tree_id: column for column, tree_id in enumerate(ids.tolist())}
+
+    def __len__(self):
+        return len(self.landmark_ids)
+
+    @property
+    def nbytes(self):
+        return self.distances.nbytes
+
+    def refresh(self):
+        """Bring the table up to date with the bound ForestGraph's edits."""
+        graph = self.graph
+        if graph is None or graph.version == self.version:
+            return
+        changes = graph.changes_since(self.version)
+        if changes is None or any(change.op == REMOVE_TREE and change.tree_id in self.landmark_ids
+                                  for change in changes):
+            self._build(graph.freeze())
+            return
+
+        # Net change of every path since the table was computed: (weight then, weight now)
+        net = {}
+        for change in changes:
+            if change.op in PATH_OPS:
+                key = (min(change.tree_id, change.other_id), max(change.tree_id, change.other_id))
+                before = net[key][0] if key in net else change.old
+                net[key] = (before, change.new)
+        longer, shorter = set(), []
+        for (u, v), (before, after) in net.items():
+            if before is not None and (after is None or after > before):
+                # Only rows where the path may lie on a shortest path are affected
+                cu, cv = self._column_of.get(u), self._column_of.get(v)
+                if cu is not None and cv is not None:
+                    with np.errstate(invalid='ignore'):
+                        gap = np.abs(self.distances[:, cu] - self.distances[:, cv])
+                    longer.update(np.flatnonzero(np.isclose(gap, before, rtol=1e-9, atol=0)).tolist())
+            if after is not None and (before is None or after < before):
+                shorter.append((u, v, after))
+
+        if any(change.op in (ADD_TREE, REMOVE_TREE) for change in changes):
+            ids = np.array(sorted(graph.trees), dtype=np.int64)
+            distances = np.full((len(self.landmark_ids), len(ids)), np.inf)
+            kept = np.isin(self.ids, ids)
+            distances[:, np.searchsorted(ids, self.ids[kept])] = self.distances[:, kept]
+            self.distances = distances
+            self._set_ids(ids)
+        self.version = graph.version
+
+        if longer:
+            rows = sorted(longer)
+            columns = [self._column_of[tree_id] for tree_id in np.array(self.landmark_ids)[rows].tolist()]
+            self.distances[rows] = dijkstra(graph.freeze().to_csr_matrix(), directed=True,
+                                            indices=columns).reshape(len(rows), -1)
+        for row in range(len(self.landmark_ids)):
+            if row not in longer and shorter:
+                self._repair(row, shorter)
+
+    def _repair(self, row, shorter):
+        """Lower the distances of one row after paths got shorter or were added."""
+        distances, column_of, graph = self.distances[row], self._column_of, self.graph
+        pq = []
+        for u, v, weight in shorter:
+            cu, cv = column_of.get(u), column_of.get(v)
+            if cu is None or cv is None:
+                continue
+            for a, ca, cb, b in ((u, cu, cv, v), (v, cv, cu, u)):
+                if distances[ca] + weight < distances[cb]:
+                    distances[cb] = distances[ca] + weight
+                    heapq.heappush(pq, (distances[cb], b))
+        while pq:
+            d, tree_id = heapq.heappop(pq)
+            if d > distances[column_of[tree_id]]:
+                continue
+            for neighbor_id, weight in graph.neighbors(tree_id).items():
+                column = column_of.get(neighbor_id)
+                if column is not None and d + weight < distances[column]:
+                    distances[column] = d + weight
+                    heapq.heappush(pq, (d + weight, neighbor_id))
+
+    @staticmethod
+    def _bound(a, b):
+        # inf - inf (neither tree reaches the landmark) says nothing: fmax skips the NaN
+        with np.errstate(invalid='ignore'):
+            bound = np.fmax.reduce(np.abs(a - b), axis=0) if len(a) else 0.0
+        return np.nan_to_num(bound, nan=0.0, posinf=np.inf)
+
+    def lower_bound(self, tree_id1, tree_id2):
+        """Return a lower bound on the distance between two trees (0.0 if unknown)."""
+        self.refresh()
+        c1, c2 = self._column_of.get(tree_id1), self._column_of.get(tree_id2)
+        if c1 is None or c2 is None:
+            return 0.0
+        return float(self._bound(self.distances[:, c1], self.distances[:, c2]))
+
+    def lower_bounds(self, tree_id):
+        """
+        Return lower bounds on the distance from tree_id to every tree, as a
+        float array aligned with ids, or None if tree_id is not in the table.
+        """
+        self.refresh()
+        column = self._column_of.get(tree_id)
+        if column is None:
+            return None
+        return self._bound(self.distances, self.distances[:, column:column + 1])
+
+    def heuristic(self, end_tree_id):
+        """
+        Return heuristic(tree_id), the A* lower bound on the distance to
+        end_tree_id, or None if end_tree_id is not in the table.
+        """
+        self.refresh()
+        column = self._column_of.get(end_tree_id)
+        if column is None:
+            return None
+        # Plain floats: a handful of landmarks is faster in Python than in NumPy
+        rows, column_of = self.distances.T, self._column_of
+        target = rows[column].tolist()
+
+        def heuristic(tree_id):
+            c = column_of.get(tree_id)
+            if c is None:
+                return 0.0
+            best = 0.0
+            for a, b in zip(rows[c].tolist(), target):
+                gap = abs(a - b)
+                if gap > best:  # False for inf - inf = NaN
+                    best = gap
+            return best
+        return heuristic
+
+    def __repr__(self):
+        return f"LandmarkTable(landmarks={self.landmark_ids}, trees={len(self.ids)})"
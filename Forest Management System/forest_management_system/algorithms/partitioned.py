@@ -0,0 +1,302 @@
+"""
+Shortest paths and infection spread on a PartitionedForestGraph.
+
+The ShardCoordinator runs the per-shard work (Dijkstra inside one shard)
+in a process pool and stitches the shard results together over the cut
+edges. The shards are sent to each worker once, by the pool initializer.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from forest_management_system.data_structures.health_status import HealthStatus, HEALTH_CODES
+from forest_management_system.algorithms.infection_simulation import spread_matrix
+
+_worker_shards = None
+
+
+def _init_worker(shards):
+    global _worker_shards
+    _worker_shards = shards
+
+
+def _call_in_worker(task, shard_id, args):
+    return task(_worker_shards[shard_id], *args)
+
+
+def _csr_min(n, rows, cols, weights):
+    """CSR matrix keeping the smallest weight of each (row, col); zero weights kept as edges."""
+    order = np.lexsort((weights, cols, rows))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    rows, cols, weights = rows[first], cols[first], weights[first]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return csr_matrix((weights, cols, indptr), shape=(n, n))
+
+
+def _seeded_dijkstra(matrix, seeds, offsets):
+    """
+    Dijkstra from several seeds that start at the given offsets, via an
+    extra source node n with an edge of weight offsets[k] to seeds[k].
+
+    Returns (dist, prev) for the n real nodes; prev is -1 at the seeds.
+    """
+    n = matrix.shape[0]
+    matrix = matrix.tocsr()
+    indptr = np.concatenate([matrix.indptr, [matrix.indptr[-1] + len(seeds)]])
+    indices = np.concatenate([matrix.indices, np.asarray(seeds, dtype=matrix.indices.dtype)])
+    data = np.concatenate([matrix.data, np.asarray(offsets, dtype=np.float64)])
+    extended = csr_matrix((data, indices, indptr), shape=(n + 1, n + 1))
+    dist, prev = dijkstra(extended, directed=True, indices=n, return_predecessors=True)
+    prev = prev[:n]
+    prev[prev == n] = -1
+    return dist[:n], prev
+
+
+def _boundary_table(shard):
+    """Distances inside a shard between its boundary trees."""
+    nodes = shard.boundary
+    if len(nodes) == 0:
+        return nodes, np.empty((0, 0))
+    dist = dijkstra(shard.graph.to_csr_matrix(), directed=True, indices=nodes)
+    return nodes, dist[:, nodes]
+
+
+def _endpoint_search(shard, local):
+    """Distances and predecessors inside a shard from one of its trees."""
+    return dijkstra(shard.graph.to_csr_matrix(), directed=True, indices=local, return_predecessors=True)
+
+
+def _walk(prev, start, end):
+    """Indices from start to end along a predecessor array."""
+    path = [end]
+    while path[-1] != start:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path
+
+
+def _local_paths(shard, pairs):
+    """Local indices of shortest paths inside a shard, one Dijkstra per distinct start."""
+    starts = sorted({start for start, _ in pairs})
+    prev = dijkstra(shard.graph.to_csr_matrix(), directed=True, indices=starts,
+                    return_predecessors=True)[1]
+    row = {start: k for k, start in enumerate(starts)}
+    return [_walk(prev[row[start]], start, end) for start, end in pairs]
+
+
+def _spread(shard, seeds, offsets, start):
+    """Arrival times inside a shard from seed trees reached at the given days."""
+    return _seeded_dijkstra(spread_matrix(shard.graph, start), seeds, offsets)
+
+
+class ShardCoordinator:
+    """
+    Runs analytics on a PartitionedForestGraph across processes.
+
+    With max_workers=1 the shard tasks run in this process, which is
+    cheaper for small forests. Use as a context manager, or call close(),
+    to shut the pool down.
+    """
+
+    def __init__(self, partitioned, max_workers=None):
+        self.partitioned = partitioned
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._tables = None  # per shard: (boundary local indices, distance matrix)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def map(self, task, jobs):
+        """
+        Run task(shard, *args) for every (shard_id, args) in jobs and return
+        the results in order. task must be a module-level function.
+        """
+        jobs = list(jobs)
+        shards = self.partitioned.shards
+        if self.max_workers == 1 or len(jobs) <= 1:
+            return [task(shards[shard_id], *args) for shard_id, args in jobs]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             initializer=_init_worker, initargs=(shards,))
+        futures = [self._pool.submit(_call_in_worker, task, shard_id, args) for shard_id, args in jobs]
+        return [future.result() for future in futures]
+
+    def _boundary_tables(self):
+        if self._tables is None:
+            self._tables = self.map(_boundary_table, [(shard.shard_id, ()) for shard in self.partitioned.shards])
+        return self._tables
+
+    def find_shortest_path(self, start_tree_id, end_tree_id):
+        """
+        Same contract as find_shortest_path.
+
+        Each shard's boundary-to-boundary distances are computed once, in
+        parallel. A query runs one Dijkstra from the start tree and one from
+        the end tree inside their shards (paths are undirected, so the
+        latter gives the distances to the end tree), runs Dijkstra on the
+        small overlay graph of boundary trees and cut edges, and expands
+        the overlay hops into trees: hops from the start or to the end
+        reuse the endpoint searches, and the remaining hops need one
+        Dijkstra per distinct hop start, grouped by shard.
+        """
+        part = self.partitioned
+        frozen = part.frozen
+        start, end = frozen.index_of(start_tree_id), frozen.index_of(end_tree_id)
+        if start < 0 or end < 0:
+            return [], float('inf')
+        if start == end:
+            return [start_tree_id], 0
+
+        tables = self._boundary_tables()
+        start_shard, end_shard = int(part.shard_of[start]), int(part.shard_of[end])
+        local_start, local_end = part.local_index[start], part.local_index[end]
+        (start_dist, start_prev), (end_dist, end_prev) = self.map(
+            _endpoint_search, [(start_shard, (local_start,)), (end_shard, (local_end,))])
+
+        # Overlay graph over parent dense indices, renumbered to 0..m-1
+        rows, cols, weights = [part.cut_sources], [part.cut_targets], [part.cut_weights]
+        for shard, (nodes, dist) in zip(part.shards, tables):
+            members = shard.members[nodes]
+            finite = np.isfinite(dist)
+            finite[np.diag_indices_from(finite)] = False
+            i, j = np.nonzero(finite)
+            rows.append(members[i])
+            cols.append(members[j])
+            weights.append(dist[i, j])
+        for shard_id, local, dist, outgoing in ((start_shard, local_start, start_dist, True),
+                                                (end_shard, local_end, end_dist, False)):
+            shard = part.shards[shard_id]
+            targets = shard.boundary[np.isfinite(dist[shard.boundary]) & (shard.boundary != local)]
+            if start_shard == end_shard and outgoing and np.isfinite(dist[local_end]):
+                targets = np.append(targets, local_end)
+            here = np.full(len(targets), shard.members[local])
+            rows.append(here if outgoing else shard.members[targets])
+            cols.append(shard.members[targets] if outgoing else here)
+            weights.append(dist[targets])
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        nodes = np.union1d(np.union1d(rows, cols), [start, end])
+        overlay = _csr_min(len(nodes), np.searchsorted(nodes, rows), np.searchsorted(nodes, cols),
+                           np.concatenate(weights))
+        source, target = np.searchsorted(nodes, start), np.searchsorted(nodes, end)
+        dist, prev = dijkstra(overlay, directed=True, indices=source, return_predecessors=True)
+        if dist[target] == float('inf'):
+            return [], float('inf')
+
+        hops = [target]
+        while hops[-1] != source:
+            hops.append(prev[hops[-1]])
+        hops = nodes[hops[::-1]]
+
+        # Trees after the first of every hop, as local indices of its shard
+        segments = []
+        pending = {}  # {shard_id: [(segment index, local start, local end)]}
+        for u, v in zip(hops[:-1], hops[1:]):
+            shard_id = int(part.shard_of[u])
+            if shard_id != part.shard_of[v]:
+                segments.append([v])  # cut edge
+                continue
+            members = part.shards[shard_id].members
+            if u == start:
+                local = _walk(start_prev, local_start, part.local_index[v])
+            elif v == end:
+                local = _walk(end_prev, local_end, part.local_index[u])[::-1]
+            else:
+                pending.setdefault(shard_id, []).append((len(segments), part.local_index[u], part.local_index[v]))
+                segments.append(None)
+                continue
+            segments.append(members[local[1:]])
+        jobs = [(shard_id, ([(u, v) for _, u, v in hops_here],)) for shard_id, hops_here in pending.items()]
+        for (shard_id, _), local_paths in zip(jobs, self.map(_local_paths, jobs)):
+            members = part.shards[shard_id].members
+            for (index, _, _), local in zip(pending[shard_id], local_paths):
+                segments[index] = members[local[1:]]
+
+        path = [hops[0]]
+        for segment in segments:
+            path.extend(segment)
+        return frozen.ids[path].tolist(), float(dist[target])
+
+    def simulate_infection(self, start_tree_id):
+        """
+        Same contract as simulate_infection.
+
+        Shards holding newly reached trees run Dijkstra in parallel from
+        those trees, then the infection frontier is carried over the cut
+        edges as new seeds for the neighboring shards, until no arrival
+        time improves.
+        """
+        part = self.partitioned
+        frozen = part.frozen
+        start = frozen.index_of(start_tree_id)
+        infected_code = HEALTH_CODES[HealthStatus.INFECTED]
+        if start < 0 or frozen.health[start] != infected_code:
+            return []
+
+        n = len(frozen)
+        days = np.full(n, np.inf)
+        prev = np.full(n, -1, dtype=np.int64)
+        days[start] = 0.0
+        spreads = frozen.health[part.cut_sources] != infected_code
+        spreads |= part.cut_sources == start
+        cut_sources, cut_targets = part.cut_sources[spreads], part.cut_targets[spreads]
+        cut_weights = part.cut_weights[spreads]
+
+        seeds = {int(part.shard_of[start]): [start]}
+        while seeds:
+            jobs = []
+            for shard_id, seed_list in seeds.items():
+                shard = part.shards[shard_id]
+                local_start = part.local_index[start] if part.shard_of[start] == shard_id else -1
+                seed_list = np.unique(seed_list)
+                jobs.append((shard_id, (part.local_index[seed_list], days[seed_list], local_start)))
+            improved = np.zeros(n, dtype=bool)
+            for (shard_id, _), (local_days, local_prev) in zip(jobs, self.map(_spread, jobs)):
+                members = part.shards[shard_id].members
+                better = local_days < days[members]
+                reached = members[better]
+                days[reached] = local_days[better]
+                prev[reached] = members[local_prev[better]]
+                improved[reached] = True
+                # Seeds keep the predecessor that reached them over a cut edge
+                improved[members[(local_prev == -1) & np.isfinite(local_days)]] = True
+
+            frontier = improved[cut_sources]
+            arrival = days[cut_sources[frontier]] + cut_weights[frontier]
+            targets, sources = cut_targets[frontier], cut_sources[frontier]
+            order = np.argsort(arrival, kind='stable')
+            seeds = {}
+            for target, source, time in zip(targets[order].tolist(), sources[order].tolist(),
+                                             arrival[order].tolist()):
+                if time < days[target]:
+                    days[target] = time
+                    prev[target] = source
+                    seeds.setdefault(int(part.shard_of[target]), []).append(target)
+
+        reached = np.flatnonzero(np.isfinite(days))
+        reached = reached[reached != start]
+        # Ties are broken by tree ID, as in the priority queue version.
+        reached = reached[np.lexsort((frozen.ids[reached], days[reached]))]
+        infection_order = [(start_tree_id, None, 0)]
+        infection_order.extend(zip(frozen.ids[reached].tolist(),
+                                   frozen.ids[prev[reached]].tolist(),
+                                   days[reached].tolist()))
+        return infection_order
+
+    def __repr__(self):
+        return f"ShardCoordinator({self.partitioned!r}, max_workers={self.max_workers})"
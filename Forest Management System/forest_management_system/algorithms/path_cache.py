@@ -0,0 +1,92 @@
+"""
+LRU cache of shortest path results for one graph at a time.
+"""
+import weakref
+from collections import OrderedDict
+
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path, shortest_path_tree
+
+
+class PathCache:
+    """
+    Bounded LRU cache of find_shortest_path results and shortest path
+    trees, keyed on the graph and its version.
+
+    Every ForestGraph mutation (paths, trees, health) bumps the version, so
+    the first query after an edit empties the cache, as does a query on a
+    different graph. Paths are undirected: a cached start-end result also
+    answers end-start. Every algorithm returns a shortest path, so results
+    are shared between algorithm choices.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # {('path', start, end) or ('tree', source, cutoff): result}
+        self._graph = None  # weak reference to the graph the entries belong to
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check(self, forest_graph):
+        version = None if isinstance(forest_graph, FrozenForestGraph) else forest_graph.version
+        if self._graph is None or self._graph() is not forest_graph or self._version != version:
+            self._entries.clear()
+            self._graph = weakref.ref(forest_graph)
+            self._version = version
+
+    def _get(self, key):
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return result
+
+    def _put(self, key, result):
+        self.misses += 1
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def find_shortest_path(self, forest_graph, start_tree_id, end_tree_id, **options):
+        """find_shortest_path() through the cache; options are passed on a miss."""
+        self._check(forest_graph)
+        result = self._get(('path', start_tree_id, end_tree_id))
+        if result is None:
+            reverse = self._get(('path', end_tree_id, start_tree_id))
+            if reverse is not None:
+                return list(reversed(reverse[0])), reverse[1]
+            path, distance = find_shortest_path(forest_graph, start_tree_id, end_tree_id, **options)
+            result = (tuple(path), distance)
+            self._put(('path', start_tree_id, end_tree_id), result)
+        return list(result[0]), result[1]
+
+    def shortest_path_tree(self, forest_graph, source_tree_id, cutoff=None):
+        """shortest_path_tree() through the cache. The arrays are shared; do not modify them."""
+        self._check(forest_graph)
+        result = self._get(('tree', source_tree_id, cutoff))
+        if result is None:
+            result = shortest_path_tree(forest_graph, source_tree_id, cutoff)
+            self._put(('tree', source_tree_id, cutoff), result)
+        return result
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Return {'hits', 'misses', 'hit_rate', 'size', 'maxsize'}."""
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        """Drop every entry (statistics are kept)."""
+        self._entries.clear()
+        self._graph = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"PathCache(size={len(self._entries)}, hits={self.hits}, misses={self.misses})"
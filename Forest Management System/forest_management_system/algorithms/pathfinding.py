@@ -1,58 +1,344 @@
 import heapq
+import math
+import weakref
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+
+ALGORITHMS = ('auto', 'dijkstra', 'bidirectional', 'astar', 'alt')
+
+def find_shortest_path(forest_graph, start_tree_id, end_tree_id, algorithm='auto', positions=None,
+                       landmarks=None):
+    """
+    Find the shortest path between two trees.
+
+    Args:
+        forest_graph: A ForestGraph or FrozenForestGraph
+        start_tree_id: ID of the first tree
+        end_tree_id: ID of the last tree
+        algorithm: 'dijkstra' for a one-directional search, 'bidirectional'
+            to search from both ends until the frontiers meet, or 'auto':
+            SciPy's Dijkstra on a FrozenForestGraph, bidirectional otherwise.
+            'astar' guides the search with the straight-line distance to
+            the end tree (see astar_scale) and needs positions; it falls
+            back to 'auto' when the positions cannot bound the weights.
+            'alt' is A* with the landmark lower bounds of landmarks, for
+            any weights; it falls back to 'auto' without a landmark table
+            or when the end tree is not in it.
+        positions: {tree_id: (x, y)} canvas positions, for 'astar'
+        landmarks: A LandmarkTable of forest_graph, for 'alt'
+
+    Returns:
+        (list of tree IDs from start to end, total distance), or
+        ([], inf) if there is no path.
+
+    Raises:
+        ValueError: If algorithm is not one of ALGORITHMS.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown shortest path algorithm: {algorithm!r}")
+    frozen = isinstance(forest_graph, FrozenForestGraph)
+    if not frozen and forest_graph.has_connectivity and not forest_graph.connected(start_tree_id, end_tree_id):
+        # Different components (or unknown trees): no need to search. After a
+        # removal the index is stale; searching is cheaper than rebuilding it
+        return [], float('inf')
+    if algorithm == 'astar':
+        scale = astar_scale(forest_graph, positions) if positions is not None else 0.0
+        if scale > 0 and start_tree_id in positions and end_tree_id in positions:
+            end_x, end_y = positions[end_tree_id]
+
+            def heuristic(tree_id):
+                x, y = positions[tree_id]
+                return scale * math.hypot(x - end_x, y - end_y)
+            return _find_shortest_path_guided(forest_graph, start_tree_id, end_tree_id, heuristic)
+        algorithm = 'auto'
+    elif algorithm == 'alt':
+        heuristic = landmarks.heuristic(end_tree_id) if landmarks is not None else None
+        if heuristic is not None:
+            return _find_shortest_path_guided(forest_graph, start_tree_id, end_tree_id, heuristic)
+        algorithm = 'auto'
+    if frozen and algorithm != 'bidirectional':
+        return _find_shortest_path_frozen(forest_graph, start_tree_id, end_tree_id)
+
+    if frozen:
+        start, end = forest_graph.index_of(start_tree_id), forest_graph.index_of(end_tree_id)
+        if start < 0 or end < 0:
+            return [], float('inf')
+        path, distance = _bidirectional_dijkstra(_csr_neighbors(forest_graph), start, end)
+        return forest_graph.ids[path].tolist(), distance
 
-def find_shortest_path(forest_graph, start_tree_id, end_tree_id):
     if start_tree_id not in forest_graph.trees or end_tree_id not in forest_graph.trees:
         return [], float('inf')
-    
-    if start_tree_id == end_tree_id:
-        return [start_tree_id], 0
-    
-    # Initialize distances with infinity for all nodes except start
-    dist = {tid: float('inf') for tid in forest_graph.trees}
-    dist[start_tree_id] = 0
-    
-    # Keep track of previous node in path
-    prev = {tid: None for tid in forest_graph.trees}
-    
-    # Priority queue with (distance, node_id)
-    pq = [(0, start_tree_id)]
+    neighbors = lambda tree_id: forest_graph.neighbors(tree_id).items()
+    if algorithm == 'dijkstra':
+        return _dijkstra(neighbors, start_tree_id, end_tree_id)
+    return _bidirectional_dijkstra(neighbors, start_tree_id, end_tree_id)
+
+def _csr_neighbors(frozen):
+    indptr, indices, weights = frozen.indptr, frozen.indices, frozen.weights
+
+    def neighbors(i):
+        start, end = indptr[i], indptr[i + 1]
+        return zip(indices[start:end].tolist(), weights[start:end].tolist())
+    return neighbors
+
+def _trace(prev, node):
+    """Follow prev links from node back to the search root; returns root first."""
+    path = []
+    while node is not None:
+        path.append(node)
+        node = prev[node]
+    path.reverse()
+    return path
+
+def _dijkstra(neighbors, start, end):
+    """
+    One-directional Dijkstra. dist and prev only hold the nodes that have
+    been reached, so a short query does not touch the whole forest.
+    """
+    if start == end:
+        return [start], 0
+
+    dist = {start: 0}
+    prev = {start: None}
+    pq = [(0, start)]
     visited = set()
-    
     while pq:
-        # Get the node with the smallest distance
         current_dist, current_id = heapq.heappop(pq)
-        
-        # If we've already processed this node, skip it
         if current_id in visited:
             continue
-            
-        # Mark as visited
         visited.add(current_id)
-        
-        # If we've reached the destination, we're done
-        if current_id == end_tree_id:
-            break
-            
-        # Check all neighbors of the current node
-        for neighbor_id in forest_graph.get_neighbors(current_id):
+        if current_id == end:
+            return _trace(prev, end), current_dist
+        for neighbor_id, edge_weight in neighbors(current_id):
             if neighbor_id in visited:
-                continue   
-            # Calculate distance through current node
-            edge_weight = forest_graph.get_distance(current_id, neighbor_id)
-            new_dist = dist[current_id] + edge_weight
-            # If this path is shorter than what we currently have
-            if new_dist < dist[neighbor_id]:
+                continue
+            new_dist = current_dist + edge_weight
+            if new_dist < dist.get(neighbor_id, float('inf')):
                 dist[neighbor_id] = new_dist
                 prev[neighbor_id] = current_id
                 heapq.heappush(pq, (new_dist, neighbor_id))
-    # Reconstruct the path
-    path = []
-    current = end_tree_id
-    # Check if end is reachable
-    if prev[current] is not None or current == start_tree_id:
-        while current is not None:
-            path.insert(0, current)
-            current = prev[current]
-        return path, dist[end_tree_id]
+    return [], float('inf')
+
+def _bidirectional_dijkstra(neighbors, start, end):
+    """
+    Dijkstra from both ends at once (paths are undirected). The side with
+    the smaller frontier distance is expanded next, and the search stops
+    once the two frontier distances add up to at least the best meeting
+    path found so far.
+    """
+    if start == end:
+        return [start], 0
+
+    dist = ({start: 0}, {end: 0})
+    prev = ({start: None}, {end: None})
+    queues = ([(0, start)], [(0, end)])
+    settled = (set(), set())
+    best, meeting = float('inf'), None
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_dist, current_id = heapq.heappop(queues[side])
+        if current_id in settled[side]:
+            continue
+        settled[side].add(current_id)
+        own_dist, own_prev, other_dist = dist[side], prev[side], dist[1 - side]
+        for neighbor_id, edge_weight in neighbors(current_id):
+            new_dist = current_dist + edge_weight
+            if new_dist < own_dist.get(neighbor_id, float('inf')):
+                own_dist[neighbor_id] = new_dist
+                own_prev[neighbor_id] = current_id
+                heapq.heappush(queues[side], (new_dist, neighbor_id))
+            if neighbor_id in other_dist and new_dist + other_dist[neighbor_id] < best:
+                best = new_dist + other_dist[neighbor_id]
+                meeting = (current_id, neighbor_id) if side == 0 else (neighbor_id, current_id)
+
+    if meeting is None:
+        return [], float('inf')
+    # meeting is the edge (u, v) joining the forward tree at u and the backward tree at v
+    forward = _trace(prev[0], meeting[0])
+    backward = _trace(prev[1], meeting[1])
+    backward.reverse()
+    return forward + backward, best
+
+_scale_cache = weakref.WeakKeyDictionary()  # {graph: (positions ref, positions version, graph version, scale)}
+
+def astar_scale(forest_graph, positions):
+    """
+    Return the largest s with s * |p(u) - p(v)| <= weight(u, v) for every
+    path u-v, where p are the canvas positions, or 0.0 if there is none
+    (a path end without a position, a zero weight between two distinct
+    points, or no path of positive length).
+
+    s * straight-line distance to the end tree is then a consistent A*
+    heuristic. Weights set from canvas geometry give s = 1. The result is
+    cached while neither the graph nor a PositionStore changes.
+    """
+    graph_version = None if isinstance(forest_graph, FrozenForestGraph) else forest_graph.version
+    positions_version = getattr(positions, 'version', None)
+    cached = _scale_cache.get(forest_graph)
+    if (cached is not None and positions_version is not None and cached[0]() is positions
+            and cached[1:3] == (positions_version, graph_version)):
+        return cached[3]
+
+    if isinstance(forest_graph, FrozenForestGraph):
+        ids1 = forest_graph.ids[forest_graph.edge_sources]
+        ids2 = forest_graph.ids[forest_graph.indices]
+        weights = forest_graph.weights
+    else:
+        ids1, ids2, weights = forest_graph.edges_array()
+    if hasattr(positions, 'segment_lengths'):
+        lengths = positions.segment_lengths(ids1, ids2)
+    else:
+        missing = (math.nan, math.nan)
+        p1 = np.array([positions.get(i, missing) for i in ids1.tolist()], dtype=np.float64).reshape(-1, 2)
+        p2 = np.array([positions.get(i, missing) for i in ids2.tolist()], dtype=np.float64).reshape(-1, 2)
+        lengths = np.hypot(*(p2 - p1).T)
+
+    positive = lengths > 0
+    if np.isnan(lengths).any() or not positive.any():
+        scale = 0.0
     else:
+        scale = float(np.min(weights[positive] / lengths[positive]))
+
+    if positions_version is not None:
+        _scale_cache[forest_graph] = (weakref.ref(positions), positions_version, graph_version, scale)
+    return scale
+
+def _find_shortest_path_guided(forest_graph, start_tree_id, end_tree_id, heuristic):
+    """A* with heuristic(tree_id), a consistent lower bound on the distance to the end tree."""
+    if not isinstance(forest_graph, FrozenForestGraph):
+        if start_tree_id not in forest_graph.trees or end_tree_id not in forest_graph.trees:
+            return [], float('inf')
+        neighbors = lambda tree_id: forest_graph.neighbors(tree_id).items()
+        return _astar(neighbors, heuristic, start_tree_id, end_tree_id)
+
+    ids = forest_graph.ids
+    start, end = forest_graph.index_of(start_tree_id), forest_graph.index_of(end_tree_id)
+    if start < 0 or end < 0:
+        return [], float('inf')
+    path, distance = _astar(_csr_neighbors(forest_graph), lambda i: heuristic(int(ids[i])), start, end)
+    return ids[path].tolist(), distance
+
+def _astar(neighbors, heuristic, start, end):
+    """
+    A* search. heuristic must be consistent, so every node is settled once,
+    as in Dijkstra, but nodes heading away from the end are expanded late.
+    """
+    if start == end:
+        return [start], 0
+
+    dist = {start: 0}
+    prev = {start: None}
+    pq = [(heuristic(start), 0, start)]
+    visited = set()
+    while pq:
+        _, current_dist, current_id = heapq.heappop(pq)
+        if current_id in visited:
+            continue
+        visited.add(current_id)
+        if current_id == end:
+            return _trace(prev, end), current_dist
+        for neighbor_id, edge_weight in neighbors(current_id):
+            if neighbor_id in visited:
+                continue
+            new_dist = current_dist + edge_weight
+            if new_dist < dist.get(neighbor_id, float('inf')):
+                dist[neighbor_id] = new_dist
+                prev[neighbor_id] = current_id
+                heapq.heappush(pq, (new_dist + heuristic(neighbor_id), new_dist, neighbor_id))
+    return [], float('inf')
+
+def _find_shortest_path_frozen(frozen, start_tree_id, end_tree_id):
+    """Same contract as find_shortest_path, computed on the CSR arrays."""
+    start, end = frozen.index_of(start_tree_id), frozen.index_of(end_tree_id)
+    if start < 0 or end < 0:
         return [], float('inf')
+
+    if start == end:
+        return [start_tree_id], 0
+
+    dist, prev = dijkstra(frozen.to_csr_matrix(), directed=True, indices=start,
+                          return_predecessors=True)
+    if dist[end] == float('inf'):
+        return [], float('inf')
+
+    path = [end]
+    while path[-1] != start:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return frozen.ids[path].tolist(), float(dist[end])
+
+class ShortestPathTree(namedtuple('ShortestPathTree', ['ids', 'distances', 'predecessors', 'sources'])):
+    """
+    Shortest paths from one or more source trees to every tree.
+
+    All arrays are aligned with ids (ascending tree IDs). distances is inf
+    for trees that were not reached; predecessors and sources hold dense
+    indices into ids, -1 for the sources themselves and unreached trees
+    (predecessors) or unreached trees only (sources).
+    """
+
+    def index_of(self, tree_id):
+        i = int(np.searchsorted(self.ids, tree_id))
+        return i if i < len(self.ids) and self.ids[i] == tree_id else -1
+
+    def distance_to(self, tree_id):
+        """Distance from the nearest source to tree_id (inf if not reached)."""
+        i = self.index_of(tree_id)
+        return float(self.distances[i]) if i >= 0 else float('inf')
+
+    def source_of(self, tree_id):
+        """ID of the source tree nearest to tree_id, or None if not reached."""
+        i = self.index_of(tree_id)
+        return int(self.ids[self.sources[i]]) if i >= 0 and self.sources[i] >= 0 else None
+
+    def path_to(self, tree_id):
+        """Tree IDs from the nearest source to tree_id, or [] if not reached."""
+        i = self.index_of(tree_id)
+        if i < 0 or self.sources[i] < 0:
+            return []
+        path = [i]
+        while self.predecessors[path[-1]] >= 0:
+            path.append(self.predecessors[path[-1]])
+        path.reverse()
+        return self.ids[path].tolist()
+
+def multi_source_distances(forest_graph, source_tree_ids, cutoff=None):
+    """
+    Distances from the nearest of several source trees to every tree, in
+    one Dijkstra pass.
+
+    Args:
+        forest_graph: A ForestGraph or FrozenForestGraph
+        source_tree_ids: IDs of the source trees; unknown IDs are ignored
+        cutoff: If given, trees farther than this from every source are
+            left unreached
+
+    Returns:
+        A ShortestPathTree; sources tells which source each tree is
+        nearest to.
+    """
+    frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+    n = len(frozen)
+    indices = np.array([frozen.index_of(tree_id) for tree_id in source_tree_ids], dtype=np.int64)
+    indices = np.unique(indices[indices >= 0])
+    if len(indices) == 0:
+        none = np.full(n, -1, dtype=np.int64)
+        return ShortestPathTree(frozen.ids, np.full(n, np.inf), none, none.copy())
+
+    limit = np.inf if cutoff is None else cutoff
+    distances, predecessors, sources = dijkstra(frozen.to_csr_matrix(), directed=True, indices=indices,
+                                                limit=limit, min_only=True, return_predecessors=True)
+    predecessors = np.where(predecessors < 0, -1, predecessors).astype(np.int64)
+    sources = np.where(sources < 0, -1, sources).astype(np.int64)
+    return ShortestPathTree(frozen.ids, distances, predecessors, sources)
+
+def shortest_path_tree(forest_graph, source_tree_id, cutoff=None):
+    """
+    Shortest paths from one tree to every tree (see multi_source_distances).
+    """
+    return multi_source_distances(forest_graph, [source_tree_id], cutoff)
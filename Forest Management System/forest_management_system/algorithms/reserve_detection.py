@@ -1,46 +1,53 @@
-from forest_management_system.data_structures.health_status import HealthStatus
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from forest_management_system.data_structures.health_status import HealthStatus, HEALTH_CODES
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
 '''
 Find reserves: only groups of 3 or more healthy trees that form a complete (fully connected) subgraph (clique),
 and none of them are directly connected to any infected or at-risk tree.
 '''
 def find_reserves(forest_graph):
+    if isinstance(forest_graph, FrozenForestGraph):
+        return _find_reserves_frozen(forest_graph)
+
+    # A reserve has no path leaving it (a healthy neighbor would belong to
+    # the group, any other is not allowed), so it is a whole connected
+    # component: a clique of at least 3 trees that are all healthy.
+    components = forest_graph.connectivity()
     reserves = []
-    visited = set()
+    for root in components.roots(min_size=3):
+        size = components.size_of(root)
+        if components.edge_count_of(root) != size * (size - 1) // 2:
+            continue
+        group = components.members_of(root)
+        if all(tree_id in forest_graph.trees and
+               forest_graph.trees[tree_id].health_status == HealthStatus.HEALTHY for tree_id in group):
+            reserves.append(set(group))
+    return sorted(reserves, key=min)
+
+def _find_reserves_frozen(frozen):
+    """
+    Same contract as find_reserves, computed on the CSR arrays.
+
+    A healthy component of k trees is a reserve when it holds k*(k-1)
+    directed edges (a clique) and none of its edges lead to a tree that is
+    not healthy.
+    """
+    n = len(frozen)
+    healthy = frozen.health == HEALTH_CODES[HealthStatus.HEALTHY]
+    rows, cols = frozen.edge_sources, frozen.indices
+    internal = healthy[rows] & healthy[cols] & (rows != cols)  # a self-loop is not a path to another tree
+    subgraph = csr_matrix((np.ones(np.count_nonzero(internal)), (rows[internal], cols[internal])),
+                          shape=(n, n))
+    n_components, labels = connected_components(subgraph, directed=False)
 
-    def dfs(tree_id, group):
-        visited.add(tree_id)
-        group.add(tree_id)
-        for neighbor in forest_graph.get_neighbors(tree_id):
-            if neighbor not in visited and forest_graph.trees[neighbor].health_status == HealthStatus.HEALTHY:
-                dfs(neighbor, group)
+    sizes = np.bincount(labels[healthy], minlength=n_components)
+    internal_edges = np.bincount(labels[rows[internal]], minlength=n_components)
+    exposed_edges = np.bincount(labels[rows[healthy[rows] & ~healthy[cols]]], minlength=n_components)
+    is_reserve = (sizes >= 3) & (internal_edges == sizes * (sizes - 1)) & (exposed_edges == 0)
 
-    for tree_id in forest_graph.trees:
-        if tree_id not in visited and forest_graph.trees[tree_id].health_status == HealthStatus.HEALTHY:
-            group = set()
-            dfs(tree_id, group)
-            if len(group) >= 3:
-                # Check if group is a complete graph
-                is_clique = True
-                group_list = list(group)
-                for i in range(len(group_list)):
-                    for j in range(i+1, len(group_list)):
-                        t1, t2 = group_list[i], group_list[j]
-                        if t2 not in forest_graph.get_neighbors(t1):
-                            is_clique = False
-                            break
-                    if not is_clique:
-                        break
-                if not is_clique:
-                    continue
-                # Check if all trees in group have no direct connections to unhealthy trees outside
-                isolated = True
-                for tid in group:
-                    for neighbor in forest_graph.get_neighbors(tid):
-                        if neighbor not in group and forest_graph.trees[neighbor].health_status != HealthStatus.HEALTHY:
-                            isolated = False
-                            break
-                    if not isolated:
-                        break
-                if isolated:
-                    reserves.append(group)
-    return reserves
+    members = np.flatnonzero(healthy & is_reserve[labels])
+    members = members[np.argsort(labels[members], kind='stable')]
+    groups = np.split(frozen.ids[members], np.cumsum(sizes[is_reserve])[:-1]) if len(members) else []
+    return sorted((set(group.tolist()) for group in groups), key=min)
@@ -0,0 +1,58 @@
+"""
+Change journal that records every ForestGraph mutation.
+"""
+from collections import deque, namedtuple
+from itertools import islice
+
+# One mutation. tree_id/other_id identify the tree or the path; old/new are
+# the values before and after: a path weight, a HealthStatus, or a
+# (species, age, health_status, forest) tuple for whole trees. None means
+# "did not exist".
+Change = namedtuple('Change', ['version', 'op', 'tree_id', 'other_id', 'old', 'new'])
+
+ADD_TREE = 'add_tree'
+REMOVE_TREE = 'remove_tree'
+UPDATE_TREE = 'update_tree'
+UPDATE_HEALTH = 'update_health'
+ADD_PATH = 'add_path'
+REMOVE_PATH = 'remove_path'
+UPDATE_DISTANCE = 'update_distance'
+
+TREE_OPS = frozenset((ADD_TREE, REMOVE_TREE, UPDATE_TREE, UPDATE_HEALTH))
+PATH_OPS = frozenset((ADD_PATH, REMOVE_PATH, UPDATE_DISTANCE))
+
+
+class ChangeJournal:
+    """
+    Bounded, append-only log of Change records.
+
+    Each record bumps the version by one, so the record with version v is
+    the change that turned version v-1 into v. Only the newest maxlen
+    records are kept.
+    """
+
+    def __init__(self, maxlen=10000):
+        self.version = 0
+        self._changes = deque(maxlen=maxlen)
+
+    def __len__(self):
+        return len(self._changes)
+
+    def record(self, op, tree_id, other_id=None, old=None, new=None):
+        self.version += 1
+        change = Change(self.version, op, tree_id, other_id, old, new)
+        self._changes.append(change)
+        return change
+
+    def since(self, version):
+        """
+        Return the changes made after version, oldest first.
+
+        Returns None when some of those changes have already been dropped
+        from the journal; the caller must then rebuild from scratch.
+        """
+        if version >= self.version:
+            return []
+        if not self._changes or version < self._changes[0].version - 1:
+            return None
+        return list(islice(self._changes, version - self._changes[0].version + 1, None))
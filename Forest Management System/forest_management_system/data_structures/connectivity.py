@@ -0,0 +1,110 @@
+"""
+Union-find index of the connected components of a ForestGraph.
+"""
+
+
+class ConnectivityIndex:
+    """
+    Connected components of an undirected graph under insertions.
+
+    A union-find forest (union by size, path halving) makes connected()
+    and find() near O(1). Every component of two or more trees also keeps
+    its member list (smaller lists are merged into larger ones) and its
+    number of paths between distinct trees; a lone tree costs one entry, as
+    most trees of a fresh graph have no paths yet. Removals are not
+    supported: ForestGraph drops
+    the index when a path or tree is removed and rebuilds it on the next
+    query.
+    """
+
+    def __init__(self):
+        self._parent = {}  # {tree_id: parent tree_id}, roots point to themselves
+        self._size = {}  # {root: number of trees}, for components of 2+ trees
+        self._edges = {}  # {root: number of paths between distinct trees}, same
+        self._members = {}  # {root: list of tree IDs}, same
+        self._count = 0  # number of components
+
+    @classmethod
+    def from_adjacency(cls, adj_list):
+        """Build the index of an {id: {neighbor: weight}} adjacency mapping."""
+        index = cls()
+        for tree_id in adj_list:
+            index.add(tree_id)
+        for tree_id, neighbors in adj_list.items():
+            for neighbor_id in neighbors:
+                if tree_id < neighbor_id:
+                    index.union(tree_id, neighbor_id)
+        return index
+
+    def add(self, tree_id):
+        """Add tree_id as a component of its own (no-op if already present)."""
+        if tree_id not in self._parent:
+            self._parent[tree_id] = tree_id
+            self._count += 1
+
+    def find(self, tree_id):
+        """Return the representative of tree_id's component, or None if unknown."""
+        parent = self._parent
+        if tree_id not in parent:
+            return None
+        while parent[tree_id] != tree_id:
+            parent[tree_id] = parent[parent[tree_id]]
+            tree_id = parent[tree_id]
+        return tree_id
+
+    def union(self, tree_id1, tree_id2):
+        """Record a new path between two trees, merging their components."""
+        if tree_id1 == tree_id2:
+            self.add(tree_id1)
+            return
+        self.add(tree_id1)
+        self.add(tree_id2)
+        root1, root2 = self.find(tree_id1), self.find(tree_id2)
+        if root1 == root2:
+            self._edges[root1] += 1
+            return
+        size1, size2 = self._size.get(root1, 1), self._size.get(root2, 1)
+        if size1 < size2:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._count -= 1
+        self._size[root1] = size1 + size2
+        self._size.pop(root2, None)
+        self._edges[root1] = self._edges.get(root1, 0) + self._edges.pop(root2, 0) + 1
+        members = self._members.setdefault(root1, [root1])
+        members.extend(self._members.pop(root2, [root2]))
+
+    def connected(self, tree_id1, tree_id2):
+        """True if both trees are known and in the same component."""
+        root = self.find(tree_id1)
+        return root is not None and root == self.find(tree_id2)
+
+    def size_of(self, tree_id):
+        """Number of trees in tree_id's component (0 if unknown)."""
+        root = self.find(tree_id)
+        return self._size.get(root, 1) if root is not None else 0
+
+    def edge_count_of(self, tree_id):
+        """Number of paths between distinct trees of tree_id's component."""
+        root = self.find(tree_id)
+        return self._edges.get(root, 0) if root is not None else 0
+
+    def members_of(self, tree_id):
+        """List of the tree IDs in tree_id's component ([] if unknown)."""
+        root = self.find(tree_id)
+        if root is None:
+            return []
+        return list(self._members.get(root, [root]))
+
+    def roots(self, min_size=1):
+        """Representatives of all components of at least min_size trees."""
+        if min_size > 1:
+            return [root for root, size in self._size.items() if size >= min_size]
+        return [tree_id for tree_id, parent in self._parent.items() if tree_id == parent]
+
+    def __len__(self):
+        """Number of components."""
+        return self._count
+
+    def __repr__(self):
+        return f"ConnectivityIndex(trees={len(self._parent)}, components={self._count})"
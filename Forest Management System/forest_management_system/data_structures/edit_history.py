@@ -0,0 +1,149 @@
+"""
+Undo/redo history for edits to a ForestGraph and its tree positions.
+"""
+import sys
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+# One undoable user action. The *_old/*_new dicts hold only the entries the
+# action changed ({snapshot key: value}, None meaning "did not exist"), so a
+# step costs O(entries changed), never O(graph size).
+EditStep = namedtuple('EditStep', ['label', 'graph_old', 'graph_new', 'positions_old', 'positions_new', 'size'])
+
+
+def _entries_size(entries):
+    """Approximate bytes held by an entries dict (values are shared or small)."""
+    size = sys.getsizeof(entries)
+    for key, value in entries.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+class EditHistory:
+    """
+    Undo/redo stack for a ForestGraph and a PositionStore.
+
+    Edits made inside begin()/end() (or the action() context manager) form
+    one step. While a step is open, copy-on-write snapshots of the graph and
+    the positions record the first old value of every tree, path and
+    position that changes; closing the step also reads the new values, which
+    is all undo() and redo() need. Steps are dropped oldest first once the
+    history holds more than max_bytes.
+    """
+
+    def __init__(self, forest_graph, positions, max_bytes=1 << 20):
+        self.forest_graph = forest_graph
+        self.positions = positions
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self._open = None  # (label, graph snapshot, positions snapshot)
+        self._depth = 0
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @property
+    def in_progress(self):
+        """True between begin() and its matching end()."""
+        return self._depth > 0
+
+    @property
+    def memory_usage(self):
+        """Approximate bytes held by the undo and redo steps."""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._undo)
+
+    def begin(self, label):
+        """Open a step; nested calls join the step that is already open."""
+        if self._depth == 0:
+            self._open = (label, self.forest_graph.snapshot(), self.positions.snapshot())
+        self._depth += 1
+
+    def end(self):
+        """Close the step opened by the matching begin(); returns True if it changed anything."""
+        if self._depth == 0:
+            return False
+        self._depth -= 1
+        if self._depth:
+            return False
+        label, graph_snapshot, positions_snapshot = self._open
+        self._open = None
+        graph_old, positions_old = graph_snapshot.saved(), positions_snapshot.saved()
+        graph_snapshot.release()
+        positions_snapshot.release()
+        if not graph_old and not positions_old:
+            return False
+        step = self._make_step(label, graph_old, positions_old)
+        self._clear_redo()
+        self._undo.append(step)
+        self._bytes += step.size
+        self._evict()
+        return True
+
+    @contextmanager
+    def action(self, label):
+        """Group the edits made in a with-block into one undoable step."""
+        self.begin(label)
+        try:
+            yield self
+        finally:
+            self.end()
+
+    def _make_step(self, label, graph_old, positions_old):
+        graph_new = self.forest_graph._current_entries(graph_old)
+        positions_new = self.positions._current_entries(positions_old)
+        size = sum(_entries_size(entries) for entries in (graph_old, graph_new, positions_old, positions_new))
+        return EditStep(label, graph_old, graph_new, positions_old, positions_new, size)
+
+    def _evict(self):
+        # Always keep the newest step, even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            self._bytes -= self._undo.popleft().size
+
+    def _clear_redo(self):
+        self._bytes -= sum(step.size for step in self._redo)
+        self._redo.clear()
+
+    def _check_closed(self):
+        if self._depth:
+            raise RuntimeError("Cannot undo or redo while an edit is in progress.")
+
+    def undo(self):
+        """Revert the newest step; returns its label, or None if there is nothing to undo."""
+        self._check_closed()
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self.forest_graph._restore_entries(step.graph_old)
+        self.positions._restore_entries(step.positions_old)
+        self._redo.append(step)
+        return step.label
+
+    def redo(self):
+        """Reapply the most recently undone step; returns its label, or None."""
+        self._check_closed()
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self.forest_graph._restore_entries(step.graph_new)
+        self.positions._restore_entries(step.positions_new)
+        self._undo.append(step)
+        return step.label
+
+    def clear(self):
+        """Forget every step (e.g. after the whole forest was replaced)."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def __repr__(self):
+        return f"EditHistory(undo={len(self._undo)}, redo={len(self._redo)}, bytes={self._bytes})"
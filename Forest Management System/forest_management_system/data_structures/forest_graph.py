@@ -1,66 +1,496 @@
+import functools
+import weakref
+from collections import Counter
+from collections.abc import Mapping
+from contextlib import nullcontext
+from types import MappingProxyType
+
+import numpy as np
+
 from .tree import Tree
 from .path import Path
+from .frozen_graph import FrozenForestGraph
+from .tree_table import TreeTable
+from .health_status import parse_health_status
+from .change_journal import (ChangeJournal, ADD_TREE, REMOVE_TREE, UPDATE_TREE, UPDATE_HEALTH,
+                             ADD_PATH, REMOVE_PATH, UPDATE_DISTANCE, PATH_OPS)
+from .snapshot import Snapshot
+from .rw_lock import ReadWriteLock
+from .connectivity import ConnectivityIndex
+
+_NO_NEIGHBORS = MappingProxyType({})
+_EDGE_DTYPE = np.dtype([('tree_id1', np.int64), ('tree_id2', np.int64), ('weight', np.float64)])
+
+def _writes(method):
+    """Run a mutating method under the write lock of a thread-safe graph."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        if self._lock is None:
+            return method(self, *args, **kwargs)
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+    return locked
+
+class TreeView(Mapping):
+    """
+    {tree_id: Tree} mapping over a ForestGraph's TreeTable.
+
+    Tree objects are built on access as views over their table row, so the
+    graph stores no per-tree object. A view stays the same object while it
+    is referenced (the graph tracks live views weakly), and it is detached
+    with a copy of its data when its tree is removed.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, tree_id):
+        graph = self._graph
+        tree = graph._views.get(tree_id)
+        if tree is None:
+            row = graph.table.row_of(tree_id)
+            if row is None:
+                raise KeyError(tree_id)
+            tree = Tree.__new__(Tree)
+            tree.tree_id = tree_id
+            tree._bind(graph, row)
+            graph._views[tree_id] = tree
+        return tree
+
+    def __contains__(self, tree_id):
+        return tree_id in self._graph.table
+
+    def __iter__(self):
+        return iter(self._graph.table)
+
+    def __len__(self):
+        return len(self._graph.table)
+
+    def __repr__(self):
+        return f"TreeView(trees={len(self)})"
 
 class ForestGraph:
-    def __init__(self):
-        self.trees = {}  # {tree_id: Tree object}
+    def __init__(self, thread_safe=False):
+        """
+        With thread_safe=True every mutation takes the write lock of a
+        ReadWriteLock, and freeze()/read_view() and reading() take the read
+        lock, so worker threads can analyse a consistent view while the GUI
+        thread keeps editing.
+        """
+        self.trees = TreeView(self)  # {tree_id: Tree}, views over the rows of table built on access
         self.adj_list = {}  # {tree_id: {neighbor_id: weight}}
+        self.table = TreeTable()  # columnar species/age/health storage
+        self.journal = ChangeJournal()  # every mutation, for incremental consumers
+        self._frozen = None  # cached freeze() result, valid while version is unchanged
+        self._edges = None  # cached edges_array() result, same rule
+        self._components = ConnectivityIndex()  # None when stale, rebuilt on demand after removals
+        self._snapshots = weakref.WeakSet()  # live copy-on-write snapshots
+        self._views = weakref.WeakValueDictionary()  # {tree_id: Tree} views still referenced somewhere
+        self._forests = {}  # {tree_id: forest} of the trees that have one
+        self._ids_by_health = {}  # {HealthStatus: set of tree IDs}
+        self._ids_by_species = {}  # {species: set of tree IDs}
+        self._edge_count = 0  # undirected paths between distinct trees
+        self._next_id = 1  # one above the largest tree ID ever added
+        self._lock = ReadWriteLock() if thread_safe else None
+
+    @property
+    def version(self):
+        """Monotonically increasing counter, bumped by every mutation."""
+        return self.journal.version
+
+    def changes_since(self, version):
+        """
+        Return the Change records made after version, oldest first, or None
+        if the journal no longer reaches back that far.
+        """
+        return self.journal.since(version)
+
+    @staticmethod
+    def _tree_state(tree):
+        return (tree.species, tree.age, tree.health_status, tree.forest)
+
+    def _index_add(self, tree_id, species, health_status):
+        self._ids_by_health.setdefault(health_status, set()).add(tree_id)
+        self._ids_by_species.setdefault(species, set()).add(tree_id)
+
+    def _index_discard(self, tree_id, species, health_status):
+        for index, key in ((self._ids_by_health, health_status), (self._ids_by_species, species)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(tree_id)
+                if not ids:
+                    del index[key]
 
+    def _record(self, op, tree_id, other_id=None, old=None, new=None):
+        """Journal a mutation that has just been applied and feed live snapshots."""
+        components = self._components
+        if components is not None:
+            if op == ADD_TREE:
+                components.add(tree_id)
+            elif op == ADD_PATH and old is None:
+                components.union(tree_id, other_id)
+            elif op in (REMOVE_TREE, REMOVE_PATH):
+                self._components = None
+        if self._snapshots:
+            if op in PATH_OPS:
+                key = ('path', min(tree_id, other_id), max(tree_id, other_id))
+                saved = old
+            else:
+                key = ('tree', tree_id)
+                saved = old
+                if op == UPDATE_HEALTH:
+                    species, age, _, forest = self._tree_state(self.trees[tree_id])
+                    saved = (species, age, old, forest)
+            for snapshot in self._snapshots:
+                snapshot.preserve(key, saved)
+        return self.journal.record(op, tree_id, other_id, old, new)
+
+    @_writes
+    def snapshot(self):
+        """
+        Return a copy-on-write Snapshot of the graph in O(1).
+
+        While the snapshot is alive, each tree or path keeps its original
+        value the first time it changes; snapshot.restore() rewrites only
+        those entries.
+        """
+        snapshot = Snapshot(self)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def _current_entries(self, keys):
+        """Return {key: current value} for snapshot keys, None meaning absent."""
+        entries = {}
+        for key in keys:
+            if key[0] == 'tree':
+                tree = self.trees.get(key[1])
+                entries[key] = self._tree_state(tree) if tree is not None else None
+            else:
+                entries[key] = self.adj_list.get(key[1], {}).get(key[2])
+        return entries
+
+    @_writes
+    def _restore_entries(self, saved):
+        trees = [(key[1], state) for key, state in saved.items() if key[0] == 'tree']
+        paths = [(key[1], key[2], weight) for key, weight in saved.items() if key[0] == 'path']
+        # Drop paths that did not exist, fix up trees, then put the other paths back
+        for tree_id1, tree_id2, weight in paths:
+            if weight is None:
+                self._drop_edge(tree_id1, tree_id2)
+        for tree_id, state in trees:
+            if state is None:
+                self.remove_tree(tree_id)
+            elif tree_id in self.trees:
+                species, age, health_status, forest = state
+                self.update_tree(tree_id, species=species, age=age)
+                self.update_health_status(tree_id, health_status)
+                self.trees[tree_id].forest = forest
+            else:
+                self.add_tree(Tree(tree_id, *state))
+        for tree_id1, tree_id2, weight in paths:
+            if weight is not None:
+                self._set_edge(tree_id1, tree_id2, weight)
+
+    @_writes
     def add_tree(self, tree: Tree):
-        self.trees[tree.tree_id] = tree
+        old = self.trees.get(tree.tree_id)
+        old_state = self._tree_state(old) if old is not None else None
+        if old is not None:
+            self._index_discard(tree.tree_id, old_state[0], old_state[2])
+            if old is not tree:
+                old._detach()
+        if tree._graph is not None and tree._graph is not self:
+            tree._graph._release_view(tree)
+        forest = tree.forest
+        row = self.table.insert(tree.tree_id, tree.species, tree.age, tree.health_status)
+        tree._bind(self, row)
+        self._set_forest(tree.tree_id, forest)
+        self._views[tree.tree_id] = tree
+        if tree.tree_id >= self._next_id:
+            self._next_id = tree.tree_id + 1
+        self._index_add(tree.tree_id, tree.species, tree.health_status)
+        self._record(ADD_TREE, tree.tree_id, old=old_state, new=self._tree_state(tree))
         if tree.tree_id not in self.adj_list:
             self.adj_list[tree.tree_id] = {}
 
+    def _release_view(self, tree):
+        """Give another graph the Tree object; the row stays, behind new views."""
+        self._views.pop(tree.tree_id, None)
+        tree._detach()
+
+    def _set_forest(self, tree_id, forest):
+        if forest is None:
+            self._forests.pop(tree_id, None)
+        else:
+            self._forests[tree_id] = forest
+
+    @_writes
+    def add_trees(self, trees):
+        """Add an iterable of Tree objects."""
+        for tree in trees:
+            self.add_tree(tree)
+
+    @_writes
     def remove_tree(self, tree_id):
+        """Remove a tree and its paths in O(degree)."""
         if tree_id in self.trees:
-            self.trees.pop(tree_id)
-            
-            # Remove from adjacency list
-            self.adj_list.pop(tree_id, None)
-            
-            # Remove all connections to this tree
-            for tid in self.adj_list:
-                if tree_id in self.adj_list[tid]:
-                    self.adj_list[tid].pop(tree_id)
+            # Remove the back-reference held by each neighbor
+            for neighbor_id, weight in self.adj_list.pop(tree_id, {}).items():
+                neighbors = self.adj_list.get(neighbor_id)
+                if neighbors is not None:
+                    neighbors.pop(tree_id, None)
+                if neighbor_id != tree_id:
+                    self._edge_count -= 1
+                self._record(REMOVE_PATH, tree_id, neighbor_id, old=weight)
+
+            tree = self.trees[tree_id]
+            old_state = self._tree_state(tree)
+            self._index_discard(tree_id, old_state[0], old_state[2])
+            self._record(REMOVE_TREE, tree_id, old=old_state)
+            tree._detach()
+            self._views.pop(tree_id, None)
+            self._forests.pop(tree_id, None)
+            self.table.remove(tree_id)
 
+    @_writes
+    def remove_trees(self, tree_ids):
+        """Remove an iterable of tree IDs; unknown IDs are ignored."""
+        for tree_id in tree_ids:
+            self.remove_tree(tree_id)
+
+    def _set_edge(self, tree1_id, tree2_id, weight):
+        neighbors1 = self.adj_list.setdefault(tree1_id, {})
+        old = neighbors1.get(tree2_id)
+        neighbors1[tree2_id] = weight
+        self.adj_list.setdefault(tree2_id, {})[tree1_id] = weight
+        if old is None and tree1_id != tree2_id:
+            self._edge_count += 1
+        self._record(ADD_PATH, tree1_id, tree2_id, old=old, new=weight)
+
+    def _drop_edge(self, tree1_id, tree2_id):
+        old = self.adj_list.get(tree1_id, {}).pop(tree2_id, None)
+        old2 = self.adj_list.get(tree2_id, {}).pop(tree1_id, None)
+        if old is None:
+            old = old2
+        if old is not None:
+            if tree1_id != tree2_id:
+                self._edge_count -= 1
+            self._record(REMOVE_PATH, tree1_id, tree2_id, old=old)
+
+    @_writes
     def add_path(self, path: Path):
-        tree1_id = path.tree1.tree_id
-        tree2_id = path.tree2.tree_id
-        weight = path.weight
-        
-        # Initialize adjacency list entries if they don't exist
-        if tree1_id not in self.adj_list:
-            self.adj_list[tree1_id] = {}
-        if tree2_id not in self.adj_list:
-            self.adj_list[tree2_id] = {}
-        
-        # Add to adjacency list (undirected graph)
-        self.adj_list[tree1_id][tree2_id] = weight
-        self.adj_list[tree2_id][tree1_id] = weight
+        # Adds to both adjacency entries (undirected graph), replacing any existing weight
+        self._set_edge(path.tree1.tree_id, path.tree2.tree_id, path.weight)
 
+    @_writes
     def remove_path(self, tree_id1, tree_id2):
-        # Remove from adjacency list
-        if tree_id1 in self.adj_list and tree_id2 in self.adj_list[tree_id1]:
-            self.adj_list[tree_id1].pop(tree_id2)
-        if tree_id2 in self.adj_list and tree_id1 in self.adj_list[tree_id2]:
-            self.adj_list[tree_id2].pop(tree_id1)
+        self._drop_edge(tree_id1, tree_id2)
 
+    @_writes
+    def add_paths(self, paths):
+        """
+        Add many paths in one pass.
+
+        Args:
+            paths: Iterable of Path objects or (tree_id1, tree_id2, weight)
+                triples, or an (N, 3) NumPy array of such triples.
+        """
+        if isinstance(paths, np.ndarray):
+            paths = zip(paths[:, 0].astype(np.int64).tolist(),
+                        paths[:, 1].astype(np.int64).tolist(),
+                        paths[:, 2].tolist())
+        for path in paths:
+            if isinstance(path, Path):
+                self._set_edge(path.tree1.tree_id, path.tree2.tree_id, path.weight)
+            else:
+                self._set_edge(*path)
+
+    @_writes
+    def remove_paths(self, pairs):
+        """Remove an iterable of (tree_id1, tree_id2) pairs; missing paths are ignored."""
+        for tree_id1, tree_id2 in pairs:
+            self._drop_edge(tree_id1, tree_id2)
+
+    @_writes
     def update_distance(self, tree_id1, tree_id2, new_weight):
-        # Update in adjacency list
-        if tree_id1 in self.adj_list and tree_id2 in self.adj_list[tree_id1]:
+        """Change the weight of an existing path; does nothing if there is no such path."""
+        old = self.adj_list.get(tree_id1, {}).get(tree_id2)
+        if old is None:
+            old = self.adj_list.get(tree_id2, {}).get(tree_id1)
+        if old is None:
+            return
+        if tree_id2 in self.adj_list.get(tree_id1, {}):
             self.adj_list[tree_id1][tree_id2] = new_weight
-        if tree_id2 in self.adj_list and tree_id1 in self.adj_list[tree_id2]:
+        if tree_id1 in self.adj_list.get(tree_id2, {}):
             self.adj_list[tree_id2][tree_id1] = new_weight
+        self._record(UPDATE_DISTANCE, tree_id1, tree_id2, old=old, new=new_weight)
 
+    @_writes
     def update_health_status(self, tree_id, new_status):
         if tree_id in self.trees:
-            self.trees[tree_id].set_health_status(new_status)
+            new_status = parse_health_status(new_status)
+            row = self.table.row_of(tree_id)
+            old_status = self.table.health_at(row)
+            if new_status != old_status:
+                self.table.set_health(row, new_status)
+                self._ids_by_health[old_status].discard(tree_id)
+                if not self._ids_by_health[old_status]:
+                    del self._ids_by_health[old_status]
+                self._ids_by_health.setdefault(new_status, set()).add(tree_id)
+                self._record(UPDATE_HEALTH, tree_id, old=old_status, new=new_status)
+
+    @_writes
+    def update_tree(self, tree_id, **attributes):
+        """Change the species and/or age of a tree, e.g. update_tree(3, age=42)."""
+        if tree_id in self.trees:
+            tree = self.trees[tree_id]
+            old_state = self._tree_state(tree)
+            row = self.table.row_of(tree_id)
+            if 'species' in attributes:
+                self._index_discard(tree_id, old_state[0], old_state[2])
+                self.table.set_species(row, attributes['species'])
+                self._index_add(tree_id, attributes['species'], old_state[2])
+            if 'age' in attributes:
+                self.table.set_age(row, attributes['age'])
+            self._record(UPDATE_TREE, tree_id, old=old_state, new=self._tree_state(tree))
+
+    # Dense slots: every tree lives in one row ("slot") of the TreeTable.
+    # A slot is stable while the tree stays in the graph, freed slots are
+    # reused, and all slots are below slot_count, so per-tree NumPy arrays
+    # can be indexed by slot instead of hashing tree IDs.
+
+    def next_tree_id(self):
+        """Return an unused tree ID (above every ID added so far) in O(1)."""
+        return self._next_id
+
+    @property
+    def slot_count(self):
+        """Size that arrays indexed by slot must have."""
+        return self.table.row_count
+
+    def slot_of(self, tree_id):
+        """Return the slot of tree_id, or None if it is not in the graph."""
+        return self.table.row_of(tree_id)
+
+    def slots_of(self, tree_ids):
+        """Return an int64 array with the slot of each tree ID, -1 where absent."""
+        return self.table.rows_of(tree_ids)
+
+    def id_at_slot(self, slot):
+        """Return the tree ID held by a slot, or None if the slot is free."""
+        tree_id = int(self.table.ids[slot])
+        return tree_id if tree_id >= 0 else None
+
+    def slot_ids(self):
+        """Return a read-only array mapping slot -> tree ID (-1 for free slots)."""
+        ids = self.table.ids[:self.table.row_count]
+        ids.flags.writeable = False
+        return ids
+
+    def health_counts(self):
+        """Return a Counter {HealthStatus: count} from the health index, O(number of statuses)."""
+        return Counter({status: len(ids) for status, ids in self._ids_by_health.items()})
+
+    def species_counts(self):
+        """Return a Counter {species: count} from the species index, O(number of species)."""
+        return Counter({species: len(ids) for species, ids in self._ids_by_species.items()})
+
+    def count_health(self, health_status):
+        """Return the number of trees with the given health status in O(1)."""
+        return len(self._ids_by_health.get(parse_health_status(health_status), ()))
+
+    def ids_with_health(self, health_status):
+        """Return the set of IDs of trees with the given health status in O(k)."""
+        return set(self._ids_by_health.get(parse_health_status(health_status), ()))
+
+    def ids_of_species(self, species):
+        """Return the set of IDs of trees of the given species in O(k)."""
+        return set(self._ids_by_species.get(species, ()))
+
+    def find_trees(self, health_status=None, species=None, min_age=None, max_age=None):
+        """
+        Return the IDs of trees matching all given filters, as a NumPy array.
+
+        health_status may be a HealthStatus, its name or its value.
+        """
+        if health_status is not None:
+            health_status = parse_health_status(health_status)
+        return self.table.select(health_status, species, min_age, max_age)
 
     def get_neighbors(self, tree_id):
-        """Return a list of neighbor tree IDs with O(1) complexity."""
+        """Return a new list of neighbor tree IDs; prefer neighbors() to avoid the copy."""
         if tree_id in self.adj_list:
             return list(self.adj_list[tree_id].keys())
         return []
+
+    def neighbors(self, tree_id):
+        """
+        Return a read-only {neighbor_id: weight} view of a tree's paths in O(1).
+
+        Nothing is copied, so the view reflects later changes; iterate over
+        list(view) if the graph is modified while iterating.
+        """
+        neighbors = self.adj_list.get(tree_id)
+        return MappingProxyType(neighbors) if neighbors is not None else _NO_NEIGHBORS
+
+    def connectivity(self):
+        """
+        Return the ConnectivityIndex of the graph's connected components.
+
+        Added trees and paths update it in near O(1); after a tree or path
+        is removed it is rebuilt, in O(N + E), on the next call. Treat it
+        as read-only.
+        """
+        with self.reading():
+            components = self._components
+            if components is None:
+                components = ConnectivityIndex.from_adjacency(self.adj_list)
+                self._components = components
+            return components
+
+    @property
+    def has_connectivity(self):
+        """True if connectivity() is up to date and returns without a rebuild."""
+        return self._components is not None
+
+    def connected(self, tree_id1, tree_id2):
+        """True if a chain of paths joins the two trees (a tree is connected to itself)."""
+        with self.reading():
+            return self.connectivity().connected(tree_id1, tree_id2)
+
+    def component_of(self, tree_id):
+        """Return a representative tree ID of tree_id's connected component, or None if unknown."""
+        with self.reading():
+            return self.connectivity().find(tree_id)
+
+    @property
+    def edge_count(self):
+        """Number of undirected paths between distinct trees, in O(1)."""
+        return self._edge_count
+
+    def iter_edges(self):
+        """Yield every undirected path once as (tree_id1, tree_id2, weight) with tree_id1 < tree_id2."""
+        for tree_id1, neighbors in self.adj_list.items():
+            for tree_id2, weight in neighbors.items():
+                if tree_id1 < tree_id2:
+                    yield tree_id1, tree_id2, weight
+
+    def edges_array(self):
+        """
+        Return all undirected paths as read-only NumPy arrays (ids1 int64,
+        ids2 int64, weights float64), ordered as iter_edges() yields them.
+        The arrays are cached until the graph changes.
+        """
+        with self.reading():
+            cached = self._edges
+            if cached is None or cached[0] != self.version:
+                edges = np.fromiter(self.iter_edges(), dtype=_EDGE_DTYPE)
+                arrays = tuple(np.ascontiguousarray(edges[name]) for name in _EDGE_DTYPE.names)
+                for array in arrays:
+                    array.flags.writeable = False
+                cached = (self.version, arrays)
+                self._edges = cached
+            return cached[1]
     
     def get_distance(self, tree_id1, tree_id2):
         """Get the weight/distance between two trees with O(1) complexity."""
@@ -68,10 +498,75 @@ class ForestGraph:
             return self.adj_list[tree_id1][tree_id2]
         return float('inf')  # If there's no direct edge
 
+    def freeze(self):
+        """
+        Return an immutable CSR snapshot of the graph (see FrozenForestGraph).
+
+        find_shortest_path, simulate_infection and find_reserves accept the
+        result in place of the ForestGraph and run on its arrays.
+        """
+        with self.reading():
+            frozen = self._frozen
+            if frozen is None or frozen[0] != self.version:
+                frozen = (self.version, FrozenForestGraph.from_forest_graph(self))
+                self._frozen = frozen
+            return frozen[1]
+
+    def read_view(self):
+        """
+        Return a versioned read view: the FrozenForestGraph of the current
+        version. Later edits never change it, so it can be handed to a
+        worker thread, and it is shared until the next mutation.
+        """
+        return self.freeze()
+
+    @property
+    def thread_safe(self):
+        return self._lock is not None
+
+    def reading(self):
+        """
+        Context manager holding the read lock of a thread-safe graph (a no-op
+        otherwise), for reading several attributes without an edit between.
+        """
+        return self._lock.read() if self._lock is not None else nullcontext()
+
+    def writing(self):
+        """
+        Context manager holding the write lock of a thread-safe graph (a
+        no-op otherwise), so that several edits appear to readers as one.
+        """
+        return self._lock.write() if self._lock is not None else nullcontext()
+
+    @_writes
     def clear(self):
         """Remove all trees and paths from the forest graph."""
-        self.trees.clear()
+        self.remove_trees(list(self.trees))
+        # Paths whose ends have no Tree object
+        for tree_id1, neighbors in list(self.adj_list.items()):
+            for tree_id2 in list(neighbors):
+                self._drop_edge(tree_id1, tree_id2)
         self.adj_list.clear()
+        self._edge_count = 0
+        self._next_id = 1
+        self.table.clear()
+        self._components = ConnectivityIndex()
+
+    def __getstate__(self):
+        # The journal is not part of the graph's value and starts empty in copies
+        with self.reading():
+            trees = [(t.tree_id,) + self._tree_state(t) for t in self.trees.values()]
+            adj_list = {tid: dict(neighbors) for tid, neighbors in self.adj_list.items()}
+        return trees, adj_list, self.thread_safe
+
+    def __setstate__(self, state):
+        trees, adj_list = state[:2]
+        self.__init__(thread_safe=len(state) > 2 and state[2])
+        for attributes in trees:
+            self.add_tree(Tree(*attributes))
+        self.adj_list.update({tid: dict(neighbors) for tid, neighbors in adj_list.items()})
+        self._edge_count = sum(1 for _ in self.iter_edges())
+        self._components = None  # the paths above bypassed the journal
 
     def __repr__(self):
         s = 'ForestGraph:\n'
@@ -0,0 +1,149 @@
+"""
+Immutable compressed-sparse-row (CSR) view of a ForestGraph.
+"""
+from collections.abc import Mapping
+from functools import cached_property
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .tree import Tree
+from .health_status import HEALTH_BY_CODE
+
+
+class FrozenTreeView(Mapping):
+    """Read-only {tree_id: Tree} mapping that builds Tree objects on access."""
+
+    def __init__(self, frozen):
+        self._frozen = frozen
+
+    def __getitem__(self, tree_id):
+        index = self._frozen.index_of(tree_id)
+        if index < 0:
+            raise KeyError(tree_id)
+        return self._frozen.tree_at(index)
+
+    def __contains__(self, tree_id):
+        return self._frozen.index_of(tree_id) >= 0
+
+    def __iter__(self):
+        return iter(self._frozen.ids.tolist())
+
+    def __len__(self):
+        return len(self._frozen.ids)
+
+
+class FrozenForestGraph:
+    """
+    Read-only snapshot of a forest stored as flat NumPy arrays.
+
+    Trees are renumbered to dense indices 0..N-1 in ascending tree ID order,
+    so ids[i] is the tree ID at index i. The neighbors of index i are
+    indices[indptr[i]:indptr[i+1]] (sorted) with the matching weights.
+    Like ForestGraph.adj_list, every undirected path is stored in both
+    directions.
+    """
+
+    def __init__(self, ids, indptr, indices, weights, health, ages, species_codes, species):
+        self.ids = ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.health = health
+        self.ages = ages
+        self.species_codes = species_codes
+        self.species = list(species)
+        for array in (ids, indptr, indices, weights, health, ages, species_codes):
+            array.flags.writeable = False
+        self.trees = FrozenTreeView(self)
+
+    @classmethod
+    def from_forest_graph(cls, forest_graph):
+        """
+        Build a frozen view of a ForestGraph.
+
+        Paths that reference IDs without a Tree in forest_graph.trees are
+        dropped, since none of the algorithms can use them.
+        """
+        ids = np.array(sorted(forest_graph.trees), dtype=np.int64)
+        n = len(ids)
+        index = {tree_id: i for i, tree_id in enumerate(ids.tolist())}
+
+        table = forest_graph.table
+        table_rows = np.array([table.row_of(tree_id) for tree_id in ids.tolist()], dtype=np.int64)
+        rows, cols, weights = [], [], []
+        for i, tree_id in enumerate(ids.tolist()):
+            for neighbor_id, weight in forest_graph.adj_list.get(tree_id, {}).items():
+                j = index.get(neighbor_id)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+                    weights.append(weight)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int32)
+        weights = np.array(weights, dtype=np.float64)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(ids, indptr, cols[order], weights[order], table.health[table_rows],
+                   table.ages[table_rows], table.species_codes[table_rows], table.species)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        """Number of undirected paths between distinct trees, as ForestGraph.edge_count."""
+        # Self-loops are stored once, every other path in both directions
+        return int(np.count_nonzero(self.edge_sources != self.indices)) // 2
+
+    def index_of(self, tree_id):
+        """Return the dense index of tree_id, or -1 if it is not in the graph."""
+        i = int(np.searchsorted(self.ids, tree_id))
+        if i < len(self.ids) and self.ids[i] == tree_id:
+            return i
+        return -1
+
+    def tree_at(self, index):
+        """Build a detached Tree object for the tree at a dense index."""
+        return Tree(int(self.ids[index]),
+                    self.species[self.species_codes[index]],
+                    int(self.ages[index]),
+                    HEALTH_BY_CODE[self.health[index]])
+
+    def health_code(self, tree_id):
+        """Return the health code of tree_id (see HEALTH_CODES), 0 if absent."""
+        index = self.index_of(tree_id)
+        return int(self.health[index]) if index >= 0 else 0
+
+    def get_neighbors(self, tree_id):
+        """Return a list of neighbor tree IDs."""
+        index = self.index_of(tree_id)
+        if index < 0:
+            return []
+        return self.ids[self.indices[self.indptr[index]:self.indptr[index + 1]]].tolist()
+
+    def get_distance(self, tree_id1, tree_id2):
+        """Get the weight/distance between two trees with O(log degree) complexity."""
+        i, j = self.index_of(tree_id1), self.index_of(tree_id2)
+        if i < 0 or j < 0:
+            return float('inf')
+        start, end = self.indptr[i], self.indptr[i + 1]
+        k = start + int(np.searchsorted(self.indices[start:end], j))
+        if k < end and self.indices[k] == j:
+            return float(self.weights[k])
+        return float('inf')
+
+    @cached_property
+    def edge_sources(self):
+        """Source index of every stored (directed) edge, aligned with indices."""
+        return np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.indptr))
+
+    def to_csr_matrix(self):
+        """Return the weights as a scipy.sparse CSR matrix (zero weights kept as edges)."""
+        n = len(self.ids)
+        return csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+
+    def __repr__(self):
+        return f"FrozenForestGraph(trees={len(self.ids)}, paths={self.edge_count})"
@@ -4,3 +4,22 @@ class HealthStatus(Enum):
     HEALTHY = 'healthy'
     INFECTED = 'infected'
     AT_RISK = 'at_risk'
+
+# Compact integer codes used by the array-based representations.
+# Code 0 is reserved for "no tree".
+HEALTH_CODES = {status: code for code, status in enumerate(HealthStatus, 1)}
+HEALTH_BY_CODE = (None,) + tuple(HealthStatus)
+
+def parse_health_status(status):
+    """Convert a HealthStatus, its name or its value to a HealthStatus."""
+    if isinstance(status, HealthStatus):
+        return status
+    try:
+        if isinstance(status, str):
+            try:
+                return HealthStatus[status.upper()]
+            except KeyError:
+                return HealthStatus(status.lower())
+        return HealthStatus(status)
+    except (ValueError, TypeError, KeyError):
+        raise ValueError(f"'{status}' is not a valid HealthStatus or cannot be converted.")
@@ -0,0 +1,162 @@
+"""
+Forest graphs split into shards for parallel analytics.
+"""
+import numpy as np
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+from .frozen_graph import FrozenForestGraph
+
+
+class Shard:
+    """
+    One part of a PartitionedForestGraph.
+
+    graph is a FrozenForestGraph of the shard's trees and the paths between
+    them. members holds the dense indices of those trees in the parent
+    graph (ascending, so local index i is members[i]) and boundary the
+    local indices of the trees with a path into another shard.
+    """
+
+    def __init__(self, shard_id, graph, members, boundary):
+        self.shard_id = shard_id
+        self.graph = graph
+        self.members = members
+        self.boundary = boundary
+
+    def __repr__(self):
+        return f"Shard({self.shard_id}, trees={len(self.graph)}, boundary={len(self.boundary)})"
+
+
+class PartitionedForestGraph:
+    """
+    A FrozenForestGraph split into shards.
+
+    Every tree belongs to exactly one shard. Paths inside a shard are kept
+    in the shard's own graph; paths between shards (cut edges) are kept by
+    the partition, in both directions, as parent dense indices. Trees at
+    either end of a cut edge are the boundary trees.
+    """
+
+    def __init__(self, frozen, assignment):
+        """
+        Args:
+            frozen: The FrozenForestGraph to split
+            assignment: Shard number of every dense index of frozen
+        """
+        assignment = np.asarray(assignment, dtype=np.int32)
+        if len(assignment) != len(frozen):
+            raise ValueError("assignment must have one shard number per tree")
+        self.frozen = frozen
+        self.shard_of = assignment
+        shard_count = int(assignment.max()) + 1 if len(assignment) else 0
+
+        order = np.argsort(assignment, kind='stable')
+        sizes = np.bincount(assignment, minlength=shard_count)
+        self.local_index = np.empty(len(frozen), dtype=np.int32)
+        self.local_index[order] = np.concatenate(
+            [np.arange(size, dtype=np.int32) for size in sizes]) if len(order) else order
+
+        sources, targets = frozen.edge_sources, frozen.indices
+        cut = assignment[sources] != assignment[targets]
+        self.cut_sources = sources[cut].astype(np.int64)
+        self.cut_targets = targets[cut].astype(np.int64)
+        self.cut_weights = np.asarray(frozen.weights)[cut]
+        self.is_boundary = np.zeros(len(frozen), dtype=bool)
+        self.is_boundary[self.cut_sources] = True
+
+        self.shards = []
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        for shard_id in range(shard_count):
+            members = order[starts[shard_id]:starts[shard_id + 1]].astype(np.int64)
+            self.shards.append(self._build_shard(shard_id, members, ~cut))
+
+    def _build_shard(self, shard_id, members, internal):
+        frozen = self.frozen
+        sources = frozen.edge_sources
+        keep = internal & (self.shard_of[sources] == shard_id)
+        rows = self.local_index[sources[keep]]
+        indptr = np.zeros(len(members) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(members)), out=indptr[1:])
+        # members are ascending, so the per-row order of the parent CSR still holds
+        graph = FrozenForestGraph(frozen.ids[members], indptr,
+                                  self.local_index[frozen.indices[keep]],
+                                  np.asarray(frozen.weights)[keep],
+                                  frozen.health[members], frozen.ages[members],
+                                  frozen.species_codes[members], frozen.species)
+        boundary = np.flatnonzero(self.is_boundary[members]).astype(np.int32)
+        return Shard(shard_id, graph, members, boundary)
+
+    @classmethod
+    def from_graph(cls, forest_graph, shard_count, positions=None):
+        """
+        Split a ForestGraph (or FrozenForestGraph) into shard_count shards.
+
+        With positions ({tree_id: (x, y)}) the split is spatial: the canvas
+        is cut recursively at the median along its longer side, and trees
+        without a position go to the last shard. Without positions the
+        trees are laid out in reverse Cuthill-McKee order, a breadth-first
+        order that keeps neighbors close together, and cut into runs of
+        equal size, so few paths cross between shards.
+        """
+        frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+        shard_count = max(1, min(shard_count, len(frozen)))
+        if positions is not None:
+            assignment = _spatial_assignment(frozen, shard_count, positions)
+        else:
+            assignment = _graph_assignment(frozen, shard_count)
+        return cls(frozen, assignment)
+
+    def __len__(self):
+        return len(self.shards)
+
+    @property
+    def cut_edge_count(self):
+        """Number of undirected paths between shards."""
+        return len(self.cut_sources) // 2
+
+    def shard_of_tree(self, tree_id):
+        """Return the Shard holding tree_id, or None if it is not in the graph."""
+        index = self.frozen.index_of(tree_id)
+        return self.shards[self.shard_of[index]] if index >= 0 else None
+
+    def boundary_ids(self):
+        """Return the IDs of all boundary trees."""
+        return self.frozen.ids[self.is_boundary].tolist()
+
+    def __repr__(self):
+        return (f"PartitionedForestGraph(shards={len(self.shards)}, trees={len(self.frozen)}, "
+                f"cut_paths={self.cut_edge_count})")
+
+
+def _graph_assignment(frozen, shard_count):
+    n = len(frozen)
+    order = reverse_cuthill_mckee(frozen.to_csr_matrix(), symmetric_mode=True)
+    assignment = np.empty(n, dtype=np.int32)
+    assignment[order] = np.arange(n, dtype=np.int64) * shard_count // max(n, 1)
+    return assignment
+
+
+def _spatial_assignment(frozen, shard_count, positions):
+    n = len(frozen)
+    xy = np.full((n, 2), np.nan)
+    for i, tree_id in enumerate(frozen.ids.tolist()):
+        position = positions.get(tree_id)
+        if position is not None:
+            xy[i] = position
+    assignment = np.full(n, shard_count - 1, dtype=np.int32)
+    placed = np.flatnonzero(~np.isnan(xy[:, 0]))
+    _bisect(xy, placed, 0, shard_count, assignment)
+    return assignment
+
+
+def _bisect(xy, rows, first_shard, shard_count, assignment):
+    if shard_count == 1 or len(rows) == 0:
+        assignment[rows] = first_shard
+        return
+    points = xy[rows]
+    axis = int(np.ptp(points[:, 1]) > np.ptp(points[:, 0]))
+    left_count = shard_count // 2
+    split = len(rows) * left_count // shard_count
+    order = np.argsort(points[:, axis], kind='stable')
+    _bisect(xy, rows[order[:split]], first_shard, left_count, assignment)
+    _bisect(xy, rows[order[split:]], first_shard + left_count, shard_count - left_count, assignment)
@@ -0,0 +1,220 @@
+"""
+Canvas positions of trees.
+"""
+import math
+import weakref
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from .snapshot import Snapshot
+
+
+class PositionStore(MutableMapping):
+    """
+    {tree_id: (x, y)} mapping of canvas positions with copy-on-write
+    snapshots. The version counter is bumped by every change.
+
+    Coordinates live in an Nx2 float array (one row per tree, freed rows
+    reused) and every tree is also filed in a uniform grid of square cells,
+    so nearest() only looks at the few cells around the query point.
+    segment_hit() tests a whole batch of segments with NumPy.
+    """
+
+    def __init__(self, positions=None, cell_size=5.0):
+        self.cell_size = cell_size
+        self._xy = np.zeros((64, 2), dtype=np.float64)
+        self._ids = np.full(64, -1, dtype=np.int64)  # {row: tree_id}
+        self._row_of = {}  # {tree_id: row of _xy}
+        self._free = []
+        self._size = 0  # rows ever used
+        self._grid = {}  # {(cell_x, cell_y): set of rows}
+        self._cell_of = {}  # {tree_id: (cell_x, cell_y)}
+        self._layout_version = 0  # bumped when rows are assigned or freed
+        self._segment_rows_cache = None  # (ids1, ids2, layout version, rows1, rows2)
+        self._segment_cache = None  # (ids1, ids2, version, segment geometry)
+        self._snapshots = weakref.WeakSet()
+        self.version = 0
+        if positions:
+            self.update(positions)
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def __getitem__(self, tree_id):
+        row = self._row_of[tree_id]
+        return (float(self._xy[row, 0]), float(self._xy[row, 1]))
+
+    def get(self, tree_id, default=None):
+        row = self._row_of.get(tree_id)
+        if row is None:
+            return default
+        return (float(self._xy[row, 0]), float(self._xy[row, 1]))
+
+    def __setitem__(self, tree_id, position):
+        x, y = position
+        x, y = float(x), float(y)
+        row = self._row_of.get(tree_id)
+        old = (float(self._xy[row, 0]), float(self._xy[row, 1])) if row is not None else None
+        for snapshot in self._snapshots:
+            snapshot.preserve(tree_id, old)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self._xy):
+                    self._xy = np.concatenate([self._xy, np.zeros_like(self._xy)])
+                    self._ids = np.concatenate([self._ids, np.full_like(self._ids, -1)])
+                row = self._size
+                self._size += 1
+            self._row_of[tree_id] = row
+            self._ids[row] = tree_id
+            self._layout_version += 1
+        self._xy[row] = (x, y)
+        cell = self._cell(x, y)
+        old_cell = self._cell_of.get(tree_id)
+        if cell != old_cell:
+            if old_cell is not None:
+                self._grid_discard(row, old_cell)
+            self._grid.setdefault(cell, set()).add(row)
+            self._cell_of[tree_id] = cell
+        self.version += 1
+
+    def __delitem__(self, tree_id):
+        row = self._row_of.pop(tree_id)
+        old = (float(self._xy[row, 0]), float(self._xy[row, 1]))
+        for snapshot in self._snapshots:
+            snapshot.preserve(tree_id, old)
+        self._free.append(row)
+        self._ids[row] = -1
+        self._grid_discard(row, self._cell_of.pop(tree_id))
+        self._layout_version += 1
+        self.version += 1
+
+    def _grid_discard(self, row, cell):
+        members = self._grid[cell]
+        members.discard(row)
+        if not members:
+            del self._grid[cell]
+
+    def __iter__(self):
+        return iter(self._row_of)
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, tree_id):
+        return tree_id in self._row_of
+
+    def clear(self):
+        for tree_id in list(self._row_of):
+            del self[tree_id]
+
+    def nearest(self, x, y, max_distance):
+        """
+        Return the ID of the tree closest to (x, y) within max_distance, or
+        None. Only the grid cells that overlap the search circle are visited.
+        """
+        min_cx, min_cy = self._cell(x - max_distance, y - max_distance)
+        max_cx, max_cy = self._cell(x + max_distance, y + max_distance)
+        rows = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                rows.extend(self._grid.get((cx, cy), ()))
+        if not rows:
+            return None
+        rows = np.array(rows, dtype=np.int64)
+        xy = self._xy[rows]
+        dist2 = (xy[:, 0] - x) ** 2 + (xy[:, 1] - y) ** 2
+        k = int(np.argmin(dist2))
+        if dist2[k] > max_distance * max_distance:
+            return None
+        return int(self._ids[rows[k]])
+
+    def _segment_rows(self, ids1, ids2):
+        cache = self._segment_rows_cache
+        if cache is not None and cache[0] is ids1 and cache[1] is ids2 and cache[2] == self._layout_version:
+            return cache[3], cache[4]
+        row_of = self._row_of
+        rows1 = np.fromiter((row_of.get(i, -1) for i in ids1.tolist()), dtype=np.int64, count=len(ids1))
+        rows2 = np.fromiter((row_of.get(i, -1) for i in ids2.tolist()), dtype=np.int64, count=len(ids2))
+        self._segment_rows_cache = (ids1, ids2, self._layout_version, rows1, rows2)
+        return rows1, rows2
+
+    def _segments(self, ids1, ids2):
+        cache = self._segment_cache
+        if cache is not None and cache[0] is ids1 and cache[1] is ids2 and cache[2] == self.version:
+            return cache[3]
+        rows1, rows2 = self._segment_rows(ids1, ids2)
+        placed = np.flatnonzero((rows1 >= 0) & (rows2 >= 0))
+        p1 = self._xy[rows1[placed]]
+        p2 = self._xy[rows2[placed]]
+        segments = (placed, p1, p2 - p1, np.minimum(p1, p2), np.maximum(p1, p2))
+        self._segment_cache = (ids1, ids2, self.version, segments)
+        return segments
+
+    def segment_lengths(self, ids1, ids2):
+        """
+        Return the straight-line length of every segment ids1[k]-ids2[k]
+        as a float array, NaN where an end has no position. Shares the
+        segment geometry cache of segment_hit().
+        """
+        placed, _, d, _, _ = self._segments(ids1, ids2)
+        lengths = np.full(len(ids1), np.nan)
+        lengths[placed] = np.hypot(d[:, 0], d[:, 1])
+        return lengths
+
+    def segment_hit(self, x, y, ids1, ids2, max_distance):
+        """
+        Return the index k of the segment ids1[k]-ids2[k] closest to (x, y)
+        within max_distance, or -1. Segments with an unplaced end are skipped.
+
+        ids1/ids2 are NumPy arrays of tree IDs (e.g. from
+        ForestGraph.edges_array()). The segment coordinates and bounding
+        boxes are cached while the same arrays are passed and no position
+        changes, so repeated clicks only pay for a few vector comparisons.
+        """
+        if len(ids1) == 0:
+            return -1
+        placed, p1, d, low, high = self._segments(ids1, ids2)
+        # Bounding-box filter, then the exact distance for the few candidates
+        near = np.flatnonzero((low[:, 0] <= x + max_distance) & (high[:, 0] >= x - max_distance) &
+                              (low[:, 1] <= y + max_distance) & (high[:, 1] >= y - max_distance))
+        if len(near) == 0:
+            return -1
+        p1, d = p1[near], d[near]
+        length2 = (d * d).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = ((x - p1[:, 0]) * d[:, 0] + (y - p1[:, 1]) * d[:, 1]) / length2
+        t = np.where(length2 > 0, np.clip(t, 0.0, 1.0), 0.0)
+        dx = p1[:, 0] + t * d[:, 0] - x
+        dy = p1[:, 1] + t * d[:, 1] - y
+        dist2 = dx * dx + dy * dy
+        k = int(np.argmin(dist2))
+        return int(placed[near[k]]) if dist2[k] <= max_distance * max_distance else -1
+
+    def snapshot(self):
+        """Return an O(1) copy-on-write Snapshot of the current positions."""
+        snapshot = Snapshot(self)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def _current_entries(self, keys):
+        return {tree_id: self.get(tree_id) for tree_id in keys}
+
+    def _restore_entries(self, saved):
+        for tree_id, position in saved.items():
+            if position is None:
+                self.pop(tree_id, None)
+            else:
+                self[tree_id] = position
+
+    def __getstate__(self):
+        return dict(self.items()), self.cell_size
+
+    def __setstate__(self, state):
+        positions, cell_size = state
+        self.__init__(positions, cell_size)
+
+    def __repr__(self):
+        return f"PositionStore({dict(self.items())})"
@@ -0,0 +1,51 @@
+"""
+Copy-on-write snapshots for ForestGraph and PositionStore.
+"""
+
+
+class Snapshot:
+    """
+    Copy-on-write snapshot of a mutable store.
+
+    Taking a snapshot is O(1): nothing is copied. Until it is released, the
+    owner hands the snapshot the original value of every entry the first
+    time that entry changes (None meaning "did not exist"). Restoring writes
+    back only those entries, and the snapshot stays valid afterwards.
+    """
+
+    def __init__(self, owner):
+        self._owner = owner
+        self._saved = {}  # {entry key: value at snapshot time}
+        self._restoring = False
+        self._released = False
+
+    @property
+    def changed_count(self):
+        """Number of entries changed since the snapshot (or the last restore)."""
+        return len(self._saved)
+
+    def saved(self):
+        """Return {entry key: snapshot value} for every entry changed so far."""
+        return dict(self._saved)
+
+    def preserve(self, key, old):
+        """Remember old as the snapshot value of key unless one is already saved."""
+        if not self._restoring and key not in self._saved:
+            self._saved[key] = old
+
+    def restore(self):
+        """Put every changed entry of the owner back to its snapshot value."""
+        if self._released:
+            raise RuntimeError("Cannot restore a released snapshot.")
+        self._restoring = True
+        try:
+            self._owner._restore_entries(self._saved)
+        finally:
+            self._restoring = False
+        self._saved = {}
+
+    def release(self):
+        """Stop tracking changes; the snapshot can no longer be restored."""
+        self._owner._snapshots.discard(self)
+        self._saved = {}
+        self._released = True
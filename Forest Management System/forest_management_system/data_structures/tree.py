@@ -1,36 +1,99 @@
-from .health_status import HealthStatus
+from .health_status import HealthStatus, parse_health_status
 
 class Tree:
+    # A Tree added to a ForestGraph becomes a view over one row of the
+    # graph's TreeTable: species, age and health are read from and written to
+    # the table (forest to the graph), and the private fields below are unused
+    # until it is removed. The graph does not keep Tree objects; it builds
+    # views on access and tracks the live ones through weak references.
+    __slots__ = ('tree_id', '_graph', '_row', '_species', '_age', '_health_status', '_forest',
+                 '__weakref__')
+
     def __init__(self, tree_id, species, age, health_status, forest=None):
         self.tree_id = tree_id
-        self.species = species
-        self.age = age
-        self.forest = forest
+        self._graph = None
+        self._row = None
+        self._species = species
+        self._age = age
+        self._forest = forest
         self.set_health_status(health_status)
 
     def set_health_status(self, status):
-        if isinstance(status, HealthStatus):
+        status = parse_health_status(status)
+        if self._graph is not None:
+            self._graph.update_health_status(self.tree_id, status)
+        else:
             self._health_status = status
-            return
-        try:
-            if isinstance(status, str):
-                try:
-                    self._health_status = HealthStatus[status.upper()]
-                except KeyError:
-                    self._health_status = HealthStatus(status.lower())
-            else:
-                self._health_status = HealthStatus(status)
-        except (ValueError, TypeError, KeyError):
-            raise ValueError(f"'{status}' is not a valid HealthStatus or cannot be converted.")
 
     @property
     def health_status(self):
+        if self._graph is not None:
+            return self._graph.table.health_at(self._row)
         return self._health_status
 
     @health_status.setter
     def health_status(self, status):
         self.set_health_status(status)
 
+    @property
+    def species(self):
+        if self._graph is not None:
+            return self._graph.table.species_at(self._row)
+        return self._species
+
+    @species.setter
+    def species(self, species):
+        if self._graph is not None:
+            self._graph.update_tree(self.tree_id, species=species)
+        else:
+            self._species = species
+
+    @property
+    def age(self):
+        if self._graph is not None:
+            return self._graph.table.age_at(self._row)
+        return self._age
+
+    @age.setter
+    def age(self, age):
+        if self._graph is not None:
+            self._graph.update_tree(self.tree_id, age=age)
+        else:
+            self._age = age
+
+    @property
+    def forest(self):
+        if self._graph is not None:
+            return self._graph._forests.get(self.tree_id)
+        return self._forest
+
+    @forest.setter
+    def forest(self, forest):
+        if self._graph is not None:
+            self._graph._set_forest(self.tree_id, forest)
+        else:
+            self._forest = forest
+
+    def _bind(self, graph, row):
+        """Make this tree a view over a TreeTable row that already holds its data."""
+        self._graph = graph
+        self._row = row
+        self._species = self._age = self._health_status = self._forest = None
+
+    def _detach(self):
+        """Copy the row data back into the object and stop viewing the table."""
+        if self._graph is not None:
+            self._species, self._age, self._health_status, self._forest = (
+                self.species, self.age, self.health_status, self.forest)
+            self._graph = None
+            self._row = None
+
+    def __getstate__(self):
+        return (self.tree_id, self.species, self.age, self.health_status, self.forest)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
     def __repr__(self):
         return (f"Tree(id={self.tree_id}, species={self.species}, age={self.age}, "
                 f"health_status={self.health_status.name}, forest={self.forest})")
@@ -0,0 +1,149 @@
+"""
+Columnar (struct-of-arrays) storage for tree attributes.
+"""
+from collections import Counter
+
+import numpy as np
+
+from .health_status import HEALTH_CODES, HEALTH_BY_CODE
+
+
+class TreeTable:
+    """
+    Stores species, age and health for every tree in a ForestGraph as
+    parallel NumPy columns, one row per tree.
+
+    Species are categorical: species_codes holds an index into the species
+    list. A row with health code 0 is free; freed rows are reused before the
+    columns grow.
+    """
+
+    def __init__(self, capacity=64):
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.ages = np.zeros(capacity, dtype=np.int32)
+        self.health = np.zeros(capacity, dtype=np.uint8)
+        self.species_codes = np.full(capacity, -1, dtype=np.int32)
+        self.species = []  # {code: species name}
+        self._species_index = {}  # {species name: code}
+        self._row_of = {}  # {tree_id: row}
+        self._free = []
+        self._size = 0  # rows in use or freed; rows >= _size were never used
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, tree_id):
+        return tree_id in self._row_of
+
+    def __iter__(self):
+        """Iterate over the stored tree IDs in insertion order."""
+        return iter(self._row_of)
+
+    def row_of(self, tree_id):
+        """Return the row that holds tree_id, or None."""
+        return self._row_of.get(tree_id)
+
+    @property
+    def row_count(self):
+        """Number of rows ever used (live or free); every row index is below it."""
+        return self._size
+
+    def rows_of(self, tree_ids):
+        """Return an int64 array with the row of each tree ID, -1 where absent."""
+        return np.fromiter((self._row_of.get(tree_id, -1) for tree_id in tree_ids), dtype=np.int64)
+
+    def _grow(self, capacity):
+        for name, fill in (('ids', -1), ('ages', 0), ('health', 0), ('species_codes', -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def species_code(self, species):
+        """Return the categorical code of species, registering it if new."""
+        code = self._species_index.get(species)
+        if code is None:
+            code = self._species_index[species] = len(self.species)
+            self.species.append(species)
+        return code
+
+    def insert(self, tree_id, species, age, health_status):
+        """Store a tree's attributes and return its row (reused if tree_id is present)."""
+        row = self._row_of.get(tree_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self.ids):
+                    self._grow(max(64, 2 * len(self.ids)))
+                row = self._size
+                self._size += 1
+            self._row_of[tree_id] = row
+            self.ids[row] = tree_id
+        self.ages[row] = age
+        self.species_codes[row] = self.species_code(species)
+        self.health[row] = HEALTH_CODES[health_status]
+        return row
+
+    def remove(self, tree_id):
+        """Free the row of tree_id."""
+        row = self._row_of.pop(tree_id, None)
+        if row is not None:
+            self.ids[row] = -1
+            self.health[row] = 0
+            self.species_codes[row] = -1
+            self._free.append(row)
+
+    def clear(self):
+        self.__init__()
+
+    # Row accessors used by bound Tree objects
+
+    def species_at(self, row):
+        return self.species[self.species_codes[row]]
+
+    def age_at(self, row):
+        return int(self.ages[row])
+
+    def health_at(self, row):
+        return HEALTH_BY_CODE[self.health[row]]
+
+    def set_species(self, row, species):
+        self.species_codes[row] = self.species_code(species)
+
+    def set_age(self, row, age):
+        self.ages[row] = age
+
+    def set_health(self, row, health_status):
+        self.health[row] = HEALTH_CODES[health_status]
+
+    # Vectorized queries
+
+    def health_counts(self):
+        """Return a Counter {HealthStatus: count} of the stored trees."""
+        counts = np.bincount(self.health[:self._size], minlength=len(HEALTH_BY_CODE))
+        return Counter({HEALTH_BY_CODE[code]: int(count)
+                        for code, count in enumerate(counts) if code and count})
+
+    def species_counts(self):
+        """Return a Counter {species: count} of the stored trees."""
+        codes = self.species_codes[:self._size]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.species))
+        return Counter({self.species[code]: int(count)
+                        for code, count in enumerate(counts) if count})
+
+    def select(self, health_status=None, species=None, min_age=None, max_age=None):
+        """Return an array of the tree IDs that match every given filter."""
+        mask = self.health[:self._size] != 0
+        if health_status is not None:
+            mask &= self.health[:self._size] == HEALTH_CODES[health_status]
+        if species is not None:
+            code = self._species_index.get(species)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.species_codes[:self._size] == code
+        if min_age is not None:
+            mask &= self.ages[:self._size] >= min_age
+        if max_age is not None:
+            mask &= self.ages[:self._size] <= max_age
+        return self.ids[:self._size][mask]
@@ -10,7 +10,6 @@ import matplotlib.pyplot as plt
 from collections import Counter
 import csv
 import os
-import copy
 
 from .main_window import MainWindow
 from .dialogs.tree_dialogs import AddTreeDialog, DeleteTreeDialog, ModifyHealthDialog
@@ -22,16 +21,19 @@ from .handlers.ui_actions import UIActions
 from forest_management_system.data_structures.forest_graph import ForestGraph
 from forest_management_system.data_structures.tree import Tree
 from forest_management_system.data_structures.path import Path
+from forest_management_system.data_structures.position_store import PositionStore
+from forest_management_system.data_structures.edit_history import EditHistory
 from forest_management_system.data_structures.health_status import HealthStatus
 from forest_management_system.io.dataset_loader import load_forest_from_files
 from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.path_cache import PathCache
 from forest_management_system.algorithms.reserve_detection import find_reserves
 
 class AppLogic:
     def __init__(self, root):
         self.root = root
         self.forest_graph = ForestGraph()
-        self.tree_positions = {}
+        self.tree_positions = PositionStore()
         self._pre_infection_health = {}
         
         # Snapshot storage for original imported data
@@ -39,6 +41,15 @@ class AppLogic:
         self.snapshot_forest_graph = None
         self.snapshot_tree_positions = None
 
+        # Undo/redo of user edits
+        self.history = EditHistory(self.forest_graph, self.tree_positions)
+
+        # Shortest path results, dropped whenever the graph changes
+        self.path_cache = PathCache()
+
+        # Distance of the highlighted shortest path, repaired on every redraw
+        self.route_distance = None
+
         self.main_window = MainWindow(root)
         
         # Handlers
@@ -49,29 +60,48 @@ class AppLogic:
         self.main_window.control_panel.connect_actions(self.ui_actions)
         self.main_window.forest_canvas.setup_canvas_bindings(self.canvas_handler)
         
+        self.root.bind('<Control-z>', lambda event: self.ui_actions.undo())
+        self.root.bind('<Control-y>', lambda event: self.ui_actions.redo())
+
         self.status_bar = self.main_window.status_bar
         self.update_display()
 
     def update_display(self):
         """Redraws the canvas and updates the info panel."""
+        self.route_distance = self.ui_actions.update_live_route()
         self.main_window.forest_canvas.draw_forest(self.forest_graph, self.tree_positions)
         self.main_window.info_panel.update_info(self.forest_graph, find_reserves)
         
     def create_snapshot(self):
-        """Create a snapshot of the current forest data."""
-        self.snapshot_forest_graph = copy.deepcopy(self.forest_graph)
-        self.snapshot_tree_positions = copy.deepcopy(self.tree_positions)
+        """Create a copy-on-write snapshot of the current forest data."""
+        self.release_snapshot()
+        self.snapshot_forest_graph = self.forest_graph.snapshot()
+        self.snapshot_tree_positions = self.tree_positions.snapshot()
         self.has_snapshot = True
-        
+
     def restore_snapshot(self):
-        """Restore the forest data from the snapshot."""
+        """Restore the forest data from the snapshot, rewriting only what changed."""
         if self.has_snapshot:
-            self.forest_graph = copy.deepcopy(self.snapshot_forest_graph)
-            self.tree_positions = copy.deepcopy(self.snapshot_tree_positions)
+            self.snapshot_forest_graph.restore()
+            self.snapshot_tree_positions.restore()
+            self.history.clear()
             self.update_display()
             return True
         return False
 
+    def reset_history(self):
+        """Start a fresh undo/redo history for the current graph and positions."""
+        self.history = EditHistory(self.forest_graph, self.tree_positions)
+
+    def release_snapshot(self):
+        """Drop the snapshot so that later edits are no longer tracked."""
+        if self.has_snapshot:
+            self.snapshot_forest_graph.release()
+            self.snapshot_tree_positions.release()
+        self.has_snapshot = False
+        self.snapshot_forest_graph = None
+        self.snapshot_tree_positions = None
+
     def run(self):
         """Starts the Tkinter main loop."""
         self.root.mainloop() 
\ No newline at end of file
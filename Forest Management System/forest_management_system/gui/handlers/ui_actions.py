@@ -16,12 +16,13 @@ import tkinter as tk
 from ...data_structures.tree import Tree
 from ...data_structures.path import Path
 from ...data_structures.health_status import HealthStatus
+from ...data_structures.position_store import PositionStore
 from ...io.dataset_loader import load_forest_from_files
-from ...algorithms.pathfinding import find_shortest_path
 from ..dialogs.tree_dialogs import AddTreeDialog, DeleteTreeDialog, ModifyHealthDialog
 from ..dialogs.path_dialogs import ShortestPathDialog
 from ..dialogs.data_dialog import LoadDataDialog
 from forest_management_system.algorithms.force_layout import force_directed_layout
+from forest_management_system.algorithms.dynamic_shortest_path import DynamicShortestPathTree
 
 class UIActions:
     def __init__(self, app_logic):
@@ -33,16 +34,19 @@ class UIActions:
         self.add_path_mode = False
         self.delete_path_mode = False
         self.infection_sim_mode = False
+        # Highlighted shortest path: (start_id, end_id, DynamicShortestPathTree built on the first edit)
+        self.live_route = None
 
     # Tree Actions
     def add_tree(self):
         dialog = AddTreeDialog(self.root)
         result = dialog.show()
         if result:
-            tree_id = max([t.tree_id for t in self.app.forest_graph.trees.values()], default=0) + 1
+            tree_id = self.app.forest_graph.next_tree_id()
             tree = Tree(tree_id, result["species"], result["age"], result["health"])
-            self.app.forest_graph.add_tree(tree)
-            self.app.tree_positions[tree_id] = (random.uniform(10, 90), random.uniform(10, 90))
+            with self.app.history.action(f"Add tree {tree_id}"):
+                self.app.forest_graph.add_tree(tree)
+                self.app.tree_positions[tree_id] = (random.uniform(10, 90), random.uniform(10, 90))
             self.app.update_display()
             self.app.status_bar.set_text(f"✅ Tree {tree_id} added.")
 
@@ -63,9 +67,10 @@ class UIActions:
     def delete_tree_at_position(self, x, y):
         tree = self.app.canvas_handler._find_tree_at_position(x, y)
         if tree:
-            self.app.forest_graph.remove_tree(tree.tree_id)
-            if tree.tree_id in self.app.tree_positions:
-                del self.app.tree_positions[tree.tree_id]
+            with self.app.history.action(f"Delete tree {tree.tree_id}"):
+                self.app.forest_graph.remove_tree(tree.tree_id)
+                if tree.tree_id in self.app.tree_positions:
+                    del self.app.tree_positions[tree.tree_id]
             self.app.update_display()
             self.app.status_bar.set_text(f"✅ Tree {tree.tree_id} deleted.")
         else:
@@ -84,7 +89,8 @@ class UIActions:
         if result:
             tree_id = result["tree_id"]
             new_health = result["health"]
-            self.app.forest_graph.update_health_status(tree_id, new_health)
+            with self.app.history.action(f"Change health of tree {tree_id}"):
+                self.app.forest_graph.update_health_status(tree_id, new_health)
             self.app.update_display()
             self.app.status_bar.set_text(f"✅ Tree {tree_id} health updated.")
 
@@ -118,7 +124,8 @@ class UIActions:
                 pos1 = self.app.tree_positions[self.canvas.path_start.tree_id]
                 pos2 = self.app.tree_positions[clicked_tree.tree_id]
                 distance = np.sqrt((pos2[0]-pos1[0])**2 + (pos2[1]-pos1[1])**2)
-                self.app.forest_graph.add_path(Path(self.canvas.path_start, clicked_tree, distance))
+                with self.app.history.action(f"Add path {self.canvas.path_start.tree_id}-{clicked_tree.tree_id}"):
+                    self.app.forest_graph.add_path(Path(self.canvas.path_start, clicked_tree, distance))
                 self.app.status_bar.set_text(f"✅ Path {self.canvas.path_start.tree_id}-{clicked_tree.tree_id} added with distance {distance:.1f}.")
                 self.canvas.path_start = None
             else:
@@ -127,8 +134,7 @@ class UIActions:
 
     def start_delete_path(self):
         # Check if there are any paths
-        has_paths = any(len(neighbors) > 0 for neighbors in self.app.forest_graph.adj_list.values())
-        if not has_paths:
+        if self.app.forest_graph.edge_count == 0:
             messagebox.showwarning("Warning", "No paths to delete.", parent=self.root)
             return
         self.delete_path_mode = True
@@ -143,12 +149,28 @@ class UIActions:
     def _clear_path_highlight(self):
         """Clear the shortest path highlight and update the display."""
         self.canvas._shortest_path_highlight = []
+        self.live_route = None
         self.app.update_display()
 
+    def update_live_route(self):
+        """
+        Repair the highlighted shortest path after edits (e.g. while a tree
+        is dragged) and return its distance, or None if nothing is highlighted.
+        """
+        if self.live_route is None:
+            return None
+        start_id, end_id, route = self.live_route
+        if route is None or route.graph is not self.app.forest_graph:
+            route = DynamicShortestPathTree(self.app.forest_graph, start_id)
+            self.live_route = (start_id, end_id, route)
+        self.canvas._shortest_path_highlight = route.path_to(end_id)
+        return route.distance_to(end_id)
+
     def delete_path_at_position(self, x, y):
         path_to_delete = self.app.canvas_handler.find_path_at_position(x, y)
         if path_to_delete:
-            self.app.forest_graph.remove_path(path_to_delete.tree1.tree_id, path_to_delete.tree2.tree_id)
+            with self.app.history.action(f"Delete path {path_to_delete.tree1.tree_id}-{path_to_delete.tree2.tree_id}"):
+                self.app.forest_graph.remove_path(path_to_delete.tree1.tree_id, path_to_delete.tree2.tree_id)
             self.app.update_display()
             self.app.status_bar.set_text(f"✅ Path deleted.")
 
@@ -162,7 +184,9 @@ class UIActions:
         
         if result:
             start_id, end_id = result
-            path, dist = find_shortest_path(self.app.forest_graph, start_id, end_id)
+            path, dist = self.app.path_cache.find_shortest_path(self.app.forest_graph, start_id, end_id,
+                                                                algorithm='astar',
+                                                                positions=self.app.tree_positions)
             
             if dist == float('inf'):
                 self.canvas._shortest_path_highlight = []
@@ -170,24 +194,21 @@ class UIActions:
                 messagebox.showinfo("No Path", "No path found between the selected trees.", parent=self.root)
                 self.app.status_bar.set_text("❌ No path found")
             else:
-                # Highlight the path in the canvas
+                # Highlight the path in the canvas; it follows trees being dragged
                 self.canvas._shortest_path_highlight = path
+                self.live_route = (start_id, end_id, None)
                 self.app.update_display()
                 
                 # Show path information in status bar and in a popup
                 path_str = " → ".join(map(str, path))
                 self.app.status_bar.set_text(f"🔵 Shortest path: {path_str} (Distance: {dist:.2f})")
                 
-                # Display the path in a popup - when this closes, the path highlight will be cleared
+                # Display the path in a popup; the highlight stays until the canvas background is clicked
                 try:
-                    # Create info dialog and clear path highlight when closed
-                    result = messagebox.showinfo("Path Found", 
-                                            f"Shortest Path: {path_str}\nDistance: {dist:.2f}", 
-                                            parent=self.root)
-                    # Clear highlight immediately after dialog is closed
-                    self._clear_path_highlight()
+                    messagebox.showinfo("Path Found",
+                                        f"Shortest Path: {path_str}\nDistance: {dist:.2f}",
+                                        parent=self.root)
                 except Exception:
-                    # Also clear highlight if exception occurs
                     self._clear_path_highlight()
 
     # Data Actions
@@ -198,8 +219,15 @@ class UIActions:
             return
         tree_file, path_file = result
         try:
-            self.app.forest_graph = load_forest_from_files(tree_file, path_file)
-            self.app.tree_positions.clear()
+            forest_graph = load_forest_from_files(tree_file, path_file)
+            # The old snapshot belongs to the graph being replaced: "Restore
+            # Original" must not bring it back if the code below returns early or fails
+            self.app.release_snapshot()
+            self.control_panel.restore_original_btn.config(state='disabled')
+            self.app.forest_graph = forest_graph
+            self.app.tree_positions = PositionStore()
+            # Undo/redo must follow the new graph even if the layout below returns early or fails
+            self.app.reset_history()
 
             trees = list(self.app.forest_graph.trees.keys())
             n_trees = len(trees)
@@ -208,11 +236,11 @@ class UIActions:
                 self.app.status_bar.set_text("✅ No trees to display.")
                 return
 
-            # Build weight mapping from adjacency list
+            # Build weight mapping in both directions, as the layout expects
             weights = {}
-            for tree1_id, neighbors in self.app.forest_graph.adj_list.items():
-                for tree2_id, weight in neighbors.items():
-                    weights[(tree1_id, tree2_id)] = weight
+            for tree1_id, tree2_id, weight in self.app.forest_graph.iter_edges():
+                weights[(tree1_id, tree2_id)] = weight
+                weights[(tree2_id, tree1_id)] = weight
 
             # Use the force-directed layout algorithm
             positions = force_directed_layout(
@@ -223,25 +251,22 @@ class UIActions:
                 iterations=400,
                 min_distance=20
             )
-            self.app.tree_positions = positions
+            self.app.tree_positions = PositionStore(positions)
+            self.app.reset_history()
 
             # Calculate layout quality
             total_error = 0
-            has_paths = any(len(neighbors) > 0 for neighbors in self.app.forest_graph.adj_list.values())
-            if has_paths:
-                for tree1_id, neighbors in self.app.forest_graph.adj_list.items():
-                    for tree2_id, weight in neighbors.items():
-                        if tree1_id < tree2_id:  # Only process each edge once
-                            x1, y1 = positions[tree1_id]
-                            x2, y2 = positions[tree2_id]
-                            # Actual visual distance
-                            actual_dist = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-                            # Original non-normalized weight
-                            desired_dist = weight
-                            
-                            # Calculate proportional error
-                            error = abs(actual_dist - desired_dist) / max(desired_dist, 0.1)
-                            total_error += error
+            for tree1_id, tree2_id, weight in self.app.forest_graph.iter_edges():
+                x1, y1 = positions[tree1_id]
+                x2, y2 = positions[tree2_id]
+                # Actual visual distance
+                actual_dist = np.sqrt((x2-x1)**2 + (y2-y1)**2)
+                # Original non-normalized weight
+                desired_dist = weight
+
+                # Calculate proportional error
+                error = abs(actual_dist - desired_dist) / max(desired_dist, 0.1)
+                total_error += error
             
             # Create a snapshot of the original imported data
             self.app.create_snapshot()
@@ -275,6 +300,25 @@ class UIActions:
         else:
             self.app.status_bar.set_text("❌ Failed to restore original data.")
 
+    def undo(self):
+        """Undo the most recent edit."""
+        # Nothing is complete while a tree is being dragged
+        label = None if self.app.history.in_progress else self.app.history.undo()
+        if label is None:
+            self.app.status_bar.set_text("⚠️ Nothing to undo.")
+            return
+        self.app.update_display()
+        self.app.status_bar.set_text(f"↶ Undone: {label}")
+
+    def redo(self):
+        """Redo the most recently undone edit."""
+        label = None if self.app.history.in_progress else self.app.history.redo()
+        if label is None:
+            self.app.status_bar.set_text("⚠️ Nothing to redo.")
+            return
+        self.app.update_display()
+        self.app.status_bar.set_text(f"↷ Redone: {label}")
+
     def save_data(self):
         if not self.app.forest_graph.trees:
             messagebox.showwarning("Warning", "No data to save.", parent=self.root)
@@ -314,12 +358,8 @@ class UIActions:
             with open(path_file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(['tree_id1', 'tree_id2', 'distance'])
-                # Get path data from adjacency list
-                for tree1_id, neighbors in self.app.forest_graph.adj_list.items():
-                    for tree2_id, weight in neighbors.items():
-                        # Only save each edge once (undirected graph)
-                        if tree1_id < tree2_id:
-                            writer.writerow([tree1_id, tree2_id, weight])
+                # Each undirected path once
+                writer.writerows(self.app.forest_graph.iter_edges())
 
             self.app.status_bar.set_text(f"✅ Data saved successfully.")
             messagebox.showinfo("Success", "Data saved successfully!", parent=self.root)
@@ -332,6 +372,7 @@ class UIActions:
         if messagebox.askyesno("Confirm Clear", "Are you sure you want to clear all data?"):
             self.app.forest_graph.clear()
             self.app.tree_positions.clear()
+            self.app.history.clear()
             self.canvas.selected_tree = None
             self.add_path_mode = False
             self.delete_path_mode = False
@@ -339,14 +380,13 @@ class UIActions:
             self.canvas.path_start = None
             self.delete_tree_mode = False
             self.canvas._shortest_path_highlight = []
+            self.live_route = None
             self.canvas._infection_highlight = set()
             self.canvas._infection_edge_highlight = set()
             self.canvas._infection_labels = {}
             
             # Clear snapshot data
-            self.app.has_snapshot = False
-            self.app.snapshot_forest_graph = None
-            self.app.snapshot_tree_positions = None
+            self.app.release_snapshot()
             self.control_panel.restore_original_btn.config(state=tk.DISABLED)
             
             # Reset all control panel buttons
@@ -470,8 +510,8 @@ class UIActions:
         if not self.app.forest_graph.trees:
             messagebox.showinfo("Data Analysis", "There are no trees in the current forest.", parent=self.root)
             return
-        health_counts = Counter(t.health_status.name for t in self.app.forest_graph.trees.values())
-        species_counts = Counter(t.species for t in self.app.forest_graph.trees.values())
+        health_counts = Counter({status.name: count for status, count in self.app.forest_graph.health_counts().items()})
+        species_counts = Counter(self.app.forest_graph.species_counts())
         infected_count = health_counts.get("INFECTED", 0)
         total = len(self.app.forest_graph.trees)
         infected_percent = (infected_count / total) * 100 if total else 0
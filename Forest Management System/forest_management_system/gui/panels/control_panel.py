@@ -57,6 +57,15 @@ class ControlPanel:
         self.shortest_path_btn = ModernButton(path_frame, text="🔵  Shortest Path")
         self.shortest_path_btn.pack(fill=tk.X, pady=3)
 
+        # Edit History
+        edit_frame = ttk.LabelFrame(self.scrollable_frame, text="✏️ Edit",
+                                   style='Modern.TLabelframe', padding=15)
+        edit_frame.pack(fill=tk.X, pady=(0, 15), padx=5)
+        self.undo_btn = ModernButton(edit_frame, text="↶  Undo (Ctrl+Z)")
+        self.undo_btn.pack(fill=tk.X, pady=3)
+        self.redo_btn = ModernButton(edit_frame, text="↷  Redo (Ctrl+Y)")
+        self.redo_btn.pack(fill=tk.X, pady=3)
+
         # Data Operations
         data_frame = ttk.LabelFrame(self.scrollable_frame, text="💾 Data Operations", 
                                    style='Modern.TLabelframe', padding=15)
@@ -88,6 +97,9 @@ class ControlPanel:
         self.delete_path_btn.config(command=actions.start_delete_path)
         self.shortest_path_btn.config(command=actions.find_shortest_path)
 
+        self.undo_btn.config(command=actions.undo)
+        self.redo_btn.config(command=actions.redo)
+
         self.load_data_btn.config(command=actions.load_data)
         self.save_data_btn.config(command=actions.save_data)
         self.restore_original_btn.config(command=actions.restore_original_data)
@@ -41,12 +41,7 @@ class InfoPanel:
         
         tree_count = len(forest_graph.trees)
         
-        # Calculate path count
-        path_count = 0
-        for tree_id, neighbors in forest_graph.adj_list.items():
-            path_count += len(neighbors)
-        # Since paths are undirected, each path is counted twice in the adjacency list
-        path_count //= 2
+        path_count = forest_graph.edge_count
         
         try:
             reserves = find_reserves_func(forest_graph)
@@ -54,7 +49,8 @@ class InfoPanel:
         except Exception:
             max_reserve = 0
             
-        infected_count = sum(1 for t in forest_graph.trees.values() if t.health_status.name == "INFECTED")
+        health_stats = Counter({status.name: count for status, count in forest_graph.health_counts().items()})
+        infected_count = health_stats["INFECTED"]
         infected_percent = (infected_count / tree_count * 100) if tree_count else 0
         
         info = f"🌲 FOREST STATISTICS\n"
@@ -64,14 +60,13 @@ class InfoPanel:
         info += f"🟦 Max Reserve Size: {max_reserve}\n"
         info += f"🔴 Infected %: {infected_percent:.1f}%\n\n"
         
-        health_stats = Counter(t.health_status.name for t in forest_graph.trees.values())
         info += f"🏥 HEALTH STATUS\n"
         info += "="*30 + "\n"
         for status, count in health_stats.items():
             emoji = "🟢" if status == "HEALTHY" else "🔴" if status == "INFECTED" else "🟠"
             info += f"{emoji} {status}: {count}\n"
             
-        species_stats = Counter(t.species for t in forest_graph.trees.values())
+        species_stats = forest_graph.species_counts()
         info += f"\n🌳 SPECIES DISTRIBUTION\n"
         info += "="*30 + "\n"
         for species, count in species_stats.items():
@@ -0,0 +1,227 @@
+"""
+Binary on-disk format for forests, opened through np.memmap.
+
+Layout (little-endian, every section starts on an 8-byte boundary):
+
+    header          HEADER_DTYPE, one record
+    tree records    TREE_RECORD_DTYPE x n_trees, sorted by tree_id
+    indptr          int64 x (n_trees + 1)
+    indices         int32 x n_entries   (dense tree indices, sorted per row)
+    weights         float64 x n_entries
+    species table   uint64 offsets x (n_species + 1), then the UTF-8 names
+
+The edge arrays are the CSR arrays of FrozenForestGraph, so a file opened
+with open_forest_binary() is served straight from the mapped pages: only
+the pages touched by a query are read from disk.
+"""
+import csv
+import os
+from array import array
+
+import numpy as np
+
+from ..data_structures.frozen_graph import FrozenForestGraph
+from ..data_structures.health_status import HEALTH_CODES, parse_health_status
+
+MAGIC = b'FORESTG1'
+FORMAT_VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'), ('format_version', '<u4'), ('n_species', '<u4'),
+    ('n_trees', '<u8'), ('n_entries', '<u8'),
+    ('trees_offset', '<u8'), ('indptr_offset', '<u8'), ('indices_offset', '<u8'),
+    ('weights_offset', '<u8'), ('species_offset', '<u8'), ('species_size', '<u8'),
+])
+
+TREE_RECORD_DTYPE = np.dtype([
+    ('tree_id', '<i8'), ('age', '<i4'), ('species', '<i4'), ('health', 'u1'),
+], align=True)
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _write_section(f, array, dtype):
+    f.write(b'\0' * (_align(f.tell()) - f.tell()))
+    offset = f.tell()
+    np.ascontiguousarray(array, dtype=dtype).tofile(f)
+    return offset
+
+
+def _write_arrays(file_path, ids, ages, species_codes, health, species, indptr, indices, weights):
+    records = np.zeros(len(ids), dtype=TREE_RECORD_DTYPE)
+    records['tree_id'] = ids
+    records['age'] = ages
+    records['species'] = species_codes
+    records['health'] = health
+
+    names = [name.encode('utf-8') for name in species]
+    name_offsets = np.zeros(len(names) + 1, dtype='<u8')
+    np.cumsum([len(name) for name in names], out=name_offsets[1:])
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    with open(file_path, 'wb') as f:
+        f.write(header.tobytes())  # placeholder, rewritten once offsets are known
+        header['trees_offset'] = _write_section(f, records, TREE_RECORD_DTYPE)
+        header['indptr_offset'] = _write_section(f, indptr, '<i8')
+        header['indices_offset'] = _write_section(f, indices, '<i4')
+        header['weights_offset'] = _write_section(f, weights, '<f8')
+        header['species_offset'] = _write_section(f, name_offsets, '<u8')
+        f.write(b''.join(names))
+        header['species_size'] = f.tell() - header['species_offset'][0]
+        header['magic'] = MAGIC
+        header['format_version'] = FORMAT_VERSION
+        header['n_species'] = len(names)
+        header['n_trees'] = len(ids)
+        header['n_entries'] = len(indices)
+        f.seek(0)
+        f.write(header.tobytes())
+
+
+def save_forest_binary(forest_graph, file_path):
+    """
+    Write a ForestGraph (or FrozenForestGraph) to file_path in the binary format.
+
+    Paths that reference IDs without a tree are dropped, as in freeze().
+    """
+    frozen = forest_graph if isinstance(forest_graph, FrozenForestGraph) else forest_graph.freeze()
+    _write_arrays(file_path, frozen.ids, frozen.ages, frozen.species_codes, frozen.health,
+                  frozen.species, frozen.indptr, frozen.indices, frozen.weights)
+
+
+def _map(file_path, dtype, offset, count):
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode='r', offset=int(offset), shape=(int(count),))
+
+
+def open_forest_binary(file_path):
+    """
+    Open a file written by save_forest_binary() as a read-only FrozenForestGraph.
+
+    The tree columns and CSR arrays are np.memmap views of the file, so
+    files larger than memory can be opened; neighbor, distance and
+    attribute queries, and the array-based algorithms, read only the pages
+    they need. Only the species names are loaded eagerly.
+
+    Raises:
+        ValueError: If the file is not in this format.
+    """
+    if os.path.getsize(file_path) < HEADER_DTYPE.itemsize:
+        raise ValueError(f"Not a forest binary file: {file_path}")
+    header = np.fromfile(file_path, dtype=HEADER_DTYPE, count=1)[0]
+    if header['magic'] != MAGIC:
+        raise ValueError(f"Not a forest binary file: {file_path}")
+    if header['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported forest binary format version {header['format_version']}")
+
+    n_trees, n_entries, n_species = int(header['n_trees']), int(header['n_entries']), int(header['n_species'])
+    records = _map(file_path, TREE_RECORD_DTYPE, header['trees_offset'], n_trees)
+    indptr = _map(file_path, '<i8', header['indptr_offset'], n_trees + 1)
+    indices = _map(file_path, '<i4', header['indices_offset'], n_entries)
+    weights = _map(file_path, '<f8', header['weights_offset'], n_entries)
+
+    name_offsets = np.fromfile(file_path, dtype='<u8', count=n_species + 1, offset=int(header['species_offset']))
+    with open(file_path, 'rb') as f:
+        f.seek(int(header['species_offset']) + name_offsets.nbytes)
+        blob = f.read(int(name_offsets[-1]))
+    species = [blob[start:end].decode('utf-8') for start, end in zip(name_offsets[:-1], name_offsets[1:])]
+
+    return FrozenForestGraph(records['tree_id'], indptr, indices, weights,
+                             records['health'], records['age'], records['species'], species)
+
+
+def convert_csv_to_binary(tree_file, path_file, file_path):
+    """
+    Convert the CSV files read by load_forest_from_files() straight to the
+    binary format without building Tree objects or a ForestGraph.
+
+    Columns are accumulated in compact typed arrays. Rows that
+    load_forest_from_files() would reject (bad values, unknown trees,
+    self-loops, non-positive distances) are skipped; later duplicate tree
+    IDs overwrite earlier ones and duplicate paths keep the last distance.
+
+    Returns:
+        (tree_count, path_count) written to file_path.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    ids, ages, health, species_codes = array('q'), array('i'), array('B'), array('i')
+    species, species_index = [], {}
+    with open(tree_file, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        missing = [col for col in ('tree_id', 'species', 'age', 'health_status')
+                   if col not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Missing required columns in tree file: {', '.join(missing)}")
+        for row in reader:
+            try:
+                tree_id, age = int(row['tree_id']), int(row['age'])
+                code = HEALTH_CODES[parse_health_status(row['health_status'].replace(' ', '_').upper())]
+            except (ValueError, TypeError, AttributeError):
+                continue
+            name = row['species']
+            if name not in species_index:
+                species_index[name] = len(species)
+                species.append(name)
+            ids.append(tree_id)
+            ages.append(age)
+            health.append(code)
+            species_codes.append(species_index[name])
+
+    ids = np.frombuffer(ids, dtype=np.int64)
+    # Sort by ID; for duplicate IDs keep the last row, like load_forest_from_files
+    tree_order = np.lexsort((np.arange(len(ids)), ids))
+    last = np.ones(len(tree_order), dtype=bool)
+    last[:-1] = ids[tree_order][1:] != ids[tree_order][:-1]
+    tree_order = tree_order[last]
+    ids = ids[tree_order]
+
+    sources, targets, weights = array('q'), array('q'), array('d')
+    with open(path_file, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = reader.fieldnames or []
+        tree1_col = 'tree_1' if 'tree_1' in fieldnames else 'tree_id1'
+        tree2_col = 'tree_2' if 'tree_2' in fieldnames else 'tree_id2'
+        if not all(col in fieldnames for col in (tree1_col, tree2_col, 'distance')):
+            raise ValueError("Missing required columns in path file: tree_1/tree_id1, tree_2/tree_id2, distance")
+        for row in reader:
+            try:
+                t1_id, t2_id, weight = int(row[tree1_col]), int(row[tree2_col]), float(row['distance'])
+            except (ValueError, TypeError):
+                continue
+            if t1_id != t2_id and weight > 0:
+                sources.append(t1_id)
+                targets.append(t2_id)
+                weights.append(weight)
+
+    sources = np.frombuffer(sources, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    weights = np.frombuffer(weights, dtype=np.float64)
+    i = np.searchsorted(ids, sources)
+    j = np.searchsorted(ids, targets)
+    known = (i < len(ids)) & (j < len(ids))
+    known[known] &= (ids[i[known]] == sources[known]) & (ids[j[known]] == targets[known])
+    i, j, weights = i[known], j[known], weights[known]
+
+    # Both directions, one entry per (row, col), the last distance winning
+    rows = np.concatenate([i, j])
+    cols = np.concatenate([j, i])
+    weights = np.concatenate([weights, weights])
+    seq = np.concatenate([np.arange(len(i)), np.arange(len(i))])
+    order = np.lexsort((seq, cols, rows))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    last = np.ones(len(rows), dtype=bool)
+    last[:-1] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    rows, cols, weights = rows[last], cols[last], weights[last]
+
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(ids)), out=indptr[1:])
+    _write_arrays(file_path, ids,
+                  np.frombuffer(ages, dtype=np.intc)[tree_order],
+                  np.frombuffer(species_codes, dtype=np.intc)[tree_order],
+                  np.frombuffer(health, dtype=np.uint8)[tree_order],
+                  species, indptr, cols, weights)
+    return len(ids), len(rows) // 2
@@ -2,7 +2,6 @@ import csv
 import tkinter as tk
 from tkinter import messagebox
 from ..data_structures.tree import Tree
-from ..data_structures.path import Path
 from ..data_structures.forest_graph import ForestGraph
 from ..data_structures.health_status import HealthStatus
 import os
@@ -65,12 +64,13 @@ def load_forest_from_files(tree_file, path_file):
                 missing = [col for col in required_columns if col not in reader.fieldnames]
                 raise ValueError(f"Missing required columns in tree file: {', '.join(missing)}")
             
+            loaded_trees = {}  # {tree_id: Tree}, added to the graph in one batch
             for row_num, row in enumerate(reader, 2):  # Start at line 2 (after header)
                 try:
                     tree_id = int(row['tree_id'])
                     
                     # Record duplicate IDs but don't skip, newer entries will overwrite older ones
-                    if tree_id in graph.trees:
+                    if tree_id in loaded_trees:
                         duplicate_ids.append((tree_id, row_num))
                     
                     # Create tree
@@ -80,12 +80,13 @@ def load_forest_from_files(tree_file, path_file):
                         int(row['age']),
                         HealthStatus[row['health_status'].replace(' ', '_').upper()]
                     )
-                    graph.add_tree(tree)
+                    loaded_trees[tree_id] = tree
                     tree_count += 1
                 except ValueError as e:
                     errors.append(f"Line {row_num}: Invalid tree data - {str(e)}")
                 except KeyError as e:
                     errors.append(f"Line {row_num}: Invalid health status '{row.get('health_status', '')}', must be HEALTHY, INFECTED or AT_RISK")
+            graph.add_trees(loaded_trees.values())
     except FileNotFoundError:
         raise FileNotFoundError(f"Tree file not found: {tree_file}")
     except Exception as e:
@@ -195,6 +196,7 @@ def load_forest_from_files(tree_file, path_file):
                 )
                 return graph  # Return the graph with trees only
             
+            loaded_paths = []  # (tree_id1, tree_id2, weight), added to the graph in one batch
             for row_num, row in enumerate(reader, 2):
                 try:
                     t1_id = int(row[tree1_col])
@@ -212,19 +214,16 @@ def load_forest_from_files(tree_file, path_file):
                         path_errors.append(f"Line {row_num}: Path references non-existent tree ID: {t2_id}")
                         continue
                         
-                    t1 = graph.trees[t1_id]
-                    t2 = graph.trees[t2_id]
-                    
                     weight = float(row[distance_col])
                     if weight <= 0:
                         path_errors.append(f"Line {row_num}: Invalid distance: {weight} (must be positive)")
                         continue
                         
-                    path = Path(t1, t2, weight)
-                    graph.add_path(path)
+                    loaded_paths.append((t1_id, t2_id, weight))
                     path_count += 1
                 except ValueError as e:
                     path_errors.append(f"Line {row_num}: Invalid path data - {str(e)}")
+            graph.add_paths(loaded_paths)
     except FileNotFoundError:
         path_file_missing = True
         message_summary["warnings"].append(f"Error reading path file: Path file not found: {path_file}")
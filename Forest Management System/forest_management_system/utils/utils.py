@@ -3,18 +3,22 @@ Utility functions for forest management.
 """
 from collections import Counter
 from ..data_structures.health_status import HealthStatus
+from ..data_structures.forest_graph import ForestGraph
 
 def find_trees_by_health(trees, health_status):
     """
     Find all trees with the specified health status.
     
     Args:
-        trees: List of Tree objects
+        trees: List of Tree objects, or a ForestGraph (answered from its
+            health index in O(k) instead of scanning every tree)
         health_status: HealthStatus enum value
         
     Returns:
         List of Tree objects with the specified health status
     """
+    if isinstance(trees, ForestGraph):
+        return [trees.trees[tree_id] for tree_id in sorted(trees.ids_with_health(health_status))]
     return [tree for tree in trees if tree.health_status == health_status]
 
 def count_trees_by_species(trees):
@@ -22,9 +26,12 @@ def count_trees_by_species(trees):
     Count the number of trees for each species.
     
     Args:
-        trees: List of Tree objects
+        trees: List of Tree objects, or a ForestGraph (answered from its
+            species index without scanning every tree)
         
     Returns:
         Dictionary with species as keys and counts as values
     """
+    if isinstance(trees, ForestGraph):
+        return trees.species_counts()
     return Counter(tree.species for tree in trees) 
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Tests for batch route queries.
+"""
+import unittest
+import csv
+import sys
+import os
+import tempfile
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms import batch_routes
+from forest_management_system.algorithms.batch_routes import read_route_pairs, run_route_batch, main
+from forest_management_system.io.binary_format import save_forest_binary
+
+class TestBatchRoutes(unittest.TestCase):
+    """Test cases for run_route_batch and its command line."""
+
+    def setUp(self):
+        """
+        Set up a ring of eight trees with a chord, an isolated tree 9 and a
+        pair file.
+        """
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 10)])
+        self.g.add_paths([(i, i % 8 + 1, float(i)) for i in range(1, 9)] + [(1, 5, 4.5)])
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pairs = [(1, 4), (1, 6), (3, 8), (1, 9), (42, 1), (2, 2), (3, 1)]
+        self.pair_file = os.path.join(self.tmp.name, 'pairs.csv')
+        with open(self.pair_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['start', 'end'])
+            writer.writerows(self.pairs)
+            writer.writerow(['x', '1'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _check(self, output_file):
+        with open(output_file, newline='') as f:
+            rows = sorted(csv.DictReader(f), key=lambda row: int(row['query']))
+        self.assertEqual(len(rows), len(self.pairs))
+        for row, (start, end) in zip(rows, self.pairs):
+            path, distance = find_shortest_path(self.g, start, end)
+            self.assertEqual((int(row['start_tree']), int(row['end_tree'])), (start, end))
+            self.assertAlmostEqual(float(row['distance']), distance)
+            self.assertEqual([int(t) for t in row['path'].split()], path)
+
+    def test_read_route_pairs(self):
+        """
+        Test that malformed rows are skipped.
+        """
+        self.assertEqual(read_route_pairs(self.pair_file), self.pairs)
+
+    def test_in_process_and_pool(self):
+        """
+        Test that serial and pooled runs answer every query like find_shortest_path.
+        """
+        for workers in (1, 2):
+            output_file = os.path.join(self.tmp.name, f'out{workers}.csv')
+            with mock.patch.object(batch_routes, '_BLOCK_ENTRIES', 2 * len(self.g.trees)):  # two starts per task
+                stats = run_route_batch(self.g, self.pairs, output_file, max_workers=workers)
+            self.assertEqual((stats.queries, stats.sources), (7, 4))
+            self._check(output_file)
+
+    def test_command_line_with_binary_file(self):
+        """
+        Test the command line on a binary forest file shared with the workers.
+        """
+        binary_file = os.path.join(self.tmp.name, 'forest.bin')
+        save_forest_binary(self.g, binary_file)
+        output_file = os.path.join(self.tmp.name, 'routes.csv')
+        with mock.patch.object(batch_routes, '_BLOCK_ENTRIES', len(self.g.trees)):
+            main(['--binary', binary_file, '--pairs', self.pair_file, '--output', output_file, '--workers', '2'])
+        self._check(output_file)
+
+    def test_command_line_with_csv_files(self):
+        """
+        Test the command line on tree and path CSV files, without any dialog.
+        """
+        tree_file = os.path.join(self.tmp.name, 'trees.csv')
+        path_file = os.path.join(self.tmp.name, 'paths.csv')
+        with open(tree_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tree_id', 'species', 'age', 'health_status'])
+            writer.writerows((tree_id, 'Oak', 1, 'HEALTHY') for tree_id in self.g.trees)
+        with open(path_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tree_1', 'tree_2', 'distance'])
+            writer.writerows(self.g.iter_edges())
+        output_file = os.path.join(self.tmp.name, 'routes.csv')
+        with mock.patch('forest_management_system.io.dataset_loader.messagebox') as messagebox:
+            main(['--trees', tree_file, '--paths', path_file, '--pairs', self.pair_file,
+                  '--output', output_file, '--workers', '1'])
+        self.assertEqual(messagebox.mock_calls, [])
+        self._check(output_file)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for ContractionHierarchy.
+"""
+import unittest
+import sys
+import os
+import random
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.contraction_hierarchy import ContractionHierarchy
+
+class TestContractionHierarchy(unittest.TestCase):
+    """Test cases for ContractionHierarchy."""
+
+    def setUp(self):
+        """
+        Set up a 12x12 grid of trees with random distances and a few long paths.
+        """
+        self.rng = random.Random(16)
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(144)])
+        self.g.add_tree(Tree(500, 'Elm', 1, HealthStatus.HEALTHY))  # isolated
+        paths = [(i, i + 1, self.rng.uniform(1, 3)) for i in range(144) if i % 12 != 11]
+        paths += [(i, i + 12, self.rng.uniform(1, 3)) for i in range(132)]
+        paths += [(self.rng.randrange(72), self.rng.randrange(72, 144), self.rng.uniform(5, 20)) for _ in range(5)]
+        self.g.add_paths(paths)
+        self.ch = ContractionHierarchy.build(self.g)
+
+    def check_queries(self, hierarchy, graph):
+        frozen = graph.freeze()
+        for _ in range(40):
+            start, end = self.rng.randrange(144), self.rng.randrange(144)
+            path, dist = hierarchy.find_shortest_path(start, end)
+            self.assertAlmostEqual(dist, find_shortest_path(frozen, start, end)[1])
+            self.assertEqual((path[0], path[-1]), (start, end))
+            self.assertAlmostEqual(sum(graph.get_distance(a, b) for a, b in zip(path, path[1:])), dist)
+
+    def test_queries_match_dijkstra(self):
+        """
+        Test distances, unpacked paths and the edge cases of the contract.
+        """
+        self.assertGreater(self.ch.shortcut_count, 0)
+        self.check_queries(self.ch, self.g)
+        self.assertEqual(self.ch.find_shortest_path(3, 3), ([3], 0))
+        self.assertEqual(self.ch.find_shortest_path(3, 500), ([], float('inf')))
+        self.assertEqual(self.ch.find_shortest_path(3, 999), ([], float('inf')))
+
+    def test_invalidation_and_rebuild(self):
+        """
+        Test that path edits make the hierarchy stale and health edits do not.
+        """
+        self.g.update_health_status(5, HealthStatus.INFECTED)
+        self.assertFalse(self.ch.stale)
+        self.g.update_distance(0, 1, 0.01)
+        self.assertTrue(self.ch.stale)
+        # Stale queries are answered from the graph itself
+        self.assertEqual(self.ch.find_shortest_path(0, 1), ([0, 1], 0.01))
+        self.assertFalse(self.ch.rebuild().stale)
+        self.check_queries(self.ch, self.g)
+
+    def test_save_and_load(self):
+        """
+        Test the on-disk round trip and the check against a different forest.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, 'forest_ch.npz')
+            self.ch.save(file_path)
+            loaded = ContractionHierarchy.load(file_path, self.g)
+            self.assertIs(loaded.graph, self.g)
+            self.check_queries(loaded, self.g)
+            self.assertEqual(ContractionHierarchy.load(file_path).find_shortest_path(0, 143),
+                             self.ch.find_shortest_path(0, 143))
+            self.g.remove_path(0, 1)
+            with self.assertRaises(ValueError):
+                ContractionHierarchy.load(file_path, self.g)
+
+if __name__ == '__main__':
+    unittest.main()
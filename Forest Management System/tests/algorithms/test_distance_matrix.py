@@ -0,0 +1,82 @@
+"""
+Tests for DistanceMatrixService.
+"""
+import unittest
+import sys
+import os
+import random
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms import distance_matrix
+from forest_management_system.algorithms.distance_matrix import DistanceMatrixService
+
+class TestDistanceMatrixService(unittest.TestCase):
+    """Test cases for DistanceMatrixService."""
+
+    def setUp(self):
+        """
+        Set up a random forest of 40 trees and a service with small blocks.
+        """
+        rng = random.Random(18)
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 41)])
+        pairs = {tuple(sorted(rng.sample(range(1, 41), 2))) for _ in range(60)}
+        self.g.add_paths([(a, b, rng.uniform(1, 10)) for a, b in sorted(pairs)])
+        self.service = DistanceMatrixService(block_size=7)
+
+    def test_matches_shortest_paths(self):
+        """
+        Test blocked float32 results against find_shortest_path.
+        """
+        matrix = self.service.distances(self.g)
+        self.assertEqual(matrix.shape, (40, 40))
+        self.assertEqual(matrix.dtype, np.float32)
+        for a in (1, 7, 23):
+            for b in (1, 2, 40):
+                self.assertAlmostEqual(float(matrix[a - 1, b - 1]), find_shortest_path(self.g, a, b)[1], places=4)
+        part = self.service.distances(self.g, [5, 999], [3, 999, 5])
+        self.assertEqual(part.shape, (2, 3))
+        self.assertEqual(part[0, 2], 0.0)
+        self.assertTrue(np.isinf(part[1]).all() and np.isinf(part[:, 1]).all())
+        self.assertEqual(self.service.distance(self.g, 5, 5), 0.0)
+
+    def test_cache_by_version_and_budget(self):
+        """
+        Test hits, invalidation on edits and the byte budget.
+        """
+        self.service.distances(self.g, [1, 2])
+        self.service.distances(self.g, [2, 1], [3])
+        self.assertEqual((self.service.hits, self.service.misses), (2, 2))
+        self.g.add_paths([(1, 2, 0.5)])
+        self.assertAlmostEqual(self.service.distance(self.g, 1, 2), 0.5)
+        self.assertEqual(len(self.service), 1)
+        self.assertEqual(self.service.memory_usage, 40 * 4)
+
+        self.service.max_bytes = 3 * 40 * 4
+        self.service.distances(self.g)
+        self.assertEqual(len(self.service), 3)
+        self.assertLessEqual(self.service.memory_usage, self.service.max_bytes)
+        self.service.clear()
+        self.assertEqual(self.service.memory_usage, 0)
+
+    def test_block_size_follows_budget(self):
+        """
+        Test that the scratch budget caps the block size, given or not.
+        """
+        expected = self.service.distances(self.g)
+        for service in (DistanceMatrixService(), DistanceMatrixService(block_size=512)):
+            with mock.patch.object(distance_matrix, '_BLOCK_ENTRIES', 3 * 40), \
+                    mock.patch.object(distance_matrix, 'dijkstra', wraps=distance_matrix.dijkstra) as dijkstra:
+                np.testing.assert_array_equal(service.distances(self.g), expected)
+            self.assertEqual(dijkstra.call_count, 14)
+            self.assertTrue(all(len(call.kwargs['indices']) <= 3 for call in dijkstra.call_args_list))
+
+if __name__ == '__main__':
+    unittest.main()
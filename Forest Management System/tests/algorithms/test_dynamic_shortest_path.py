@@ -0,0 +1,89 @@
+"""
+Tests for DynamicShortestPathTree.
+"""
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.dynamic_shortest_path import DynamicShortestPathTree
+
+class TestDynamicShortestPathTree(unittest.TestCase):
+    """Test cases for DynamicShortestPathTree."""
+
+    def setUp(self):
+        """
+        Set up a square 1-2-3-4-1 with a diagonal 1-3.
+        """
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 5)])
+        self.g.add_paths([(1, 2, 1.0), (2, 3, 1.0), (3, 4, 1.0), (4, 1, 1.0), (1, 3, 3.0)])
+        self.spt = DynamicShortestPathTree(self.g, 1)
+
+    def test_increase_and_decrease(self):
+        """
+        Test that longer, shorter, removed and added paths reroute.
+        """
+        self.assertEqual(self.spt.distance_to(3), 2.0)
+        self.g.update_distance(1, 2, 5.0)
+        self.g.update_distance(1, 4, 5.0)
+        self.assertEqual((self.spt.path_to(3), self.spt.distance_to(3)), ([1, 3], 3.0))
+        self.assertEqual(self.spt.path_to(2), [1, 3, 2])
+        self.g.update_distance(1, 2, 0.5)
+        self.assertEqual((self.spt.path_to(3), self.spt.distance_to(3)), ([1, 2, 3], 1.5))
+        self.g.remove_path(2, 3)
+        self.assertEqual(self.spt.path_to(3), [1, 3])
+        self.g.add_paths([(2, 4, 0.25)])
+        self.assertEqual(self.spt.distance_to(4), 0.75)
+
+    def test_removed_trees(self):
+        """
+        Test that removing a tree on the path, or the source, is handled.
+        """
+        self.g.update_distance(1, 4, 10.0)
+        self.assertEqual(self.spt.path_to(4), [1, 2, 3, 4])
+        self.g.remove_tree(2)
+        self.assertEqual(self.spt.path_to(4), [1, 3, 4])
+        self.assertEqual(self.spt.distance_to(2), float('inf'))
+        self.g.remove_tree(1)
+        self.assertEqual((self.spt.path_to(4), len(self.spt)), ([], 0))
+
+    def test_source_added_back(self):
+        """
+        Test that the tree grows again when a removed source is added back.
+        """
+        self.assertEqual(self.spt.distance_to(3), 2.0)
+        self.g.remove_tree(1)
+        self.assertEqual(self.spt.distance_to(3), float('inf'))
+        self.g.add_tree(Tree(1, 'Oak', 1, HealthStatus.HEALTHY))
+        self.g.add_paths([(1, 2, 1.0), (1, 4, 5.0)])
+        self.assertEqual((self.spt.path_to(3), self.spt.distance_to(3)), ([1, 2, 3], 2.0))
+        self.assertEqual(len(self.spt), 4)
+
+    def test_matches_full_search_after_random_edits(self):
+        """
+        Test against find_shortest_path through a series of random edits.
+        """
+        rnd = random.Random(7)
+        g = ForestGraph()
+        g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(40)])
+        g.add_paths([(i, (i * 7 + 3) % 40, rnd.uniform(1, 5)) for i in range(40) if (i * 7 + 3) % 40 != i]
+                    + [(i, i + 1, rnd.uniform(1, 5)) for i in range(39)])
+        spt = DynamicShortestPathTree(g, 0)
+        for _ in range(50):
+            u, v, _ = rnd.choice(list(g.iter_edges()))
+            if rnd.random() < 0.2:
+                g.remove_path(u, v)
+            else:
+                g.update_distance(u, v, rnd.uniform(0.5, 6))
+            for tree_id in range(0, 40, 3):
+                _, distance = find_shortest_path(g, 0, tree_id)
+                self.assertAlmostEqual(spt.distance_to(tree_id), distance)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the infection scenario runner.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.infection_simulation import simulate_infection_ensemble
+from forest_management_system.algorithms.infection_scenarios import InfectionScenario, run_infection_scenarios
+
+class TestInfectionScenarios(unittest.TestCase):
+    """Test cases for run_infection_scenarios."""
+
+    def setUp(self):
+        """
+        Set up a chain 1-2-3-4-5 and scenarios from both ends.
+        """
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 6)])
+        self.g.add_paths([(i, i + 1, 1.0) for i in range(1, 5)])
+        self.scenarios = [InfectionScenario([1], seed=seed, realizations=200, transmission_probability=0.7)
+                          for seed in range(3)] + [InfectionScenario([5], seed=9, realizations=200)]
+
+    def test_pool_matches_serial_and_seeds(self):
+        """
+        Test that results are reproducible per seed, in a pool or not.
+        """
+        streamed = {}
+        pooled = run_infection_scenarios(self.g, self.scenarios, max_workers=2,
+                                         callback=lambda index, scenario, ensemble: streamed.update({index: ensemble}))
+        serial = run_infection_scenarios(self.g, self.scenarios, max_workers=1)
+        self.assertEqual(sorted(streamed), [0, 1, 2, 3])
+        self.assertEqual(pooled.count, 4)
+        # Sums in completion order: equal up to rounding
+        np.testing.assert_allclose(pooled.mean_probability, serial.mean_probability)
+        self.assertEqual(pooled.expected_infected, serial.expected_infected)
+
+        scenario = self.scenarios[1]
+        direct = simulate_infection_ensemble(self.g, scenario.start_tree_ids, realizations=200,
+                                             transmission_probability=0.7, seed=scenario.seed)
+        np.testing.assert_array_equal(streamed[1].probability, direct.probability)
+        np.testing.assert_array_equal(streamed[1].ids, direct.ids)
+
+    def test_summary(self):
+        """
+        Test the per-tree maximum and the expected number of infected trees.
+        """
+        summary = run_infection_scenarios(self.g, self.scenarios, max_workers=1)
+        np.testing.assert_array_equal(summary.max_probability, np.ones(5))
+        self.assertEqual(summary.expected_infected[3], 5.0)
+        self.assertLess(summary.expected_infected[0], 5.0)
+        self.assertEqual(run_infection_scenarios(self.g, [], max_workers=1).count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,11 @@ import sys
 import os
 import random
 
+import numpy as np
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from forest_management_system.io.dataset_loader import load_forest_from_files
-from forest_management_system.algorithms.infection_simulation import simulate_infection
+from forest_management_system.algorithms.infection_simulation import simulate_infection, simulate_infection_ensemble
 from forest_management_system.data_structures.health_status import HealthStatus
 from forest_management_system.data_structures.tree import Tree
 from forest_management_system.data_structures.path import Path
@@ -157,5 +159,43 @@ class TestInfectionSimulation(unittest.TestCase):
         result = simulate_infection(self.graph, invalid_id)
         self.assertEqual(result, [], "Simulation with invalid tree ID should return empty list")
 
+    def test_frozen_graph_matches(self):
+        """Test that the CSR version returns the same infection order."""
+        graph = self.create_test_graph()
+        for start in (2, 6, 1, 999):
+            self.assertEqual(simulate_infection(graph.freeze(), start), simulate_infection(graph, start))
+
+    def test_ensemble_without_randomness_matches(self):
+        """Test that a near-deterministic ensemble reproduces simulate_infection."""
+        graph = self.create_test_graph()
+        ensemble = simulate_infection_ensemble(graph, 2, realizations=20, delay_shape=1e9, seed=0,
+                                               horizon=64.0)  # one-day bins
+        days = {tree_id: day for tree_id, _, day in simulate_infection(graph, 2)}
+        for i, tree_id in enumerate(ensemble.ids.tolist()):
+            if tree_id in days:
+                self.assertEqual(ensemble.probability[i], 1.0)
+                self.assertAlmostEqual(ensemble.mean_days[i], days[tree_id], places=3)
+                self.assertTrue(np.all(np.abs(ensemble.quantiles[:, i] - days[tree_id]) <= 1.0))
+            else:
+                self.assertEqual(ensemble.probability[i], 0.0)
+                self.assertTrue(np.all(np.isinf(ensemble.quantiles[:, i])))
+
+    def test_ensemble_probabilities_and_seeds(self):
+        """Test transmission probabilities, chunking and reproducibility."""
+        graph = self.create_test_graph()
+        run = lambda **options: simulate_infection_ensemble(graph, [2, 999], realizations=2000,
+                                                            transmission_probability=0.5, **options)
+        ensemble = run(seed=3, max_bytes=1024)  # many small chunks
+        probability = dict(zip(ensemble.ids.tolist(), ensemble.probability.tolist()))
+        self.assertEqual(probability[2], 1.0)
+        # Directly, or around the cycle 2-3-4-1 when the direct path fails
+        self.assertAlmostEqual(probability[1], 0.5 + 0.5 * 0.5 ** 3, delta=0.04)
+        self.assertAlmostEqual(probability[3], 0.5 + 0.5 * 0.5 ** 3, delta=0.04)
+        self.assertEqual(probability[6], 0.0)
+        self.assertTrue(np.all(np.diff(ensemble.quantiles[:, ensemble.ids == 2], axis=0) >= 0))
+        again = run(seed=3, max_bytes=1024)
+        np.testing.assert_array_equal(again.quantiles, ensemble.quantiles)
+        self.assertEqual(simulate_infection_ensemble(graph, 999).realizations, 0)
+
 if __name__ == '__main__':
     unittest.main()
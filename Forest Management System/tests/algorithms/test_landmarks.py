@@ -0,0 +1,94 @@
+"""
+Tests for the ALT LandmarkTable.
+"""
+import unittest
+import sys
+import os
+import random
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.landmarks import LandmarkTable
+
+class TestLandmarkTable(unittest.TestCase):
+    """Test cases for LandmarkTable."""
+
+    def setUp(self):
+        """
+        Set up a 10x10 grid with random distances and a separate pair of trees.
+        """
+        self.rng = random.Random(17)
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(100)])
+        self.g.add_trees([Tree(200, 'Elm', 1, HealthStatus.HEALTHY), Tree(201, 'Elm', 1, HealthStatus.HEALTHY)])
+        paths = [(i, i + 1, self.rng.uniform(1, 5)) for i in range(100) if i % 10 != 9]
+        paths += [(i, i + 10, self.rng.uniform(1, 5)) for i in range(90)]
+        self.g.add_paths(paths + [(200, 201, 2.0)])
+        self.table = LandmarkTable(self.g, k=4)
+
+    def assert_exact(self):
+        """The incrementally maintained rows equal a fresh Dijkstra run."""
+        self.table.refresh()
+        frozen = self.g.freeze()
+        self.assertEqual(self.table.ids.tolist(), frozen.ids.tolist())
+        columns = [frozen.index_of(tree_id) for tree_id in self.table.landmark_ids]
+        expected = dijkstra(frozen.to_csr_matrix(), indices=columns)
+        np.testing.assert_allclose(self.table.distances, expected)
+
+    def test_selection_and_bounds(self):
+        """
+        Test that farthest selection covers both components and bounds hold.
+        """
+        self.assertEqual(self.table.distances.shape, (4, 102))
+        self.assertTrue(set(self.table.landmark_ids) & {200, 201})
+        frozen = self.g.freeze()
+        true = dijkstra(frozen.to_csr_matrix(), indices=frozen.index_of(5))
+        bounds = self.table.lower_bounds(5)
+        self.assertTrue(np.all(bounds <= true + 1e-9))
+        self.assertEqual(self.table.lower_bound(5, 5), 0.0)
+        self.assertEqual(self.table.lower_bound(5, 999), 0.0)
+        self.assertEqual(self.table.lower_bound(5, 200), float('inf'))
+
+        degree = LandmarkTable(self.g, k=2, selection='degree')
+        self.assertEqual(len(degree), 2)
+        with self.assertRaises(ValueError):
+            LandmarkTable(self.g, selection='random')
+
+    def test_alt_search(self):
+        """
+        Test that A* with landmark bounds finds shortest paths.
+        """
+        frozen = self.g.freeze()
+        for _ in range(30):
+            start, end = self.rng.randrange(100), self.rng.randrange(100)
+            for source in (self.g, frozen):
+                path, dist = find_shortest_path(source, start, end, 'alt', landmarks=self.table)
+                self.assertAlmostEqual(dist, find_shortest_path(frozen, start, end)[1])
+                self.assertEqual((path[0], path[-1]), (start, end))
+        self.assertEqual(find_shortest_path(self.g, 1, 200, 'alt', landmarks=self.table), ([], float('inf')))
+        self.assertEqual(find_shortest_path(self.g, 1, 2, 'alt'), find_shortest_path(self.g, 1, 2))
+
+    def test_incremental_refresh(self):
+        """
+        Test that edits are folded into the table without losing exactness.
+        """
+        self.g.update_distance(0, 1, 0.1)
+        self.g.update_distance(11, 12, 50.0)
+        self.g.remove_path(44, 45)
+        self.assert_exact()
+        self.g.add_tree(Tree(300, 'Ash', 1, HealthStatus.HEALTHY))
+        self.g.add_paths([(300, 0, 0.5), (300, 99, 0.5), (300, 200, 1.0)])
+        self.g.remove_tree(55)
+        self.assert_exact()
+        self.g.remove_tree(self.table.landmark_ids[0])
+        self.assert_exact()
+        self.assertEqual(len(self.table), 4)
+
+if __name__ == '__main__':
+    unittest.main()
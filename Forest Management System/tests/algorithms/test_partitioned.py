@@ -0,0 +1,85 @@
+"""
+Tests for the ShardCoordinator analytics on partitioned forests.
+"""
+import unittest
+import sys
+import os
+import random
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.partitioned_graph import PartitionedForestGraph
+from forest_management_system.algorithms import partitioned
+from forest_management_system.algorithms.partitioned import ShardCoordinator
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.infection_simulation import simulate_infection
+
+class TestShardCoordinator(unittest.TestCase):
+    """Compare the sharded algorithms with the single-graph versions."""
+
+    def setUp(self):
+        """
+        Set up a random forest of 120 trees with distinct random distances.
+        """
+        rng = random.Random(12)
+        statuses = [HealthStatus.HEALTHY, HealthStatus.INFECTED, HealthStatus.AT_RISK]
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, rng.choice(statuses)) for i in range(1, 121)])
+        pairs = {tuple(sorted(rng.sample(range(1, 121), 2))) for _ in range(200)}
+        self.g.add_paths([(a, b, rng.uniform(1, 10)) for a, b in sorted(pairs)])
+        self.positions = {i: (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(1, 121)}
+        self.rng = rng
+
+    def check(self, coordinator):
+        frozen = self.g.freeze()
+        for _ in range(30):
+            start, end = self.rng.randint(1, 122), self.rng.randint(1, 120)
+            expected_path, expected = find_shortest_path(frozen, start, end)
+            path, distance = coordinator.find_shortest_path(start, end)
+            self.assertAlmostEqual(distance, expected)
+            self.assertEqual(bool(path), bool(expected_path))
+            if path:
+                self.assertEqual((path[0], path[-1]), (start, end))
+                self.assertAlmostEqual(sum(self.g.get_distance(a, b) for a, b in zip(path, path[1:])), distance)
+        for start in (1, 2, 3, 4, 5, 200):
+            self.assertEqual(coordinator.simulate_infection(start), simulate_infection(frozen, start))
+
+    def test_in_process(self):
+        """
+        Test graph-cut and spatial shards without worker processes.
+        """
+        for part in (PartitionedForestGraph.from_graph(self.g, 4),
+                     PartitionedForestGraph.from_graph(self.g, 3, self.positions)):
+            with ShardCoordinator(part, max_workers=1) as coordinator:
+                self.check(coordinator)
+
+    def test_query_reuses_boundary_tables(self):
+        """
+        Test that a query searches only from its two endpoints once the tables exist.
+        """
+        part = PartitionedForestGraph.from_graph(self.g, 4)
+        with ShardCoordinator(part, max_workers=1) as coordinator:
+            coordinator.find_shortest_path(1, 2)
+            with mock.patch.object(partitioned, '_boundary_table', wraps=partitioned._boundary_table) as tables, \
+                    mock.patch.object(partitioned, '_endpoint_search', wraps=partitioned._endpoint_search) as searches:
+                for start, end in ((3, 90), (10, 11), (50, 7)):
+                    path, distance = coordinator.find_shortest_path(start, end)
+                    self.assertAlmostEqual(distance, find_shortest_path(self.g.freeze(), start, end)[1])
+            tables.assert_not_called()
+            self.assertEqual(searches.call_count, 6)
+
+    def test_process_pool(self):
+        """
+        Test that the shard tasks give the same results in worker processes.
+        """
+        part = PartitionedForestGraph.from_graph(self.g, 4)
+        with ShardCoordinator(part, max_workers=2) as coordinator:
+            self.check(coordinator)
+            self.assertIsNotNone(coordinator._pool)
+        self.assertIsNone(coordinator._pool)
+
+if __name__ == '__main__':
+    unittest.main()
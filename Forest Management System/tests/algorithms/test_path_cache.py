@@ -0,0 +1,58 @@
+"""
+Tests for PathCache.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.algorithms.path_cache import PathCache
+
+class TestPathCache(unittest.TestCase):
+    """Test cases for PathCache."""
+
+    def setUp(self):
+        """
+        Set up a chain 1-2-3-4 and a cache with room for two entries.
+        """
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 5)])
+        self.g.add_paths([(1, 2, 1.0), (2, 3, 2.0), (3, 4, 3.0)])
+        self.cache = PathCache(maxsize=2)
+
+    def test_hits_misses_and_reverse(self):
+        """
+        Test repeated and reversed queries and the LRU bound.
+        """
+        self.assertEqual(self.cache.find_shortest_path(self.g, 1, 4), ([1, 2, 3, 4], 6.0))
+        path, _ = self.cache.find_shortest_path(self.g, 1, 4)
+        path.append(99)  # callers get their own copy
+        self.assertEqual(self.cache.find_shortest_path(self.g, 4, 1), ([4, 3, 2, 1], 6.0))
+        self.assertEqual(self.cache.stats()['hits'], 2)
+        self.assertEqual(self.cache.find_shortest_path(self.g, 1, 4), ([1, 2, 3, 4], 6.0))
+
+        tree = self.cache.shortest_path_tree(self.g, 1)
+        self.assertIs(self.cache.shortest_path_tree(self.g, 1), tree)
+        self.cache.find_shortest_path(self.g, 2, 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats(), {'hits': 4, 'misses': 3, 'hit_rate': 4 / 7, 'size': 2, 'maxsize': 2})
+
+    def test_mutations_invalidate(self):
+        """
+        Test that path and health edits, and another graph, empty the cache.
+        """
+        self.cache.find_shortest_path(self.g, 1, 3)
+        self.g.update_distance(1, 2, 10.0)
+        self.assertEqual(self.cache.find_shortest_path(self.g, 1, 3), ([1, 2, 3], 12.0))
+        self.g.update_health_status(2, HealthStatus.INFECTED)
+        self.cache.find_shortest_path(self.g, 1, 3)
+        self.assertEqual(self.cache.hits, 0)
+        self.cache.find_shortest_path(self.g.freeze(), 1, 3)
+        self.cache.find_shortest_path(self.g.freeze(), 1, 3)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 4))
+
+if __name__ == '__main__':
+    unittest.main()
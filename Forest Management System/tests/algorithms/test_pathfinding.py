@@ -1,14 +1,21 @@
 import unittest
 import sys
 import os
+import random
+import math
+from unittest import mock
+
+import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from forest_management_system.io.dataset_loader import load_forest_from_files
-from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.pathfinding import (find_shortest_path, astar_scale, shortest_path_tree,
+                                                             multi_source_distances)
 from forest_management_system.data_structures.tree import Tree
 from forest_management_system.data_structures.path import Path
 from forest_management_system.data_structures.forest_graph import ForestGraph
 from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.position_store import PositionStore
 
 class TestPathfinding(unittest.TestCase):
     def setUp(self):
@@ -115,6 +122,24 @@ class TestPathfinding(unittest.TestCase):
         self.assertEqual(path, [], "Path between disconnected trees should be empty")
         self.assertEqual(dist, float('inf'), "Distance between disconnected trees should be infinity")
 
+    def test_disconnected_trees_are_not_searched(self):
+        """Test that trees in different components are answered without a search."""
+        graph = self.create_test_graph()
+        with mock.patch.object(graph, 'neighbors', side_effect=AssertionError("searched")):
+            for algorithm in ('dijkstra', 'bidirectional', 'astar'):
+                self.assertEqual(find_shortest_path(graph, 1, 5, algorithm=algorithm), ([], float('inf')))
+
+    def test_stale_connectivity_is_not_rebuilt(self):
+        """Test that a query after a removal searches instead of rebuilding the components."""
+        graph = self.create_test_graph()
+        graph.remove_path(1, 2)
+        self.assertFalse(graph.has_connectivity)
+        for algorithm in ('dijkstra', 'bidirectional', 'astar'):
+            self.assertEqual(find_shortest_path(graph, 1, 5, algorithm=algorithm), ([], float('inf')))
+        self.assertFalse(graph.has_connectivity)
+        graph.connectivity()
+        self.assertTrue(graph.has_connectivity)
+
     def test_find_shortest_path_isolated_tree(self):
         """Test finding shortest path to an isolated tree."""
         graph = self.create_test_graph()
@@ -150,5 +175,87 @@ class TestPathfinding(unittest.TestCase):
         self.assertEqual(path, [1, 2, 3], "Shortest path from 1 to 3 should be [1, 2, 3]")
         self.assertEqual(dist, 15.0, "Distance of shortest path should be 15")
 
+    def test_frozen_graph_matches(self):
+        """Test that the CSR version returns the same paths and distances."""
+        graph = self.create_test_graph()
+        frozen = graph.freeze()
+        for start, end in [(1, 3), (3, 1), (1, 4), (1, 5), (1, 6), (2, 2), (1, 999)]:
+            self.assertEqual(find_shortest_path(frozen, start, end), find_shortest_path(graph, start, end))
+
+    def test_algorithms_agree(self):
+        """Test that every algorithm gives the same distance on a random grid."""
+        rng = random.Random(14)
+        graph = ForestGraph()
+        graph.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(100)])
+        graph.add_paths([(i, i + 1, rng.uniform(1, 5)) for i in range(100) if i % 10 != 9] +
+                        [(i, i + 10, rng.uniform(1, 5)) for i in range(90)])
+        frozen = graph.freeze()
+        for _ in range(20):
+            start, end = rng.randrange(100), rng.randrange(100)
+            expected = find_shortest_path(frozen, start, end)[1]
+            for source in (graph, frozen):
+                for algorithm in ('dijkstra', 'bidirectional'):
+                    path, dist = find_shortest_path(source, start, end, algorithm)
+                    self.assertAlmostEqual(dist, expected)
+                    self.assertEqual((path[0], path[-1]), (start, end))
+                    self.assertAlmostEqual(sum(graph.get_distance(a, b) for a, b in zip(path, path[1:])), dist)
+        self.assertEqual(find_shortest_path(graph, 5, 5, 'bidirectional'), ([5], 0))
+        with self.assertRaises(ValueError):
+            find_shortest_path(graph, 1, 2, 'bfs')
+
+    def test_astar_with_positions(self):
+        """Test A* on geometric weights and its fallback when positions do not bound them."""
+        rng = random.Random(15)
+        positions = PositionStore({i: (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(60)})
+        graph = ForestGraph()
+        graph.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(60)])
+        pairs = {tuple(sorted(rng.sample(range(60), 2))) for _ in range(150)}
+        graph.add_paths([(a, b, math.dist(positions[a], positions[b])) for a, b in pairs])
+        self.assertAlmostEqual(astar_scale(graph, positions), 1.0)
+        frozen = graph.freeze()
+        for _ in range(20):
+            start, end = rng.randrange(60), rng.randrange(60)
+            expected = find_shortest_path(frozen, start, end)[1]
+            for source in (graph, frozen):
+                self.assertAlmostEqual(find_shortest_path(source, start, end, 'astar', positions)[1], expected)
+                self.assertAlmostEqual(find_shortest_path(source, start, end, 'astar', dict(positions))[1], expected)
+
+        # A path shorter than the straight line caps the scale below 1
+        a, b = sorted(pairs)[0]
+        graph.update_distance(a, b, math.dist(positions[a], positions[b]) / 4)
+        self.assertAlmostEqual(astar_scale(graph, positions), 0.25)
+        self.assertAlmostEqual(find_shortest_path(graph, a, b, 'astar', positions)[1],
+                               find_shortest_path(graph.freeze(), a, b)[1])
+        # An unplaced tree makes A* fall back to Dijkstra
+        del positions[a]
+        self.assertEqual(astar_scale(graph, positions), 0.0)
+        self.assertEqual(find_shortest_path(graph, a, b, 'astar', positions), find_shortest_path(graph, a, b))
+        self.assertEqual(find_shortest_path(graph, 999, b, 'astar', positions), ([], float('inf')))
+
+    def test_shortest_path_tree_and_multi_source(self):
+        """Test one-to-many and nearest-source distances with a cutoff."""
+        graph = self.create_test_graph()
+        frozen = graph.freeze()
+        tree = shortest_path_tree(graph, 1)
+        for tree_id in frozen.ids.tolist():
+            path, dist = find_shortest_path(frozen, 1, tree_id)
+            self.assertEqual(tree.distance_to(tree_id), dist)
+            self.assertEqual(tree.path_to(tree_id), path)
+        self.assertEqual(tree.path_to(999), [])
+
+        near = multi_source_distances(graph, [1, 3, 999])
+        for tree_id in frozen.ids.tolist():
+            d1, d3 = find_shortest_path(frozen, 1, tree_id)[1], find_shortest_path(frozen, 3, tree_id)[1]
+            self.assertEqual(near.distance_to(tree_id), min(d1, d3))
+            if min(d1, d3) < float('inf'):
+                self.assertEqual(near.source_of(tree_id), 1 if d1 <= d3 else 3)
+                self.assertEqual(near.path_to(tree_id)[0], near.source_of(tree_id))
+
+        limited = shortest_path_tree(graph, 1, cutoff=12.0)
+        reached = {tree_id for tree_id in frozen.ids.tolist() if limited.distance_to(tree_id) <= 12.0}
+        self.assertEqual(reached, {tree_id for tree_id in frozen.ids.tolist() if tree.distance_to(tree_id) <= 12.0})
+        self.assertTrue(all(limited.distance_to(t) == float('inf') for t in frozen.ids.tolist() if t not in reached))
+        self.assertTrue(np.isinf(multi_source_distances(graph, []).distances).all())
+
 if __name__ == '__main__':
     unittest.main()
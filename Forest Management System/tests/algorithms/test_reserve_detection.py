@@ -216,5 +216,25 @@ class TestReserveDetection(unittest.TestCase):
         self.assertTrue(found_reserve_1, "First reserve (1,2,3) not found")
         self.assertTrue(found_reserve_2, "Second reserve (4,5,6) not found")
 
+    def test_frozen_graph_matches(self):
+        """
+        Test that the CSR version finds the same reserves as the dictionary version.
+        """
+        expected = sorted(map(sorted, find_reserves(self.forest_graph)))
+        self.assertEqual(sorted(map(sorted, find_reserves(self.forest_graph.freeze()))), expected)
+        self.assertEqual(find_reserves(ForestGraph().freeze()), [])
+
+    def test_self_loop_does_not_break_reserve(self):
+        """
+        Test that a path from a tree to itself is ignored by both versions.
+        """
+        forest_graph = ForestGraph()
+        for tree_id in (1, 2, 3):
+            forest_graph.add_tree(Tree(tree_id, "Oak", 10, HealthStatus.HEALTHY))
+        forest_graph.add_paths([(1, 2, 1.0), (1, 3, 1.0), (2, 3, 1.0), (1, 1, 1.0)])
+
+        self.assertEqual(find_reserves(forest_graph), [{1, 2, 3}])
+        self.assertEqual(find_reserves(forest_graph.freeze()), [{1, 2, 3}])
+
 if __name__ == '__main__':
     unittest.main()
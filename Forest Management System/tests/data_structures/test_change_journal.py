@@ -0,0 +1,111 @@
+"""
+Tests for ForestGraph versioning and the change journal.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.path import Path
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.change_journal import (
+    ChangeJournal, ADD_TREE, REMOVE_TREE, UPDATE_TREE, UPDATE_HEALTH, ADD_PATH, REMOVE_PATH, UPDATE_DISTANCE)
+
+class TestChangeJournal(unittest.TestCase):
+    """Test cases for version numbers and change records."""
+
+    def setUp(self):
+        """
+        Set up a graph with two connected trees.
+        """
+        self.g = ForestGraph()
+        self.t1 = Tree(1, 'Oak', 10, HealthStatus.HEALTHY)
+        self.t2 = Tree(2, 'Pine', 8, HealthStatus.INFECTED)
+        self.g.add_tree(self.t1)
+        self.g.add_tree(self.t2)
+        self.g.add_path(Path(self.t1, self.t2, 5.0))
+
+    def ops_since(self, version):
+        return [(c.op, c.tree_id, c.other_id, c.old, c.new) for c in self.g.changes_since(version)]
+
+    def test_versions_increase(self):
+        """
+        Test that every mutation bumps the version and no-ops do not.
+        """
+        self.assertEqual(self.g.version, 3)
+        self.g.update_distance(1, 2, 6.0)
+        self.assertEqual(self.g.version, 4)
+        self.g.update_distance(1, 999, 6.0)
+        self.g.remove_path(1, 999)
+        self.g.update_health_status(1, HealthStatus.HEALTHY)
+        self.g.remove_tree(999)
+        self.assertEqual(self.g.version, 4)
+        self.assertEqual(self.g.changes_since(4), [])
+
+    def test_records(self):
+        """
+        Test the records written for each kind of mutation.
+        """
+        version = self.g.version
+        self.g.update_distance(2, 1, 7.0)
+        self.g.update_health_status(1, 'infected')
+        self.t2.age = 9
+        self.g.add_path(Path(self.t1, self.t2, 8.0))
+        self.g.remove_tree(2)
+        self.assertEqual(self.ops_since(version), [
+            (UPDATE_DISTANCE, 2, 1, 5.0, 7.0),
+            (UPDATE_HEALTH, 1, None, HealthStatus.HEALTHY, HealthStatus.INFECTED),
+            (UPDATE_TREE, 2, None, ('Pine', 8, HealthStatus.INFECTED, None), ('Pine', 9, HealthStatus.INFECTED, None)),
+            (ADD_PATH, 1, 2, 7.0, 8.0),
+            (REMOVE_PATH, 2, 1, 8.0, None),
+            (REMOVE_TREE, 2, None, ('Pine', 9, HealthStatus.INFECTED, None), None),
+        ])
+
+    def test_overwrite_and_clear(self):
+        """
+        Test that overwriting a tree records its old state and clear records every removal.
+        """
+        version = self.g.version
+        self.g.add_tree(Tree(1, 'Cedar', 80, HealthStatus.AT_RISK))
+        self.assertEqual(self.ops_since(version), [
+            (ADD_TREE, 1, None, ('Oak', 10, HealthStatus.HEALTHY, None), ('Cedar', 80, HealthStatus.AT_RISK, None))])
+        version = self.g.version
+        self.g.clear()
+        self.assertEqual(sorted(c.op for c in self.g.changes_since(version)),
+                         [REMOVE_PATH, REMOVE_TREE, REMOVE_TREE])
+
+    def test_bulk_operations_are_journaled(self):
+        """
+        Test that batched mutations write one record per item.
+        """
+        version = self.g.version
+        self.g.add_paths([(1, 2, 3.0), (1, 3, 4.0)])
+        self.g.remove_paths([(1, 2), (1, 3)])
+        self.assertEqual([c.op for c in self.g.changes_since(version)],
+                         [ADD_PATH, ADD_PATH, REMOVE_PATH, REMOVE_PATH])
+
+    def test_truncated_journal(self):
+        """
+        Test that asking for changes older than the journal keeps returns None.
+        """
+        journal = ChangeJournal(maxlen=2)
+        for tree_id in range(5):
+            journal.record(ADD_TREE, tree_id)
+        self.assertEqual(journal.version, 5)
+        self.assertEqual([c.tree_id for c in journal.since(3)], [3, 4])
+        self.assertIsNone(journal.since(2))
+        self.assertEqual(journal.since(5), [])
+
+    def test_freeze_is_cached_per_version(self):
+        """
+        Test that freeze() reuses its result until the graph changes.
+        """
+        frozen = self.g.freeze()
+        self.assertIs(self.g.freeze(), frozen)
+        self.g.update_health_status(2, HealthStatus.HEALTHY)
+        self.assertIsNot(self.g.freeze(), frozen)
+
+if __name__ == '__main__':
+    unittest.main()
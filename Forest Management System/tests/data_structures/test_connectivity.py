@@ -0,0 +1,48 @@
+"""
+Tests for ConnectivityIndex.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.connectivity import ConnectivityIndex
+
+class TestConnectivityIndex(unittest.TestCase):
+    """Test cases for ConnectivityIndex."""
+
+    def test_union_and_queries(self):
+        """
+        Test components, sizes, path counts and members as paths are added.
+        """
+        index = ConnectivityIndex.from_adjacency({1: {2: 1.0}, 2: {1: 1.0}, 3: {}, 4: {4: 0.5}})
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.connected(1, 2))
+        self.assertFalse(index.connected(1, 3))
+        self.assertFalse(index.connected(1, 99))
+        self.assertIsNone(index.find(99))
+        self.assertEqual(index.edge_count_of(4), 0)  # loops are not counted
+
+        index.union(2, 3)
+        index.union(1, 3)
+        self.assertEqual(index.find(1), index.find(3))
+        self.assertEqual((index.size_of(3), index.edge_count_of(3)), (3, 3))
+        self.assertEqual(sorted(index.members_of(2)), [1, 2, 3])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.roots(min_size=3), [index.find(1)])
+        self.assertEqual(sorted(index.roots()), sorted([index.find(1), 4]))
+
+    def test_lone_trees(self):
+        """
+        Test that trees without paths are components of their own without extra entries.
+        """
+        index = ConnectivityIndex()
+        for tree_id in range(5):
+            index.add(tree_id)
+        self.assertEqual((len(index), index.size_of(3), index.members_of(3)), (5, 1, [3]))
+        self.assertEqual(index._size, {})
+        index.union(3, 4)
+        self.assertEqual((len(index), index.size_of(4), sorted(index.members_of(4))), (4, 2, [3, 4]))
+
+if __name__ == '__main__':
+    unittest.main()
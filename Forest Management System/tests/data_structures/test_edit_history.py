@@ -0,0 +1,121 @@
+"""
+Tests for the undo/redo EditHistory.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.path import Path
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.position_store import PositionStore
+from forest_management_system.data_structures.edit_history import EditHistory
+
+class TestEditHistory(unittest.TestCase):
+    """Test cases for EditHistory."""
+
+    def setUp(self):
+        """
+        Set up a graph of two connected trees with positions.
+        """
+        self.g = ForestGraph()
+        self.t1 = Tree(1, 'Oak', 10, HealthStatus.HEALTHY)
+        self.t2 = Tree(2, 'Pine', 8, HealthStatus.INFECTED)
+        self.g.add_trees([self.t1, self.t2])
+        self.g.add_path(Path(self.t1, self.t2, 5.0))
+        self.positions = PositionStore({1: (10, 10), 2: (20, 20)})
+        self.history = EditHistory(self.g, self.positions)
+
+    def state(self):
+        trees = {tid: (t.species, t.age, t.health_status) for tid, t in self.g.trees.items()}
+        adj = {tid: dict(neighbors) for tid, neighbors in self.g.adj_list.items() if neighbors}
+        return trees, adj, dict(self.positions)
+
+    def test_undo_redo_each_kind_of_edit(self):
+        """
+        Test undo and redo of tree, path, health and position edits.
+        """
+        states = [self.state()]
+        with self.history.action("Add tree 3"):
+            self.g.add_tree(Tree(3, 'Birch', 1, HealthStatus.HEALTHY))
+            self.positions[3] = (30, 30)
+        states.append(self.state())
+        with self.history.action("Add path 1-3"):
+            self.g.add_path(Path(self.t1, self.g.trees[3], 4.0))
+        states.append(self.state())
+        with self.history.action("Change health of tree 1"):
+            self.g.update_health_status(1, HealthStatus.AT_RISK)
+        states.append(self.state())
+        with self.history.action("Delete tree 2"):
+            self.g.remove_tree(2)
+            del self.positions[2]
+        states.append(self.state())
+
+        for expected in reversed(states[:-1]):
+            self.history.undo()
+            self.assertEqual(self.state(), expected)
+        self.assertIsNone(self.history.undo())
+        for expected in states[1:]:
+            self.history.redo()
+            self.assertEqual(self.state(), expected)
+        self.assertIsNone(self.history.redo())
+
+    def test_drag_is_one_step(self):
+        """
+        Test that begin()/end() around many moves produce one compact step.
+        """
+        self.history.begin("Move tree 1")
+        for x in range(50):
+            self.positions[1] = (x, x)
+            self.g.update_distance(1, 2, float(x))
+        self.history.end()
+        self.assertEqual(len(self.history), 1)
+        self.assertEqual(self.history.undo(), "Move tree 1")
+        self.assertEqual(self.positions[1], (10, 10))
+        self.assertEqual(self.g.get_distance(1, 2), 5.0)
+
+    def test_new_edit_clears_redo_and_empty_actions_are_dropped(self):
+        """
+        Test that a new edit discards redo steps and no-op actions are not recorded.
+        """
+        with self.history.action("Noop"):
+            pass
+        self.assertFalse(self.history.can_undo)
+        with self.history.action("Move"):
+            self.positions[1] = (1, 1)
+        self.history.undo()
+        self.assertTrue(self.history.can_redo)
+        with self.history.action("Move"):
+            self.positions[2] = (2, 2)
+        self.assertFalse(self.history.can_redo)
+
+    def test_memory_cap_evicts_oldest(self):
+        """
+        Test that old steps are evicted once the byte budget is exceeded.
+        """
+        self.history.max_bytes = 2000
+        for x in range(100):
+            with self.history.action(f"Move {x}"):
+                self.positions[1] = (x, x)
+        self.assertLess(len(self.history), 100)
+        self.assertGreater(len(self.history), 0)
+        self.assertLessEqual(self.history.memory_usage, 2000)
+        while self.history.can_undo:
+            self.history.undo()
+        self.assertNotEqual(self.positions[1], (10, 10))
+
+    def test_undo_inside_action_raises(self):
+        """
+        Test that undo is refused while a step is open.
+        """
+        self.history.begin("Move")
+        self.assertTrue(self.history.in_progress)
+        with self.assertRaises(RuntimeError):
+            self.history.undo()
+        self.history.end()
+        self.assertFalse(self.history.in_progress)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,9 @@ Tests for the ForestGraph class to verify core functionality and edge cases.
 import unittest
 import sys
 import os
+import copy
+import threading
+import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from forest_management_system.data_structures.tree import Tree
@@ -227,5 +230,165 @@ class TestForestGraph(unittest.TestCase):
         self.assertIn('2', s)
         self.assertIn('3', s)
 
+    def test_remove_tree_only_touches_neighbors(self):
+        """
+        Test that removing a tree cleans up its neighbors and leaves other entries alone.
+        """
+        self.g.add_path(Path(self.t1, self.t2, 5.0))
+        self.g.add_path(Path(self.t2, self.t3, 10.0))
+        self.g.remove_tree(1)
+        self.assertEqual(self.g.adj_list, {2: {3: 10.0}, 3: {2: 10.0}})
+
+    def test_bulk_add_and_remove(self):
+        """
+        Test the batched tree and path mutation methods.
+        """
+        self.g.add_trees([Tree(4, 'Elm', 3, HealthStatus.HEALTHY), Tree(5, 'Ash', 4, HealthStatus.HEALTHY)])
+        self.assertIn(5, self.g.trees)
+        self.g.add_paths([Path(self.t1, self.t2, 5.0), (2, 3, 7.5), (4, 5, 1.0)])
+        self.assertEqual(self.g.get_distance(3, 2), 7.5)
+        self.assertEqual(self.g.get_distance(2, 1), 5.0)
+        self.g.add_paths(np.array([[1.0, 4.0, 2.5], [3.0, 5.0, 3.0]]))
+        self.assertEqual(self.g.get_distance(4, 1), 2.5)
+        self.assertIn(5, self.g.adj_list[3])
+        self.assertIsInstance(list(self.g.adj_list[3])[-1], int)
+
+        self.g.remove_paths([(1, 2), (3, 2), (1, 999)])
+        self.assertEqual(self.g.get_neighbors(2), [])
+        self.g.remove_trees([4, 5, 999])
+        self.assertEqual(sorted(self.g.trees), [1, 2, 3])
+        self.assertEqual(self.g.get_neighbors(1), [])
+        self.assertEqual(self.g.get_neighbors(3), [])
+
+    def test_health_and_species_indexes(self):
+        """
+        Test that the per-status and per-species indexes follow every mutation.
+        """
+        def indexes():
+            return ({status: self.g.ids_with_health(status) for status in HealthStatus},
+                    {species: self.g.ids_of_species(species) for species in ('Oak', 'Pine', 'Maple', 'Elm')})
+        def scanned():
+            return ({status: {t.tree_id for t in self.g.trees.values() if t.health_status == status} for status in HealthStatus},
+                    {species: {t.tree_id for t in self.g.trees.values() if t.species == species} for species in ('Oak', 'Pine', 'Maple', 'Elm')})
+        self.assertEqual(indexes(), scanned())
+        self.g.update_health_status(1, HealthStatus.INFECTED)
+        self.t2.species = 'Elm'
+        self.g.add_tree(Tree(3, 'Oak', 5, HealthStatus.AT_RISK))
+        self.assertEqual(indexes(), scanned())
+        self.assertEqual(self.g.count_health(HealthStatus.INFECTED), 2)
+        self.g.remove_tree(1)
+        self.assertEqual(indexes(), scanned())
+        self.assertEqual(self.g.count_health('infected'), 1)
+        self.assertEqual(self.g.species_counts(), {'Elm': 1, 'Oak': 1})
+        self.g.clear()
+        self.assertEqual(self.g.health_counts(), {})
+
+    def test_neighbor_views_and_edges(self):
+        """
+        Test neighbors(), iter_edges(), edge_count and edges_array().
+        """
+        self.g.add_paths([(1, 2, 5.0), (3, 2, 2.0), (1, 3, 4.0)])
+        view = self.g.neighbors(2)
+        self.assertEqual(dict(view), {1: 5.0, 3: 2.0})
+        with self.assertRaises(TypeError):
+            view[4] = 1.0
+        self.g.update_distance(1, 2, 6.0)
+        self.assertEqual(view[1], 6.0)
+        self.assertEqual(dict(self.g.neighbors(999)), {})
+
+        self.assertEqual(sorted(self.g.iter_edges()), [(1, 2, 6.0), (1, 3, 4.0), (2, 3, 2.0)])
+        self.assertEqual(self.g.edge_count, 3)
+        ids1, ids2, weights = self.g.edges_array()
+        self.assertEqual(list(zip(ids1.tolist(), ids2.tolist(), weights.tolist())), list(self.g.iter_edges()))
+        self.assertEqual(ids1.dtype, np.int64)
+
+        self.g.add_path(Path(self.t1, self.t2, 7.0))
+        self.assertEqual(self.g.edge_count, 3)
+        self.g.remove_path(2, 1)
+        self.g.remove_path(2, 1)
+        self.assertEqual(self.g.edge_count, 2)
+        self.g.remove_tree(3)
+        self.assertEqual(self.g.edge_count, 0)
+        self.assertEqual(len(self.g.edges_array()[0]), 0)
+
+    def test_slots_and_next_tree_id(self):
+        """
+        Test the dense slot layer and O(1) tree ID allocation.
+        """
+        self.assertEqual(self.g.next_tree_id(), 4)
+        slot = self.g.slot_of(2)
+        self.assertEqual(self.g.id_at_slot(slot), 2)
+        self.g.remove_tree(2)
+        self.assertIsNone(self.g.slot_of(2))
+        self.assertIsNone(self.g.id_at_slot(slot))
+        self.g.add_tree(Tree(40, 'Elm', 1, HealthStatus.HEALTHY))
+        self.assertEqual(self.g.slot_of(40), slot)
+        self.assertEqual(self.g.next_tree_id(), 41)
+        self.g.remove_tree(40)
+        self.assertEqual(self.g.next_tree_id(), 41)
+
+        ids = self.g.slot_ids()
+        self.assertEqual(len(ids), self.g.slot_count)
+        self.assertEqual(sorted(i for i in ids.tolist() if i >= 0), [1, 3])
+        self.assertEqual(self.g.slots_of([3, 999]).tolist(), [self.g.slot_of(3), -1])
+        with self.assertRaises(ValueError):
+            ids[0] = 5
+        self.g.clear()
+        self.assertEqual(self.g.next_tree_id(), 1)
+
+    def test_thread_safe_read_views(self):
+        """
+        Test that worker threads see consistent read views while edits continue.
+        """
+        g = ForestGraph(thread_safe=True)
+        g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 51)])
+        g.add_paths([(i, i + 1, 1.0) for i in range(1, 50)])
+        errors = []
+
+        def analyse():
+            for _ in range(200):
+                view = g.read_view()
+                total = float(view.weights.sum())
+                # Every edit below keeps the total weight at 2 * 49
+                if total != 98.0:
+                    errors.append(total)
+
+        worker = threading.Thread(target=analyse)
+        worker.start()
+        for k in range(200):
+            i = k % 49 + 1
+            with g.writing():
+                g.update_distance(i, i + 1, 2.0)
+                g.update_distance(i, i + 1, 1.0)
+        worker.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(copy.deepcopy(g).thread_safe)
+        self.assertFalse(self.g.thread_safe)
+        with self.g.reading():
+            self.assertEqual(len(self.g.trees), 3)
+
+    def test_connected_components(self):
+        """
+        Test connected() and component_of() through additions and removals.
+        """
+        g = ForestGraph()
+        g.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 6)])
+        g.add_paths([(1, 2, 1.0), (2, 3, 1.0), (4, 5, 1.0)])
+        self.assertTrue(g.connected(1, 3))
+        self.assertFalse(g.connected(3, 4))
+        self.assertTrue(g.connected(5, 5))
+        self.assertIsNone(g.component_of(99))
+        index = g.connectivity()
+        g.add_paths([(3, 4, 1.0)])
+        self.assertIs(g.connectivity(), index)  # additions update the index in place
+        self.assertEqual(g.component_of(1), g.component_of(5))
+        g.remove_path(2, 3)
+        self.assertFalse(g.connected(1, 5))
+        self.assertTrue(g.connected(3, 5))
+        g.remove_tree(4)
+        self.assertFalse(g.connected(3, 5))
+        g.add_tree(Tree(6, 'Oak', 1, HealthStatus.HEALTHY))
+        self.assertEqual(g.connectivity().size_of(6), 1)
+
 if __name__ == '__main__':
     unittest.main()
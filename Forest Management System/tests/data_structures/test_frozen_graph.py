@@ -0,0 +1,111 @@
+"""
+Tests for the FrozenForestGraph CSR view.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus, HEALTH_CODES
+from forest_management_system.data_structures.path import Path
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.frozen_graph import FrozenForestGraph
+
+class TestFrozenForestGraph(unittest.TestCase):
+    """Test cases for freezing a ForestGraph into CSR arrays."""
+
+    def setUp(self):
+        """
+        Set up a small graph with non-contiguous tree IDs.
+        """
+        self.t1 = Tree(10, 'Oak', 10, HealthStatus.HEALTHY)
+        self.t2 = Tree(3, 'Pine', 8, HealthStatus.INFECTED)
+        self.t3 = Tree(7, 'Oak', 5, HealthStatus.AT_RISK)
+        self.g = ForestGraph()
+        for tree in (self.t1, self.t2, self.t3):
+            self.g.add_tree(tree)
+        self.g.add_path(Path(self.t1, self.t2, 5.0))
+        self.g.add_path(Path(self.t2, self.t3, 2.5))
+
+    def test_freeze_layout(self):
+        """
+        Test that IDs are sorted and the CSR arrays describe both directions of each path.
+        """
+        frozen = self.g.freeze()
+        self.assertIsInstance(frozen, FrozenForestGraph)
+        self.assertEqual(frozen.ids.tolist(), [3, 7, 10])
+        self.assertEqual(frozen.indptr.tolist(), [0, 2, 3, 4])
+        self.assertEqual(frozen.indices.tolist(), [1, 2, 0, 0])
+        self.assertEqual(frozen.weights.tolist(), [2.5, 5.0, 2.5, 5.0])
+        self.assertEqual(frozen.edge_count, 2)
+        self.assertEqual(len(frozen), 3)
+
+    def test_lookups(self):
+        """
+        Test ID/index mapping, neighbor and distance queries.
+        """
+        frozen = self.g.freeze()
+        self.assertEqual(frozen.index_of(7), 1)
+        self.assertEqual(frozen.index_of(999), -1)
+        self.assertEqual(sorted(frozen.get_neighbors(3)), [7, 10])
+        self.assertEqual(frozen.get_neighbors(999), [])
+        self.assertEqual(frozen.get_distance(10, 3), 5.0)
+        self.assertEqual(frozen.get_distance(10, 7), float('inf'))
+        self.assertEqual(frozen.health_code(3), HEALTH_CODES[HealthStatus.INFECTED])
+
+    def test_tree_view(self):
+        """
+        Test that the trees mapping rebuilds Tree objects from the columns.
+        """
+        frozen = self.g.freeze()
+        self.assertIn(7, frozen.trees)
+        self.assertNotIn(8, frozen.trees)
+        self.assertEqual(list(frozen.trees), [3, 7, 10])
+        tree = frozen.trees[10]
+        self.assertEqual((tree.species, tree.age, tree.health_status), ('Oak', 10, HealthStatus.HEALTHY))
+        with self.assertRaises(KeyError):
+            frozen.trees[8]
+
+    def test_snapshot_is_immutable(self):
+        """
+        Test that later graph edits do not leak into the frozen view and arrays are read-only.
+        """
+        frozen = self.g.freeze()
+        self.g.remove_path(10, 3)
+        self.g.update_health_status(7, HealthStatus.HEALTHY)
+        self.assertEqual(frozen.get_distance(10, 3), 5.0)
+        self.assertEqual(frozen.trees[7].health_status, HealthStatus.AT_RISK)
+        with self.assertRaises(ValueError):
+            frozen.weights[0] = 1.0
+
+    def test_dangling_paths_dropped(self):
+        """
+        Test that paths to IDs without a Tree are left out of the CSR arrays.
+        """
+        ghost = Tree(99, 'Elm', 1, HealthStatus.HEALTHY)
+        self.g.add_path(Path(self.t1, ghost, 1.0))
+        frozen = self.g.freeze()
+        self.assertEqual(frozen.edge_count, 2)
+        self.assertNotIn(99, frozen.get_neighbors(10))
+
+    def test_self_loops_not_counted(self):
+        """
+        Test that self-loops, stored once, do not change the path count.
+        """
+        self.g.add_paths([(10, 10, 1.0), (7, 7, 1.0)])
+        frozen = self.g.freeze()
+        self.assertEqual(frozen.edge_count, self.g.edge_count)
+        self.assertEqual(frozen.edge_count, 2)
+
+    def test_empty_graph(self):
+        """
+        Test freezing an empty graph.
+        """
+        frozen = ForestGraph().freeze()
+        self.assertEqual(len(frozen), 0)
+        self.assertEqual(frozen.edge_count, 0)
+        self.assertEqual(frozen.to_csr_matrix().shape, (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
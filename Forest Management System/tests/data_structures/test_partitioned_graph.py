@@ -0,0 +1,58 @@
+"""
+Tests for PartitionedForestGraph.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.partitioned_graph import PartitionedForestGraph
+
+class TestPartitionedForestGraph(unittest.TestCase):
+    """Test cases for PartitionedForestGraph."""
+
+    def setUp(self):
+        """
+        Set up a chain of six trees 1-2-3-4-5-6 with positions along a line.
+        """
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(i, 'Oak', i, HealthStatus.HEALTHY) for i in range(1, 7)])
+        self.g.add_paths([(i, i + 1, float(i)) for i in range(1, 6)])
+        self.positions = {i: (10.0 * i, 5.0) for i in range(1, 6)}  # tree 6 unplaced
+
+    def test_shards_and_boundary(self):
+        """
+        Test that every tree is in one shard and cut paths make boundary trees.
+        """
+        part = PartitionedForestGraph(self.g.freeze(), [0, 0, 0, 1, 1, 1])
+        self.assertEqual(len(part), 2)
+        self.assertEqual(part.cut_edge_count, 1)
+        self.assertEqual(sorted(part.boundary_ids()), [3, 4])
+        first, second = part.shards
+        self.assertEqual(first.graph.ids.tolist(), [1, 2, 3])
+        self.assertEqual(first.graph.edge_count, 2)
+        self.assertEqual(first.graph.get_distance(2, 3), 2.0)
+        self.assertEqual(second.graph.get_distance(3, 4), float('inf'))
+        self.assertEqual(first.graph.ids[first.boundary].tolist(), [3])
+        self.assertIs(part.shard_of_tree(5), second)
+        self.assertIsNone(part.shard_of_tree(99))
+        with self.assertRaises(ValueError):
+            PartitionedForestGraph(self.g.freeze(), [0, 1])
+
+    def test_graph_and_spatial_split(self):
+        """
+        Test that a chain is cut into runs and a line of positions into strips.
+        """
+        part = PartitionedForestGraph.from_graph(self.g, 3)
+        self.assertEqual(part.cut_edge_count, 2)
+        self.assertEqual([len(shard.graph) for shard in part.shards], [2, 2, 2])
+
+        part = PartitionedForestGraph.from_graph(self.g, 2, self.positions)
+        self.assertEqual(part.shards[0].graph.ids.tolist(), [1, 2])
+        self.assertEqual(part.shards[1].graph.ids.tolist(), [3, 4, 5, 6])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the grid-indexed PositionStore.
+"""
+import unittest
+import random
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.position_store import PositionStore
+
+class TestPositionStore(unittest.TestCase):
+    """Test cases for nearest-point and segment queries."""
+
+    def setUp(self):
+        """
+        Set up a store with a few hundred random positions.
+        """
+        rng = random.Random(7)
+        self.positions = PositionStore({tree_id: (rng.uniform(0, 100), rng.uniform(0, 100))
+                                        for tree_id in range(300)})
+
+    def brute_nearest(self, x, y, max_distance):
+        best_id, best = None, max_distance
+        for tree_id, (tx, ty) in self.positions.items():
+            d = np.hypot(tx - x, ty - y)
+            if d <= best:
+                best_id, best = tree_id, d
+        return best_id
+
+    def test_nearest_matches_scan(self):
+        """
+        Test that the grid lookup finds the same tree as a full scan, also after moves.
+        """
+        rng = random.Random(1)
+        for tree_id in range(0, 300, 3):
+            self.positions[tree_id] = (rng.uniform(0, 100), rng.uniform(0, 100))
+        for tree_id in range(1, 300, 5):
+            del self.positions[tree_id]
+        for _ in range(200):
+            x, y = rng.uniform(-5, 105), rng.uniform(-5, 105)
+            self.assertEqual(self.positions.nearest(x, y, 2.5), self.brute_nearest(x, y, 2.5))
+
+    def test_rows_are_reused(self):
+        """
+        Test that deleted rows are reused and values round-trip as float tuples.
+        """
+        size = self.positions._size
+        del self.positions[5]
+        self.positions[1000] = (1, 2)
+        self.assertEqual(self.positions._size, size)
+        self.assertEqual(self.positions[1000], (1.0, 2.0))
+        self.assertIsNone(self.positions.get(5))
+
+    def test_segment_hit(self):
+        """
+        Test the vectorized point-to-segment query.
+        """
+        positions = PositionStore({1: (0, 0), 2: (10, 0), 3: (10, 10), 4: (2, 6)})
+        ids1, ids2 = np.array([1, 2, 1, 4]), np.array([2, 3, 3, 99])
+        self.assertEqual(positions.segment_hit(5, 0.3, ids1, ids2, 0.5), 0)
+        self.assertEqual(positions.segment_hit(10.2, 5, ids1, ids2, 0.5), 1)
+        self.assertEqual(positions.segment_hit(5, 5.1, ids1, ids2, 0.5), 2)
+        self.assertEqual(positions.segment_hit(2, 6, ids1, ids2, 0.5), -1)
+        positions[2] = (0, 10)
+        self.assertEqual(positions.segment_hit(0.2, 5, ids1, ids2, 0.5), 0)
+        self.assertEqual(positions.segment_hit(5, 5, ids1[:0], ids2[:0], 0.5), -1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for ReadWriteLock.
+"""
+import unittest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.rw_lock import ReadWriteLock
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test cases for ReadWriteLock."""
+
+    def setUp(self):
+        self.lock = ReadWriteLock()
+        self.events = []
+
+    def test_readers_share_and_writer_waits(self):
+        """
+        Test that readers overlap and a writer waits for them to finish.
+        """
+        both_reading = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with self.lock.read():
+                both_reading.wait()
+                time.sleep(0.05)
+                self.events.append('read')
+
+        def writer():
+            with self.lock.write():
+                self.events.append('write')
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        time.sleep(0.01)
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        for thread in readers + [writer_thread]:
+            thread.join()
+        self.assertEqual(self.events, ['read', 'read', 'write'])
+
+    def test_reentrancy(self):
+        """
+        Test nested locking by the same thread.
+        """
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                with self.assertRaises(RuntimeError):
+                    with self.lock.write():
+                        pass
+        with self.lock.write():
+            pass
+
+if __name__ == '__main__':
+    unittest.main()
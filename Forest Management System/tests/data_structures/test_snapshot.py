@@ -0,0 +1,124 @@
+"""
+Tests for copy-on-write snapshots of ForestGraph and PositionStore.
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.path import Path
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.position_store import PositionStore
+
+class TestGraphSnapshot(unittest.TestCase):
+    """Test cases for ForestGraph.snapshot()."""
+
+    def setUp(self):
+        """
+        Set up a graph with three trees and two paths.
+        """
+        self.g = ForestGraph()
+        self.t1 = Tree(1, 'Oak', 10, HealthStatus.HEALTHY)
+        self.t2 = Tree(2, 'Pine', 8, HealthStatus.INFECTED)
+        self.t3 = Tree(3, 'Birch', 5, HealthStatus.AT_RISK)
+        self.g.add_trees([self.t1, self.t2, self.t3])
+        self.g.add_path(Path(self.t1, self.t2, 5.0))
+        self.g.add_path(Path(self.t2, self.t3, 2.0))
+
+    def state(self):
+        trees = {tid: (t.species, t.age, t.health_status, t.forest) for tid, t in self.g.trees.items()}
+        adj = {tid: dict(neighbors) for tid, neighbors in self.g.adj_list.items()}
+        return trees, adj
+
+    def test_restore_undoes_every_kind_of_change(self):
+        """
+        Test that restore() brings back trees, attributes, health and paths.
+        """
+        before = self.state()
+        snapshot = self.g.snapshot()
+        self.g.update_health_status(1, HealthStatus.INFECTED)
+        self.t3.age = 6
+        self.g.update_distance(1, 2, 9.0)
+        self.g.remove_tree(2)
+        self.g.add_tree(Tree(4, 'Cedar', 1, HealthStatus.HEALTHY))
+        self.g.add_path(Path(self.t1, self.t3, 1.0))
+        snapshot.restore()
+        self.assertEqual(self.state(), before)
+        self.assertEqual(snapshot.changed_count, 0)
+
+    def test_only_changed_entries_are_saved(self):
+        """
+        Test that the snapshot keeps one entry per changed tree or path, with its first value.
+        """
+        snapshot = self.g.snapshot()
+        self.assertEqual(snapshot.changed_count, 0)
+        self.g.update_distance(1, 2, 6.0)
+        self.g.update_distance(2, 1, 7.0)
+        self.g.update_health_status(3, HealthStatus.HEALTHY)
+        self.assertEqual(snapshot.changed_count, 2)
+        snapshot.restore()
+        self.assertEqual(self.g.get_distance(1, 2), 5.0)
+        self.assertEqual(self.g.trees[3].health_status, HealthStatus.AT_RISK)
+
+    def test_snapshot_is_reusable_and_releasable(self):
+        """
+        Test that a snapshot can be restored repeatedly and not after release.
+        """
+        snapshot = self.g.snapshot()
+        self.g.remove_path(1, 2)
+        snapshot.restore()
+        self.g.remove_path(2, 3)
+        snapshot.restore()
+        self.assertEqual(self.g.get_distance(2, 3), 2.0)
+        self.assertEqual(self.g.get_distance(1, 2), 5.0)
+        snapshot.release()
+        self.g.remove_path(1, 2)
+        self.assertEqual(len(self.g._snapshots), 0)
+        with self.assertRaises(RuntimeError):
+            snapshot.restore()
+
+    def test_independent_snapshots(self):
+        """
+        Test that two snapshots taken at different times restore their own state.
+        """
+        first = self.g.snapshot()
+        self.g.update_distance(1, 2, 6.0)
+        second = self.g.snapshot()
+        self.g.update_distance(1, 2, 7.0)
+        second.restore()
+        self.assertEqual(self.g.get_distance(1, 2), 6.0)
+        first.restore()
+        self.assertEqual(self.g.get_distance(1, 2), 5.0)
+
+class TestPositionStore(unittest.TestCase):
+    """Test cases for PositionStore and its snapshots."""
+
+    def test_mapping_and_version(self):
+        """
+        Test that the store behaves like a dict and counts changes.
+        """
+        positions = PositionStore({1: (10, 10)})
+        positions[2] = [20, 20]
+        self.assertEqual(dict(positions), {1: (10, 10), 2: (20, 20)})
+        del positions[1]
+        self.assertNotIn(1, positions)
+        self.assertEqual(positions.version, 3)
+
+    def test_snapshot_restore(self):
+        """
+        Test that restore() undoes moves, additions and deletions.
+        """
+        positions = PositionStore({1: (10, 10), 2: (20, 20)})
+        snapshot = positions.snapshot()
+        positions[1] = (11, 11)
+        positions[1] = (12, 12)
+        positions[3] = (30, 30)
+        del positions[2]
+        self.assertEqual(snapshot.changed_count, 3)
+        snapshot.restore()
+        self.assertEqual(dict(positions), {1: (10, 10), 2: (20, 20)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for the columnar TreeTable and Tree objects that view its rows.
+"""
+import copy
+import gc
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.tree_table import TreeTable
+
+class TestTreeTable(unittest.TestCase):
+    """Test cases for the struct-of-arrays tree storage."""
+
+    def setUp(self):
+        """
+        Set up a graph whose trees live in its TreeTable.
+        """
+        self.g = ForestGraph()
+        self.t1 = Tree(1, 'Oak', 10, HealthStatus.HEALTHY)
+        self.t2 = Tree(2, 'Pine', 8, HealthStatus.INFECTED)
+        self.t3 = Tree(3, 'Oak', 5, HealthStatus.AT_RISK)
+        for tree in (self.t1, self.t2, self.t3):
+            self.g.add_tree(tree)
+
+    def test_columns(self):
+        """
+        Test that attributes are stored as typed columns with categorical species.
+        """
+        table = self.g.table
+        row = table.row_of(3)
+        self.assertEqual(table.ages.dtype.name, 'int32')
+        self.assertEqual(table.health.dtype.name, 'uint8')
+        self.assertEqual(table.species, ['Oak', 'Pine'])
+        self.assertEqual(table.species_codes[row], 0)
+        self.assertEqual(table.age_at(row), 5)
+        self.assertEqual(len(table), 3)
+
+    def test_tree_is_a_view(self):
+        """
+        Test that bound Tree objects read and write through the table.
+        """
+        self.t1.health_status = HealthStatus.INFECTED
+        self.t1.age = 11
+        self.t1.species = 'Elm'
+        row = self.g.table.row_of(1)
+        self.assertEqual(self.g.table.health_at(row), HealthStatus.INFECTED)
+        self.assertEqual(self.g.table.age_at(row), 11)
+        self.assertEqual(self.g.table.species_at(row), 'Elm')
+        self.g.update_health_status(1, 'at_risk')
+        self.assertEqual(self.t1.health_status, HealthStatus.AT_RISK)
+
+    def test_removed_tree_keeps_values(self):
+        """
+        Test that a removed tree is detached with its last values and its row is reused.
+        """
+        row = self.g.table.row_of(2)
+        self.g.remove_tree(2)
+        self.t2.age = 20
+        self.assertEqual((self.t2.species, self.t2.age, self.t2.health_status),
+                         ('Pine', 20, HealthStatus.INFECTED))
+        self.assertNotIn(2, self.g.table)
+        self.g.add_tree(Tree(4, 'Ash', 1, HealthStatus.HEALTHY))
+        self.assertEqual(self.g.table.row_of(4), row)
+
+    def test_overwrite_detaches_old_tree(self):
+        """
+        Test that replacing a tree ID reuses its row and leaves the old object intact.
+        """
+        row = self.g.table.row_of(1)
+        self.g.add_tree(Tree(1, 'Cedar', 80, HealthStatus.AT_RISK))
+        self.assertEqual(self.g.table.row_of(1), row)
+        self.assertEqual(self.t1.species, 'Oak')
+        self.assertEqual(self.g.trees[1].species, 'Cedar')
+
+    def test_tree_moved_to_another_graph(self):
+        """
+        Test that adding a bound tree to a second graph leaves the first graph consistent.
+        """
+        other = ForestGraph()
+        other.add_tree(self.t1)
+        self.t1.age = 99
+        self.assertEqual(self.g.trees[1].age, 10)
+        self.assertIsNot(self.g.trees[1], self.t1)
+        self.assertEqual(other.trees[1].age, 99)
+
+    def test_trees_are_built_on_access(self):
+        """
+        Test that the graph keeps no Tree objects of its own, only live views.
+        """
+        del self.t1, self.t2, self.t3
+        gc.collect()
+        self.assertEqual(len(self.g._views), 0)
+        self.assertEqual(list(self.g.trees), [1, 2, 3])
+        tree = self.g.trees[2]
+        self.assertIs(self.g.trees[2], tree)
+        self.assertEqual((tree.species, tree.age), ('Pine', 8))
+        tree.forest = 'North'
+        self.assertEqual(self.g.trees[2].forest, 'North')
+        self.g.remove_tree(2)
+        self.assertEqual((tree.species, tree.forest), ('Pine', 'North'))
+        self.assertNotIn(2, self.g.trees)
+        with self.assertRaises(KeyError):
+            self.g.trees[2]
+        self.assertEqual(self.g._forests, {})
+
+    def test_vectorized_queries(self):
+        """
+        Test counts and filters computed from the columns.
+        """
+        self.assertEqual(self.g.health_counts(),
+                         {HealthStatus.HEALTHY: 1, HealthStatus.INFECTED: 1, HealthStatus.AT_RISK: 1})
+        self.assertEqual(self.g.species_counts(), {'Oak': 2, 'Pine': 1})
+        self.assertEqual(sorted(self.g.find_trees(species='Oak').tolist()), [1, 3])
+        self.assertEqual(self.g.find_trees(health_status=HealthStatus.INFECTED).tolist(), [2])
+        self.assertEqual(self.g.find_trees(health_status='infected').tolist(), [2])
+        self.assertEqual(self.g.find_trees(health_status='INFECTED').tolist(), [2])
+        self.assertEqual(self.g.find_trees(species='Oak', min_age=6).tolist(), [1])
+        self.assertEqual(len(self.g.find_trees(species='Redwood')), 0)
+        self.g.remove_tree(1)
+        self.assertEqual(self.g.species_counts(), {'Oak': 1, 'Pine': 1})
+
+    def test_growth(self):
+        """
+        Test that the columns grow past their initial capacity.
+        """
+        table = TreeTable(capacity=2)
+        for tree_id in range(100):
+            table.insert(tree_id, 'Oak', tree_id, HealthStatus.HEALTHY)
+        self.assertEqual(len(table), 100)
+        self.assertEqual(table.age_at(table.row_of(99)), 99)
+        self.assertEqual(table.health_counts()[HealthStatus.HEALTHY], 100)
+
+    def test_deepcopy_graph(self):
+        """
+        Test that a deep copy of the graph gets its own table and bound trees.
+        """
+        clone = copy.deepcopy(self.g)
+        clone.trees[1].health_status = HealthStatus.INFECTED
+        self.assertEqual(self.t1.health_status, HealthStatus.HEALTHY)
+        self.assertEqual(clone.health_counts()[HealthStatus.INFECTED], 2)
+
+if __name__ == '__main__':
+    unittest.main()
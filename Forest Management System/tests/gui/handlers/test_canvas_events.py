@@ -1,8 +1,10 @@
 import unittest
 from unittest.mock import MagicMock, patch
+import numpy as np
 from forest_management_system.gui.handlers.canvas_events import CanvasEventsHandler
 from forest_management_system.data_structures.tree import Tree
 from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.position_store import PositionStore
 
 class TestCanvasEventsHandler(unittest.TestCase):
     """
@@ -13,10 +15,10 @@ class TestCanvasEventsHandler(unittest.TestCase):
         self.app.main_window.forest_canvas = MagicMock()
         self.app.ui_actions = MagicMock()
         self.app.status_bar = MagicMock()
-        self.app.tree_positions = {1: (10, 10)}
+        self.app.tree_positions = PositionStore({1: (10, 10)})
         self.app.forest_graph = MagicMock()
         self.app.forest_graph.trees = {1: MagicMock(tree_id=1, species='Pine', age=10, health_status=MagicMock(name='HEALTHY'))}
-        self.app.forest_graph.adj_list = {1: {2: 5.0}, 2: {1: 5.0}}
+        self.app.forest_graph.iter_edges.return_value = [(1, 2, 5.0)]
         self.handler = CanvasEventsHandler(self.app)
         self.handler.canvas = self.app.main_window.forest_canvas
         # 创建共享mock对象用于测试
@@ -38,6 +40,21 @@ class TestCanvasEventsHandler(unittest.TestCase):
         self.app.status_bar.set_text.assert_called()
         self.app.update_display.assert_called()
 
+    def test_on_press_during_drag_keeps_one_step(self):
+        event = MagicMock()
+        event.inaxes = self.mock_ax
+        event.xdata, event.ydata = 10, 10
+        self.app.ui_actions.delete_tree_mode = False
+        self.app.ui_actions.delete_path_mode = False
+        self.app.ui_actions.infection_sim_mode = False
+        self.app.ui_actions.add_path_mode = False
+        self.handler._find_tree_at_position = MagicMock(return_value=self.app.forest_graph.trees[1])
+        self.handler.on_press(event)
+        self.handler.on_press(event)
+        self.app.history.begin.assert_called_once()
+        self.handler.on_release(event)
+        self.app.history.end.assert_called_once()
+
     def test_on_press_no_tree(self):
         event = MagicMock()
         event.inaxes = self.mock_ax
@@ -104,14 +121,29 @@ class TestCanvasEventsHandler(unittest.TestCase):
         event.xdata, event.ydata = 20, 20
         self.handler.dragging = True
         self.handler.drag_tree = MagicMock(tree_id=1)
-        self.app.forest_graph.adj_list = {1: {2: 5.0}, 2: {1: 5.0}}
-        self.app.tree_positions = {1: (10, 10), 2: (20, 20)}
+        self.app.forest_graph.neighbors.return_value = {2: 5.0}
+        self.app.tree_positions = PositionStore({1: (10, 10), 2: (20, 20)})
         self.app.forest_graph.update_distance = MagicMock()
+        self.app.route_distance = None
         self.handler.on_motion(event)
         self.app.forest_graph.update_distance.assert_called()
         self.app.update_display.assert_called()
         self.app.status_bar.set_text.assert_called()
 
+    def test_on_motion_dragging_updates_highlighted_route(self):
+        event = MagicMock()
+        event.inaxes = self.mock_ax
+        event.button = 1
+        event.xdata, event.ydata = 20, 20
+        self.handler.dragging = True
+        self.handler.drag_tree = MagicMock(tree_id=1)
+        self.app.forest_graph.neighbors.return_value = {}
+        self.app.route_distance = 12.5
+        self.handler.on_motion(event)
+        self.app.update_display.assert_called_once()
+        self.app.ui_actions.update_live_route.assert_not_called()
+        self.assertIn("12.50", self.app.status_bar.set_text.call_args[0][0])
+
     def test_on_motion_hover_tree(self):
         event = MagicMock()
         event.inaxes = self.mock_ax
@@ -164,13 +196,13 @@ class TestCanvasEventsHandler(unittest.TestCase):
         self.assertIsNone(result)
 
     def test_find_tree_at_position_found(self):
-        self.app.tree_positions = {1: (10, 10)}
+        self.app.tree_positions = PositionStore({1: (10, 10)})
         self.app.forest_graph.trees = {1: MagicMock(tree_id=1)}
         result = self.handler._find_tree_at_position(10, 10)
         self.assertIsNotNone(result)
 
     def test_find_tree_at_position_not_found(self):
-        self.app.tree_positions = {1: (10, 10)}
+        self.app.tree_positions = PositionStore({1: (10, 10)})
         self.app.forest_graph.trees = {1: MagicMock(tree_id=1)}
         result = self.handler._find_tree_at_position(100, 100)
         self.assertIsNone(result)
@@ -183,14 +215,16 @@ class TestCanvasEventsHandler(unittest.TestCase):
         tree1 = Tree(1, "Pine", 10, HealthStatus.HEALTHY)
         tree2 = Tree(2, "Oak", 15, HealthStatus.HEALTHY)
         
-        self.app.forest_graph.adj_list = {1: {2: 1.0}, 2: {1: 1.0}}
-        self.app.tree_positions = {1: (0, 0), 2: (0, 0)}
+        self.app.forest_graph.edges_array.return_value = (np.array([1]), np.array([2]), np.array([1.0]))
+        self.app.tree_positions = PositionStore({1: (0, 0), 2: (0, 0)})
         self.app.forest_graph.trees = {1: tree1, 2: tree2}
         
         with patch('forest_management_system.gui.handlers.canvas_events.Path') as MockPath:
             MockPath.return_value = MagicMock()
             result = self.handler.find_path_at_position(0, 0)
             self.assertIsNotNone(result)
+            MockPath.assert_called_once_with(tree1, tree2, 1.0)
+        self.assertIsNone(self.handler.find_path_at_position(5, 5))
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
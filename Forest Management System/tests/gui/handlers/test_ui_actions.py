@@ -188,13 +188,13 @@ class TestUIActions(unittest.TestCase):
     @patch('forest_management_system.gui.handlers.ui_actions.messagebox')
     def test_start_delete_path_no_paths(self, mock_messagebox):
         # Test that a warning is shown when there are no paths
-        self.app.forest_graph.adj_list = {}
+        self.app.forest_graph.edge_count = 0
         self.actions.start_delete_path()
         # Only verify that the warning message was shown
         mock_messagebox.showwarning.assert_called_once()
 
     def test_start_delete_path_with_paths(self):
-        self.app.forest_graph.adj_list = {1: {2: 5.0}}
+        self.app.forest_graph.edge_count = 1
         self.actions.start_delete_path()
         self.assertTrue(self.actions.delete_path_mode)
         self.app.status_bar.set_text.assert_called()
@@ -225,25 +225,41 @@ class TestUIActions(unittest.TestCase):
 
     @patch('forest_management_system.gui.handlers.ui_actions.messagebox')
     @patch('forest_management_system.gui.handlers.ui_actions.ShortestPathDialog')
-    @patch('forest_management_system.gui.handlers.ui_actions.find_shortest_path')
-    def test_find_shortest_path(self, mock_find_shortest_path, MockShortestPathDialog, mock_messagebox):
+    def test_find_shortest_path(self, MockShortestPathDialog, mock_messagebox):
         self.app.forest_graph.trees = {1: MagicMock(), 2: MagicMock()}
         dialog = MockShortestPathDialog.return_value
         dialog.show.return_value = (1, 2)
+        mock_find_shortest_path = self.app.path_cache.find_shortest_path
         mock_find_shortest_path.return_value = ([1, 2], 5.0)
         self.actions.find_shortest_path()
+        mock_find_shortest_path.assert_called_once_with(self.app.forest_graph, 1, 2, algorithm='astar',
+                                                        positions=self.app.tree_positions)
         self.app.update_display.assert_called()
         self.app.status_bar.set_text.assert_called()
 
+    def test_update_live_route(self):
+        from forest_management_system.data_structures.tree import Tree
+        from forest_management_system.data_structures.health_status import HealthStatus
+        from forest_management_system.data_structures.forest_graph import ForestGraph
+        graph = ForestGraph()
+        graph.add_trees([Tree(i, 'Oak', 1, HealthStatus.HEALTHY) for i in range(1, 4)])
+        graph.add_paths([(1, 2, 1.0), (2, 3, 1.0), (1, 3, 5.0)])
+        self.app.forest_graph = graph
+        self.assertIsNone(self.actions.update_live_route())
+        self.actions.live_route = (1, 3, None)
+        self.assertEqual(self.actions.update_live_route(), 2.0)
+        graph.update_distance(1, 2, 10.0)
+        self.assertEqual(self.actions.update_live_route(), 5.0)
+        self.assertEqual(self.actions.canvas._shortest_path_highlight, [1, 3])
+
     @patch('forest_management_system.gui.handlers.ui_actions.messagebox')
     @patch('forest_management_system.gui.handlers.ui_actions.ShortestPathDialog')
-    @patch('forest_management_system.gui.handlers.ui_actions.find_shortest_path')
-    def test_find_shortest_path_canceled(self, mock_find_shortest_path, MockShortestPathDialog, mock_messagebox):
+    def test_find_shortest_path_canceled(self, MockShortestPathDialog, mock_messagebox):
         self.app.forest_graph.trees = {1: MagicMock(), 2: MagicMock()}
         dialog = MockShortestPathDialog.return_value
         dialog.show.return_value = None
         self.actions.find_shortest_path()
-        mock_find_shortest_path.assert_not_called()
+        self.app.path_cache.find_shortest_path.assert_not_called()
         self.app.update_display.assert_not_called()
 
     @patch('forest_management_system.gui.handlers.ui_actions.messagebox')
@@ -262,6 +278,18 @@ class TestUIActions(unittest.TestCase):
         self.actions.load_data()
         mock_load_forest.assert_called_once_with('tree.csv', 'path.csv')
 
+    @patch('forest_management_system.gui.handlers.ui_actions.LoadDataDialog')
+    @patch('forest_management_system.gui.handlers.ui_actions.load_forest_from_files')
+    def test_load_data_without_trees_resets_history(self, mock_load_forest, MockLoadDataDialog):
+        MockLoadDataDialog.return_value.show.return_value = ('tree.csv', 'path.csv')
+        mock_load_forest.return_value = MagicMock(trees={})
+        self.actions.load_data()
+        self.app.reset_history.assert_called_once()
+        self.assertIs(self.app.forest_graph, mock_load_forest.return_value)
+        self.app.release_snapshot.assert_called_once()
+        self.app.create_snapshot.assert_not_called()
+        self.actions.control_panel.restore_original_btn.config.assert_called_with(state='disabled')
+
     @patch('forest_management_system.gui.handlers.ui_actions.LoadDataDialog')
     def test_load_data_canceled(self, MockLoadDataDialog):
         dialog = MockLoadDataDialog.return_value
@@ -287,6 +315,28 @@ class TestUIActions(unittest.TestCase):
         mock_messagebox.askyesno.assert_called_once()
         self.app.restore_snapshot.assert_called_once()
 
+    def test_undo_redo(self):
+        self.app.history.in_progress = False
+        self.app.history.undo.return_value = "Add tree 1"
+        self.actions.undo()
+        self.app.history.undo.assert_called_once()
+        self.app.update_display.assert_called_once()
+        self.app.history.redo.return_value = None
+        self.actions.redo()
+        self.app.history.redo.assert_called_once()
+        self.app.update_display.assert_called_once()
+        self.app.status_bar.set_text.assert_called_with("⚠️ Nothing to redo.")
+
+    def test_undo_redo_during_drag(self):
+        self.app.history.in_progress = True
+        self.actions.undo()
+        self.app.status_bar.set_text.assert_called_with("⚠️ Nothing to undo.")
+        self.actions.redo()
+        self.app.status_bar.set_text.assert_called_with("⚠️ Nothing to redo.")
+        self.app.history.undo.assert_not_called()
+        self.app.history.redo.assert_not_called()
+        self.app.update_display.assert_not_called()
+
     @patch('forest_management_system.gui.handlers.ui_actions.filedialog')
     @patch('forest_management_system.gui.handlers.ui_actions.csv')
     def test_save_data(self, mock_csv, mock_filedialog):
@@ -295,7 +345,7 @@ class TestUIActions(unittest.TestCase):
         
         # Setup test data
         self.app.forest_graph.trees = {1: MagicMock(tree_id=1, species='Pine', age=10, health_status=MagicMock(name='HEALTHY'))}
-        self.app.forest_graph.adj_list = {1: {2: 1.0}, 2: {1: 1.0}}
+        self.app.forest_graph.iter_edges.return_value = [(1, 2, 1.0)]
         self.app.tree_positions = {1: (10, 10), 2: (20, 20)}
         
         # Call the method being tested
@@ -71,12 +71,8 @@ class TestForestCanvasFunctionality(unittest.TestCase):
             3: self.tree3
         }
         
-        # Set up adjacency list with paths between trees
-        self.forest_graph.adj_list = {
-            1: {2: 10.5},
-            2: {1: 10.5, 3: 15.2},
-            3: {2: 15.2}
-        }
+        # Set up paths between trees
+        self.forest_graph.iter_edges.return_value = [(1, 2, 10.5), (2, 3, 15.2)]
         
         # Set up tree positions
         self.tree_positions = {
@@ -189,7 +185,7 @@ class TestForestCanvasFunctionality(unittest.TestCase):
         """Test drawing a forest with trees but no paths."""
         # Set up forest with trees but no paths
         mock_find_reserves.return_value = []
-        self.forest_graph.adj_list = {}
+        self.forest_graph.iter_edges.return_value = []
         
         # Draw forest
         self.canvas.draw_forest(self.forest_graph, self.tree_positions)
@@ -208,7 +204,7 @@ class TestForestCanvasFunctionality(unittest.TestCase):
         # Set up empty forest
         mock_find_reserves.return_value = []
         self.forest_graph.trees = {}
-        self.forest_graph.adj_list = {}
+        self.forest_graph.iter_edges.return_value = []
         
         # Draw forest
         self.canvas.draw_forest(self.forest_graph, {})
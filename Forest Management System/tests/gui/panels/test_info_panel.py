@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from forest_management_system.gui.panels.info_panel import InfoPanel
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.health_status import HealthStatus
 
 class TestInfoPanel(unittest.TestCase):
     """
@@ -45,7 +48,7 @@ class TestInfoPanel(unittest.TestCase):
     def test_update_info_normal(self):
         forest_graph = MagicMock()
         forest_graph.trees = {1: MagicMock(health_status=MagicMock(name='HEALTHY'), species='Pine')}
-        forest_graph.adj_list = {1: {}}
+        forest_graph.edge_count = 0
         def fake_find_reserves(graph): return [[1]]
         self.panel.info_text.config = MagicMock()
         self.panel.info_text.delete = MagicMock()
@@ -57,7 +60,7 @@ class TestInfoPanel(unittest.TestCase):
     def test_update_info_with_exception(self):
         forest_graph = MagicMock()
         forest_graph.trees = {1: MagicMock(health_status=MagicMock(name='HEALTHY'), species='Pine')}
-        forest_graph.adj_list = {1: {}}
+        forest_graph.edge_count = 0
         def raise_exception(graph): raise Exception()
         self.panel.info_text.config = MagicMock()
         self.panel.info_text.delete = MagicMock()
@@ -66,5 +69,19 @@ class TestInfoPanel(unittest.TestCase):
         self.panel.info_text.insert.assert_called()
         self.panel.info_text.config.assert_called()
 
+    def test_update_info_counts_from_columns(self):
+        forest_graph = ForestGraph()
+        forest_graph.add_tree(Tree(1, 'Pine', 10, HealthStatus.HEALTHY))
+        forest_graph.add_tree(Tree(2, 'Pine', 12, HealthStatus.INFECTED))
+        forest_graph.add_tree(Tree(3, 'Oak', 30, HealthStatus.HEALTHY))
+        self.panel.update_info(forest_graph, lambda graph: [])
+        text = self.panel.info_text.insert.call_args[0][1]
+        self.assertIn("Infected %: 33.3%", text)
+        self.assertIn("HEALTHY: 2", text)
+        self.assertIn("INFECTED: 1", text)
+        self.assertNotIn("AT_RISK", text)
+        self.assertIn("Pine: 2", text)
+        self.assertIn("Oak: 1", text)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -15,21 +15,18 @@ class TestAppLogic(unittest.TestCase):
         patcher_canvas_handler = patch('forest_management_system.gui.app.CanvasEventsHandler')
         patcher_forest_graph = patch('forest_management_system.gui.app.ForestGraph')
         patcher_find_reserves = patch('forest_management_system.gui.app.find_reserves')
-        patcher_copy = patch('forest_management_system.gui.app.copy')
         self.mock_tk = patcher_tk.start()
         self.mock_main_window = patcher_main_window.start()
         self.mock_ui_actions = patcher_ui_actions.start()
         self.mock_canvas_handler = patcher_canvas_handler.start()
         self.mock_forest_graph = patcher_forest_graph.start()
         self.mock_find_reserves = patcher_find_reserves.start()
-        self.mock_copy = patcher_copy.start()
         self.addCleanup(patcher_tk.stop)
         self.addCleanup(patcher_main_window.stop)
         self.addCleanup(patcher_ui_actions.stop)
         self.addCleanup(patcher_canvas_handler.stop)
         self.addCleanup(patcher_forest_graph.stop)
         self.addCleanup(patcher_find_reserves.stop)
-        self.addCleanup(patcher_copy.stop)
         self.root = MagicMock()
 
     def test_init(self):
@@ -56,18 +53,32 @@ class TestAppLogic(unittest.TestCase):
         app.update_display()
         app.main_window.forest_canvas.draw_forest.assert_called_once()
         app.main_window.info_panel.update_info.assert_called_once()
+        self.assertIs(app.route_distance, app.ui_actions.update_live_route.return_value)
 
     def test_create_snapshot(self):
         """
-        Test that create_snapshot stores deep copies of forest_graph and tree_positions.
+        Test that create_snapshot takes snapshots of forest_graph and tree_positions.
         """
         app = AppLogic(self.root)
         app.forest_graph = MagicMock()
         app.tree_positions = MagicMock()
         app.create_snapshot()
         self.assertTrue(app.has_snapshot)
-        self.mock_copy.deepcopy.assert_any_call(app.forest_graph)
-        self.mock_copy.deepcopy.assert_any_call(app.tree_positions)
+        self.assertIs(app.snapshot_forest_graph, app.forest_graph.snapshot.return_value)
+        self.assertIs(app.snapshot_tree_positions, app.tree_positions.snapshot.return_value)
+
+    def test_create_snapshot_releases_previous(self):
+        """
+        Test that taking a new snapshot releases the old one.
+        """
+        app = AppLogic(self.root)
+        app.forest_graph = MagicMock()
+        app.tree_positions = MagicMock()
+        app.create_snapshot()
+        old_graph_snapshot = app.snapshot_forest_graph
+        app.forest_graph = MagicMock()
+        app.create_snapshot()
+        old_graph_snapshot.release.assert_called_once()
 
     def test_restore_snapshot_success(self):
         """
@@ -78,9 +89,10 @@ class TestAppLogic(unittest.TestCase):
         app.snapshot_forest_graph = MagicMock()
         app.snapshot_tree_positions = MagicMock()
         app.update_display = MagicMock()
-        self.mock_copy.deepcopy.side_effect = lambda x: x
         result = app.restore_snapshot()
         self.assertTrue(result)
+        app.snapshot_forest_graph.restore.assert_called_once()
+        app.snapshot_tree_positions.restore.assert_called_once()
         app.update_display.assert_called_once()
 
     def test_restore_snapshot_fail(self):
@@ -0,0 +1,92 @@
+"""
+Tests for the memory-mapped binary forest format.
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from forest_management_system.io.binary_format import (save_forest_binary, open_forest_binary,
+                                                       convert_csv_to_binary)
+from forest_management_system.data_structures.tree import Tree
+from forest_management_system.data_structures.forest_graph import ForestGraph
+from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.algorithms.pathfinding import find_shortest_path
+from forest_management_system.algorithms.reserve_detection import find_reserves
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test cases for save_forest_binary, open_forest_binary and convert_csv_to_binary."""
+
+    def setUp(self):
+        """
+        Set up a small forest and a temporary directory.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.file_path = os.path.join(self.tmpdir.name, 'forest.bin')
+        self.g = ForestGraph()
+        self.g.add_trees([Tree(7, 'Oak', 100, HealthStatus.HEALTHY),
+                          Tree(2, 'Pine', 50, HealthStatus.INFECTED),
+                          Tree(5, 'Épicéa', 75, HealthStatus.AT_RISK),
+                          Tree(9, 'Oak', 3, HealthStatus.HEALTHY)])
+        self.g.add_paths([(7, 2, 10.0), (2, 5, 15.5), (7, 9, 1.0)])
+
+    def test_round_trip(self):
+        """
+        Test that a saved graph answers the same queries from the mapped file.
+        """
+        save_forest_binary(self.g, self.file_path)
+        mapped = open_forest_binary(self.file_path)
+        self.assertIsInstance(mapped.indptr, np.memmap)
+        self.assertEqual(len(mapped), 4)
+        self.assertEqual(mapped.edge_count, 3)
+        self.assertEqual(sorted(mapped.get_neighbors(7)), [2, 9])
+        self.assertEqual(mapped.get_distance(5, 2), 15.5)
+        self.assertEqual(mapped.get_distance(5, 9), float('inf'))
+        tree = mapped.trees[5]
+        self.assertEqual((tree.species, tree.age, tree.health_status), ('Épicéa', 75, HealthStatus.AT_RISK))
+        self.assertEqual(find_shortest_path(mapped, 9, 5), find_shortest_path(self.g, 9, 5))
+        self.assertEqual(find_reserves(mapped), find_reserves(self.g))
+        with self.assertRaises(ValueError):
+            mapped.weights[0] = 1.0
+
+    def test_empty_graph_and_bad_file(self):
+        """
+        Test an empty forest and a file that is not in the format.
+        """
+        save_forest_binary(ForestGraph(), self.file_path)
+        mapped = open_forest_binary(self.file_path)
+        self.assertEqual(len(mapped), 0)
+        self.assertEqual(mapped.get_neighbors(1), [])
+        with open(self.file_path, 'wb') as f:
+            f.write(b'tree_id,species\n' * 10)
+        with self.assertRaises(ValueError):
+            open_forest_binary(self.file_path)
+
+    def test_convert_csv(self):
+        """
+        Test direct CSV conversion, including rows the loader would reject.
+        """
+        tree_file = os.path.join(self.tmpdir.name, 'trees.csv')
+        path_file = os.path.join(self.tmpdir.name, 'paths.csv')
+        with open(tree_file, 'w', encoding='utf-8') as f:
+            f.write("tree_id,species,age,health_status\n"
+                    "3,Maple,75,Healthy\n1,Oak,100,Healthy\n2,Pine,50,Infected\n"
+                    "x,Bad,1,Healthy\n2,Pine,51,At Risk\n")
+        with open(path_file, 'w', encoding='utf-8') as f:
+            f.write("tree_1,tree_2,distance\n1,2,10\n2,3,15\n3,3,1\n1,99,4\n1,3,-2\n2,1,12\n")
+        self.assertEqual(convert_csv_to_binary(tree_file, path_file, self.file_path), (3, 2))
+        mapped = open_forest_binary(self.file_path)
+        self.assertEqual(mapped.ids.tolist(), [1, 2, 3])
+        self.assertEqual(mapped.trees[2].age, 51)
+        self.assertEqual(mapped.trees[2].health_status, HealthStatus.AT_RISK)
+        self.assertEqual(mapped.get_distance(1, 2), 12.0)
+        self.assertEqual(mapped.get_distance(3, 2), 15.0)
+        self.assertEqual(mapped.get_neighbors(1), [2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from forest_management_system.data_structures.tree import Tree
 from forest_management_system.utils.utils import find_trees_by_health, count_trees_by_species
 from forest_management_system.data_structures.health_status import HealthStatus
+from forest_management_system.data_structures.forest_graph import ForestGraph
 
 class TestUtils(unittest.TestCase):
     def setUp(self):
@@ -24,5 +25,12 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(species_count['Pine'], 2)
         self.assertEqual(species_count['Oak'], 1)
 
+    def test_graph_arguments_use_indexes(self):
+        graph = ForestGraph()
+        graph.add_trees(self.trees)
+        healthy = find_trees_by_health(graph, HealthStatus.HEALTHY)
+        self.assertEqual([tree.tree_id for tree in healthy], [1, 3])
+        self.assertEqual(count_trees_by_species(graph), {'Pine': 2, 'Oak': 1})
+
 if __name__ == '__main__':
     unittest.main()